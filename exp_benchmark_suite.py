@@ -0,0 +1,62 @@
+"""
+RSA BACKEND BENCHMARK SUITE
+
+This benchmark times the Python, Integer and Bitvector findDecryptionExponent backends on a
+fixed workload with warmup and repeated measurements, and writes a machine-readable summary
+(median, p95, p99, MAD per backend) that can be compared against an earlier commit
+
+THE PARAMETERS ARE
+    - NUM_OF_INPUTS: How many consecutive window (P, Q, E) triples are in the workload
+
+    - LOWER_BOUND: A lower-bound on the decryption key value
+
+    - BITWIDTH_MAX: This is the Bitwidth size for bitvectors, or "auto" to size every operand
+        to its value and zero-extend multiplications instead
+
+    - WARMUP / REPEATS: Untimed and timed calls per input
+
+    - CPU: CPU to pin the benchmark to, None to leave affinity alone
+
+    - SUMMARY_FILE: Where the JSON summary is written
+
+    - BASELINE_FILE: Summary from an earlier commit to compare against, None to skip
+        Exits with status 1 if any backend's median or p95 got slower than THRESHOLD
+"""
+
+import sys
+
+from src.Experiment.Benchmark_Suite import compareSummaries, decryptionWorkload, loadSummary, runBenchmark, saveSummary
+
+# --------------- PARAMETERS --------------------
+
+NUM_OF_INPUTS = 200
+LOWER_BOUND = 500
+BITWIDTH_MAX = 64
+
+WARMUP = 3
+REPEATS = 5
+CPU = 0
+
+SUMMARY_FILE = "./data/Benchmark/summary_i"+str(NUM_OF_INPUTS)+"d"+str(LOWER_BOUND)+"b"+str(BITWIDTH_MAX)+".json"
+BASELINE_FILE = None
+THRESHOLD = 0.10
+
+# --------------- BENCHMARK --------------------
+
+if __name__ == '__main__':
+    workload = decryptionWorkload(NUM_OF_INPUTS, LOWER_BOUND, BITWIDTH_MAX)
+    summary = runBenchmark(workload, warmup=WARMUP, repeats=REPEATS, cpu=CPU)
+
+    saveSummary(summary, SUMMARY_FILE)
+
+    for backend, stats in summary["results"].items():
+        print(backend, ", median", stats["median"], ", p95", stats["p95"], ", p99", stats["p99"], ", MAD", stats["mad"])
+
+    if BASELINE_FILE is not None:
+        regressions = compareSummaries(loadSummary(BASELINE_FILE), summary, THRESHOLD)
+
+        for backend, metric, before, after, change in regressions:
+            print("REGRESSION", backend, metric, before, "->", after, "(+"+str(round(change*100, 1))+"%)")
+
+        if regressions:
+            sys.exit(1)
@@ -12,21 +12,57 @@ THE PARAMETERS ARE
     
     - BITWIDTH_MAX: This is the Bitwidth size for bitvectors
         (Disclaimer - If the bitwidth is too small, it will crash during the experiment)
+        "auto" sizes every operand to its value and zero-extends multiplications instead
+
+    - WINDOW: How (P, Q, E) are picked from the prime list, "CONSECUTIVE" or "FORWARD SPLIT"
+        Triples without a decryption exponent are skipped and more primes are loaded in their
+        place, so there are always NUM_OF_EXPERIMENTS triples (see src/Primes/Prime_Window.py)
+
+    - PRIME_CACHE: File the prime table is memory-mapped from, it grows itself when
+        an experiment needs more primes than it holds
+
+    - BATCH_SIZE: Solve this many triples at a time in the Python lane with the vectorized
+        findDecryptionExponentArray, None for one findDecryptionExponent call per triple.
+        clock_time is then the time of the whole batch, like BATCH_SIZE of exp_racing_verification.py
+
+    - INSTRUMENT: Also record perf_counter_ns spans for every solver phase (setup, terms,
+        solve, model) and cvc5's statistics of each call as extra columns
+        (left blank for the Python lane, which has no solver)
+
+    - OUTPUT_FORMAT: "csv" or "arrow", rows are streamed to disk every CHUNK_SIZE results
+        so memory stays flat and a crash keeps everything flushed so far
+
+    - RESUME: Pick up an interrupted run after the last rows the checkpoint file inside
+        DATA_DIRECTORY committed, new rows are appended to the existing data
+
+    - PROFILE: Solver profile every solver is set up with (see src/Solver/Solver_Profiles.py),
+        "auto" uses the fastest one exp_tuning_profiles.py found, the baseline until it is run
+
+    - BUDGETS: Escalation ladder of Budget(time, resources, profile) (see src/Solver/Budget.py),
+        every solver call gets cvc5's tlimit-per (ms) and rlimit-per of the first and is
+        retried with each next one while the solver can't answer it. Calls no budget answers
+        are recorded as "timeout" or "unknown". None for no limits
 
     - DATA_DIRECTORY: This specifies the path where the experiment will dump its data
         Right now, the name schema is
-            <type>_e<NUM_OF_EXPERIMENTS>d<LOWER_BOUND>b<BITWIDTH_MAX>.csv
+            <type>_e<NUM_OF_EXPERIMENTS>d<LOWER_BOUND>b<BITWIDTH_MAX>.<OUTPUT_FORMAT>
 """
 
-import csv
+import itertools
 import os
-import sympy
 import time
 from tqdm import tqdm
 
 from src.Python.RSA_Finding_Valid_Decryption import findDecryptionExponent as pyFindDecrypt
+from src.Python.RSA_Finding_Valid_Decryption import findDecryptionExponentArray as pyFindDecryptArray
 from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
 from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+from src.Primes.Prime_Window import consecutiveWindow, forwardSplitWindow
+from src.Primes.Prime_Cache import DEFAULT_CACHE, loadPrimes
+from src.Experiment.Result_Writer import StreamingResultWriter
+from src.Experiment.Checkpoint import Checkpoint
+from src.Solver.Budget import Budget, SolverUnknown, retryWithBudgets, unknownAnswer
+from src.Solver.Instrumentation import COLUMNS, PhaseTimer
 
 # --------------- PARAMETERS --------------------
 
@@ -34,6 +70,15 @@ NUM_OF_EXPERIMENTS = 1000
 
 LOWER_BOUND = 0
 BITWIDTH_MAX = 64
+WINDOW = "CONSECUTIVE"
+PRIME_CACHE = DEFAULT_CACHE
+BATCH_SIZE = None
+INSTRUMENT = False
+OUTPUT_FORMAT = "csv"
+CHUNK_SIZE = 10000
+RESUME = False
+PROFILE = None
+BUDGETS = None
 DATA_DIRECTORY = "./data/EncryptionRace/e"+str(NUM_OF_EXPERIMENTS) + "d"+str(LOWER_BOUND)+"/"
 
 # --------------- MAKE FOLDER --------------------
@@ -45,57 +90,99 @@ except FileExistsError:
 
 # --------------- GET PRIME NUMBERS --------------------
 
-primes = [sympy.prime(i) for i in range(1, NUM_OF_EXPERIMENTS+3)]
+# Windows without a decryption exponent are skipped, so load one more prime for every
+# skipped window until there are NUM_OF_EXPERIMENTS triples
+numOfPrimes = NUM_OF_EXPERIMENTS+2
+
+while True:
+    primes = loadPrimes(numOfPrimes, PRIME_CACHE)
+
+    if WINDOW == "CONSECUTIVE":
+        window = consecutiveWindow(primes)
+
+    elif WINDOW == "FORWARD SPLIT":
+        window = forwardSplitWindow(numOfPrimes, primes=primes)
+
+    triples = list(itertools.islice(window, NUM_OF_EXPERIMENTS))
+
+    if len(triples) == NUM_OF_EXPERIMENTS:
+        break
+
+    numOfPrimes += NUM_OF_EXPERIMENTS - len(triples)
 
 # --------------- EXPERIMENT --------------------
 
+checkpoint = Checkpoint(DATA_DIRECTORY + "checkpoint.json", reset=not RESUME)
+
 for ty in ["Python", "Bitvector", "Integer"]:
-    DATA_FILE = DATA_DIRECTORY + ty+"_e" + str(NUM_OF_EXPERIMENTS) + "d"+str(LOWER_BOUND)+"b"+str(BITWIDTH_MAX)+".csv"
+    DATA_FILE = DATA_DIRECTORY + ty+"_e" + str(NUM_OF_EXPERIMENTS) + "d"+str(LOWER_BOUND)+"b"+str(BITWIDTH_MAX)+"."+OUTPUT_FORMAT
 
-    all_times = []
-    decryption_keys= []
+    # Without INSTRUMENT the rows keep the baseline's columns
+    phaseColumns = COLUMNS if INSTRUMENT else []
+    header = ["type","clock_time","P", "Q","E", "calculated_D"] + phaseColumns
+    mode = "a" if RESUME else "w"
+    pending = triples[checkpoint.resume(ty, DATA_FILE):]
 
-    for i in tqdm(range(NUM_OF_EXPERIMENTS)):
-        # CONSEQUTATIVE WINDOW
-        P = primes[i]
-        Q = primes[(i+1)]
-        E = primes[(i+2)]
+    timer = PhaseTimer() if INSTRUMENT and ty != "Python" else None
 
-        # FORWARD SPLIT WINDOW + Standard Exponent
-        # P = primes[i]
-        # E = primes[i+1] 
-        # Q = primes[(i+ ((len(primes)-i)//2)+1) % len(primes)]
+    with StreamingResultWriter(DATA_FILE, header, CHUNK_SIZE, OUTPUT_FORMAT, mode, onFlush=checkpoint.commit) as writer:
+        checkpoint.track(ty, writer.path)
 
+        if ty == "Python" and BATCH_SIZE:
+            for i in tqdm(range(0, len(pending), BATCH_SIZE)):
+                batch = pending[i:i+BATCH_SIZE]
+                Ps, Qs, Es = zip(*batch)
 
-        if ty == "Python":
-            start = time.time()
+                start = time.perf_counter_ns()
 
-            d = pyFindDecrypt(P,Q,E, LOWER_BOUND)
+                ds = pyFindDecryptArray(Ps, Qs, Es, LOWER_BOUND)
 
-            end = time.time()
+                end = time.perf_counter_ns()
 
-        elif ty == "Integer":
-            start = time.time()
+                # Every triple of the batch waited for all of it
+                total_time = (end-start) / 1e9
+                for (P, Q, E), d in zip(batch, ds):
+                    checkpoint.mark(ty)
+                    writer.write([ty,total_time,P,Q,E, int(d)] + [None] * len(phaseColumns))
 
-            d = intFindDecrypt(P,Q,E, LOWER_BOUND)
+        else:
+            for P, Q, E in tqdm(pending):
+                if timer is not None:
+                    timer.reset()
 
-            end = time.time()
-            
-        elif ty == "Bitvector":
-            start = time.time()
+                if ty == "Python":
+                    start = time.perf_counter_ns()
 
-            d = bvFindDecrypt(P,Q,E, LOWER_BOUND, BITWIDTH_MAX)
+                    d = pyFindDecrypt(P,Q,E, LOWER_BOUND)
 
-            end = time.time()
+                    end = time.perf_counter_ns()
 
-        total_time = end-start
-        all_times.append(total_time)
-        decryption_keys.append(d)
+                elif ty == "Integer":
+                    start = time.perf_counter_ns()
 
-    print("DONE "+ty+" EXPERIEMENTS")
+                    try:
+                        d, _ = retryWithBudgets(lambda budget, profile: intFindDecrypt(P,Q,E, LOWER_BOUND, timer=timer, profile=profile,
+                                                                                       budget=budget), BUDGETS, PROFILE)
+                    except SolverUnknown as error:
+                        d = unknownAnswer(error)
+
+                    end = time.perf_counter_ns()
+                
+                elif ty == "Bitvector":
+                    start = time.perf_counter_ns()
 
-    with open(DATA_FILE, "w", newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["type","clock_time","P", "Q","E", "calculated_D"])
-        for i, t in enumerate(all_times):
-            writer.writerow([ty,t,primes[i],primes[i+1],primes[i+2], decryption_keys[i]])
\ No newline at end of file
+                    try:
+                        d, _ = retryWithBudgets(lambda budget, profile: bvFindDecrypt(P,Q,E, LOWER_BOUND, BITWIDTH_MAX, timer=timer,
+                                                                                      profile=profile, budget=budget), BUDGETS, PROFILE)
+                    except SolverUnknown as error:
+                        d = unknownAnswer(error)
+
+                    end = time.perf_counter_ns()
+
+                total_time = (end-start) / 1e9
+                phases = timer.row() if timer is not None else [None] * len(phaseColumns)
+
+                checkpoint.mark(ty)
+                writer.write([ty,total_time,P,Q,E, d] + phases)
+
+    print("DONE "+ty+" EXPERIEMENTS")
@@ -11,73 +11,154 @@ That is, for all isValidRSAConfiguration(i,j,k,l) where i,j,k,l in range(0,INTEG
 THE PARAMETERS ARE 
     - INTEGER_BOUND: How many inputs should be covered 
 
-    - BITWIDTH_MAX: This is the Bitwidth size for bitvectors
+    - BITWIDTH_MAX: This is the Bitwidth size for bitvectors, "auto" sizes every operand to its value
         (Disclaimer - If the bitwidth is too small, it will crash during the experiment)
 
-    - DATA_DIRECTORY: This specifies the path where the experiment will dump its data
-        Right now, the name schema of each file is
-            <type>_bound<INTEGER_BOUND>bw<BITWIDTH_MAX>.csv
-"""
+    - INCREMENTAL: Reuse one solver per theory instead of building one for every call
 
-import csv
-import os
-import sympy
-import time
-from tqdm import tqdm
+    - NUM_OF_WORKERS: How many processes the inputs are sharded across
 
-from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
-from Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+    - INSTRUMENT: Also record how long every solver phase took and cvc5's statistics
 
-# --------------- PARAMETERS --------------------
+    - OUTPUT_FORMAT, CHUNK_SIZE: "csv" or "arrow", rows are written out every CHUNK_SIZE results
 
-INTEGER_BOUND = 30 #CHECKS ALL INPUTS FROM 0-IB^4 
-BITWIDTH_MAX = 16
-DATA_DIRECTORY = "./data/VerificationRace/bound"+str(INTEGER_BOUND) + "bw"+str(BITWIDTH_MAX)+"/"
+    - RESUME: Continue an interrupted run from its checkpoint instead of starting over
+
+    - RESULT_CACHE, BYPASS_CACHE: SQLite file answers are memoized in, None for no cache.
+        BYPASS_CACHE still runs the solver for every input so the timings stay honest
 
-# --------------- MAKE FOLDER --------------------
-try:
-    os.makedirs(DATA_DIRECTORY)
-except FileExistsError:
-    pass
+    - PREFILTER: Answer obviously invalid inputs in Python without the solver
 
-# --------------- EXPERIMENT --------------------
+    - BATCH_SIZE: Verify this many inputs at a time in one solver, None for one call each
 
-for ty in ["Bitvector", "Integer"]:
-    DATA_FILE = DATA_DIRECTORY + ty+"_bound" + str(INTEGER_BOUND) + "bw"+str(BITWIDTH_MAX)+".csv"
+    - PROFILE: Solver profile (see src/Solver/Solver_Profiles.py), "auto" for the tuned one
 
-    all_times = []
-    inputs= []
-    answers = []
+    - SOLVER_COMMAND, SOLVER_TIMEOUT: External SMT-LIB2 solver every query is run on instead
+        of cvc5's bindings, and how many seconds a query may take on it
 
-    for i in tqdm(range(INTEGER_BOUND)):
-        for j in range(INTEGER_BOUND):
-            for k in range(INTEGER_BOUND):
-                for l in range(INTEGER_BOUND):
-                    if ty == "Integer":
-                        start = time.time()
+    - BUDGETS: Time and resource limits every query is retried with in turn, None for no
+        limits (see src/Solver/Budget.py)
 
-                        d = intValid(i,j,k,l)
+    - SYMMETRY: Only run the solver on canonical inputs and mirror or prune every other one
+        (see src/Experiment/Symmetric_Enumeration.py)
 
-                        end = time.time()
-                        
-                    elif ty == "Bitvector":
-                        start = time.time()
+    - SAMPLING, SAMPLE_TOLERANCE, SAMPLE_MAX, SAMPLE_SEED: Time an adaptive stratified sample
+        instead of every input (see src/Experiment/Stratified_Sampling.py)
 
-                        d = bvValid(i,j,k,l, BITWIDTH_MAX)
+    - DATA_DIRECTORY: This specifies the path where the experiment will dump its data
+        Right now, the name schema of each file is
+            <type>_bound<INTEGER_BOUND>bw<BITWIDTH_MAX><MODE>.<OUTPUT_FORMAT>
+        where MODE is empty, "_symmetric" or "_sampled<SAMPLE_SEED>". Answers the solver
+        couldn't give are "timeout", "unknown" or "error", SYMMETRY adds a "source" column
+        and SAMPLING a "stratum" column, with every stratum's weight in a _strata.json next to it
+"""
+
+import json
+import os
+from tqdm import tqdm
 
-                        end = time.time()
+from src.Experiment.Checkpoint import Checkpoint
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Experiment.Stratified_Sampling import runSampledRace
+from src.Experiment.Symmetric_Enumeration import runSymmetricRace
+from src.Experiment.Result_Writer import StreamingResultWriter
+from src.Solver.Budget import Budget
+from src.Solver.Instrumentation import COLUMNS
 
-                        
-                    total_time = end-start
-                    all_times.append(total_time)
-                    inputs.append((i,j,k,l))
-                    answers.append(d)
+# --------------- PARAMETERS --------------------
 
-    print("DONE "+ty+" EXPERIEMENTS")
+INTEGER_BOUND = 30 #CHECKS ALL INPUTS FROM 0-IB^4 
+BITWIDTH_MAX = 16
+INCREMENTAL = True
+NUM_OF_WORKERS = 1
+INSTRUMENT = False
+OUTPUT_FORMAT = "csv"
+CHUNK_SIZE = 10000
+RESUME = False
+RESULT_CACHE = None
+BYPASS_CACHE = False
+PREFILTER = False
+BATCH_SIZE = None
+PROFILE = None
+SOLVER_COMMAND = None
+SOLVER_TIMEOUT = 60
+BUDGETS = None
+SYMMETRY = False
+SAMPLING = False
+SAMPLE_TOLERANCE = 0.05
+SAMPLE_MAX = None
+SAMPLE_SEED = 0
+DATA_DIRECTORY = "./data/VerificationRace/bound"+str(INTEGER_BOUND) + "bw"+str(BITWIDTH_MAX)+"/"
 
-    with open(DATA_FILE, "w", newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["type","clock_time","P", "Q","E", "D", "Answers"])
-        for i, t in enumerate(all_times):
-            inp = inputs[i]
-            writer.writerow([ty,t,inp[0],inp[1],inp[2], inp[3], answers[i]])
\ No newline at end of file
+if __name__ == '__main__':
+
+    # --------------- MAKE FOLDER --------------------
+    try:
+        os.makedirs(DATA_DIRECTORY)
+    except FileExistsError:
+        pass
+
+    # --------------- EXPERIMENT --------------------
+
+    # Rows of different modes have different columns, so they never share a file or checkpoint
+    if SAMPLING and RESUME:
+        raise ValueError("A sample can't be resumed, its weights only hold for the samples of one run")
+
+    if SAMPLING:
+        MODE = "_sampled" + str(SAMPLE_SEED)
+    elif SYMMETRY:
+        MODE = "_symmetric"
+    else:
+        MODE = ""
+
+    checkpoint = Checkpoint(DATA_DIRECTORY + "checkpoint" + MODE + ".json", reset=not RESUME)
+
+    for ty in ["Bitvector", "Integer"]:
+        DATA_STEM = DATA_DIRECTORY + ty+"_bound" + str(INTEGER_BOUND) + "bw"+str(BITWIDTH_MAX) + MODE
+        DATA_FILE = DATA_STEM + "." + OUTPUT_FORMAT
+
+        done = checkpoint.resume(ty, DATA_FILE)
+        counts = {}
+        strata = {}
+        options = dict(numOfWorkers=NUM_OF_WORKERS, incremental=INCREMENTAL, instrument=INSTRUMENT,
+                       resultCache=RESULT_CACHE, bypass=BYPASS_CACHE,
+                       prefilter=PREFILTER, counts=counts, batchSize=BATCH_SIZE, profile=PROFILE,
+                       solverCommand=SOLVER_COMMAND, solverTimeout=SOLVER_TIMEOUT, budgets=BUDGETS)
+
+        if SAMPLING:
+            race = runSampledRace(ty, INTEGER_BOUND, BITWIDTH_MAX, tolerance=SAMPLE_TOLERANCE, maxSamples=SAMPLE_MAX,
+                                  seed=SAMPLE_SEED, strata=strata, **options)
+            labels = ["stratum"]
+        elif SYMMETRY:
+            race = runSymmetricRace(ty, INTEGER_BOUND, BITWIDTH_MAX, start=done, **options)
+            labels = ["source"]
+        else:
+            race = runVerificationRace(ty, INTEGER_BOUND, BITWIDTH_MAX, indices=range(done, INTEGER_BOUND**4), **options)
+            labels = []
+
+        # Without INSTRUMENT the rows keep the baseline's columns
+        phaseColumns = COLUMNS if INSTRUMENT else []
+        header = ["type","clock_time","P", "Q","E", "D", "Answers"] + labels + phaseColumns
+        mode = "a" if RESUME else "w"
+        remaining = None if SAMPLING else INTEGER_BOUND**4 - done
+
+        with StreamingResultWriter(DATA_FILE, header, CHUNK_SIZE, OUTPUT_FORMAT, mode, onFlush=checkpoint.commit) as writer:
+            checkpoint.track(ty, writer.path)
+
+            for total_time, inp, d, *label, phases in tqdm(race, total=remaining):
+                checkpoint.mark(ty)
+                writer.write([ty,total_time,inp[0],inp[1],inp[2], inp[3], d] + label + phases[:len(phaseColumns)])
+
+        print("DONE "+ty+" EXPERIEMENTS, prefilter answered", counts["answered"], ", solver answered", counts["solver"],
+              ", unknown", counts["unknown"], ", errors", counts["errors"],
+              ", retries", counts["retries"])
+
+        if SAMPLING:
+            with open(DATA_STEM + "_strata.json", "w") as file:
+                json.dump(strata, file, indent=2)
+
+            print("sampled", sum(stratum["samples"] for stratum in strata.values()), "of", INTEGER_BOUND**4, "inputs in",
+                  len(strata), "strata")
+
+        elif SYMMETRY:
+            print("mirrored", counts["mirror"], ", pruned", counts["pruned"])
@@ -5,6 +5,15 @@ This checks a single RSA keypair using RSA Library
 
 THE PARAMETERS ARE 
     - BITWIDTH_MAX: This is the Bitwidth size for the RSA key
+
+    - PRIMALITY: How primality of P and Q is encoded
+        "trial" asserts one trial division per number up to sqrt(P), exact but huge past 32 bits
+        "sieve" only trial divides by the primes up to sqrt(P)
+        "pratt" checks a Pratt certificate with a few modular exponentiations
+
+    - ROUND_TRIP: Also race both theories on whether every message survives encryption and
+        decryption, the bitvector side with square and multiply circuits. Keep BITWIDTH_MAX
+        around 20 or less, since the bitvector circuits grow quickly
 """
 
 import csv
@@ -17,10 +26,14 @@ import rsa
 
 from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
 from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_All_Message_Verification import allMessageDecryptEncryptVerification as intRoundTrip
+from src.Bitvector.RSA_All_Message_Verification import allMessageDecryptEncryptVerification as bvRoundTrip
 
 # --------------- PARAMETERS --------------------
 
 BITWIDTH_MAX = 32
+PRIMALITY = "trial"
+ROUND_TRIP = False
 
 (e,d) = rsa.newkeys(BITWIDTH_MAX)
 
@@ -35,17 +48,29 @@ for ty in ["Bitvector", "Integer"]:
     if ty == "Integer":
         start = time.time()
 
-        d = intValid(P,Q,E,D)
+        d = intValid(P,Q,E,D, primality=PRIMALITY)
 
         end = time.time()
         
     elif ty == "Bitvector":
         start = time.time()
 
-        d = bvValid(P,Q,E,D,BITWIDTH_MAX*2)
+        d = bvValid(P,Q,E,D,BITWIDTH_MAX*2, primality=PRIMALITY)
 
         end = time.time()
 
                         
     total_time = end-start
-    print("Theory:",ty, ", Time", total_time, ", Was It correct", d )
\ No newline at end of file
+    print("Theory:",ty, ", Time", total_time, ", Was It correct", d )
+
+    if ROUND_TRIP:
+        start = time.time()
+
+        if ty == "Integer":
+            d = intRoundTrip(P,Q,E,D, primality=PRIMALITY)
+        elif ty == "Bitvector":
+            d = bvRoundTrip(P,Q,E,D,"auto", primality=PRIMALITY)
+
+        end = time.time()
+
+        print("Theory:",ty, ", Round Trip Time", end-start, ", Was It correct", d )
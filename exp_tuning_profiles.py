@@ -0,0 +1,50 @@
+"""
+SOLVER PROFILE TUNING
+
+This times every solver profile (see src/Solver/Solver_Profiles.py) on a sample of the
+verification and decryption workloads and records the fastest profile per input size,
+which every experiment run with PROFILE = "auto" then uses
+
+THE PARAMETERS ARE
+    - THEORIES / QUERIES: Which theories and queries are tuned
+
+    - BITS: Bit lengths of the sampled primes, each is its own size bucket
+
+    - PER_BUCKET: Consecutive prime windows sampled per bit length
+
+    - LOWER_BOUND: A lower-bound on the decryption key value of the decryption sample
+
+    - BITWIDTH_MAX: This is the Bitwidth size for bitvectors, or "auto"
+
+    - REPEATS: Timed calls per input and profile, the fastest counts
+
+    - TUNING_FILE: Where the fastest profiles are written, "auto" reads the default one
+"""
+
+from src.Experiment.Profile_Tuning import decryptionSample, saveTuning, tuneProfiles, verificationSample
+from src.Solver.Solver_Profiles import TUNING_FILE
+
+# --------------- PARAMETERS --------------------
+
+THEORIES = ["Bitvector", "Integer"]
+QUERIES = ["verify", "decrypt"]
+
+BITS = (8, 12, 16)
+PER_BUCKET = 5
+LOWER_BOUND = 0
+BITWIDTH_MAX = "auto"
+REPEATS = 3
+
+# --------------- TUNING --------------------
+
+if __name__ == '__main__':
+    samples = {"verify": verificationSample(BITS, PER_BUCKET),
+               "decrypt": decryptionSample(BITS, PER_BUCKET, LOWER_BOUND)}
+
+    for ty in THEORIES:
+        for query in QUERIES:
+            tuning = tuneProfiles(ty, query, samples[query], BITWIDTH_MAX, repeats=REPEATS)
+            saveTuning(ty, query, tuning["fastest"], TUNING_FILE)
+
+            for bucket, profile in sorted(tuning["fastest"].items()):
+                print(ty, query, ", bucket", bucket, ", fastest", profile, ", seconds", tuning["seconds"][bucket])
@@ -0,0 +1,67 @@
+"""
+BITVECTOR WIDTHS
+
+Helpers for the "auto" bitwidth mode, where every operand gets the smallest width its
+value fits in and multiplications are zero-extended to the sum of their operand widths,
+so nothing overflows and the bit-blasted circuit tracks the real input magnitudes
+instead of one bitwidth padded for the worst case.
+"""
+
+from cvc5 import Kind
+
+AUTO = "auto"
+
+
+def bitWidth(*values):
+    """Smallest width every value fits in, at least 2 so the constants 1 and 2 fit
+
+    Args:
+        values (int): Non-negative values
+
+    Returns:
+        int: Bitwidth
+    """
+    return max(2, max(value.bit_length() for value in values))
+
+
+def widthOf(term):
+    return term.getSort().getBitVectorSize()
+
+
+def zeroExtend(tm, term, N):
+    """Zero-extends a bitvector term to N bits, leaving it alone if it is already that wide"""
+    width = widthOf(term)
+    if width >= N:
+        return term
+
+    return tm.mkTerm(tm.mkOp(Kind.BITVECTOR_ZERO_EXTEND, N - width), term)
+
+
+def matchWidths(tm, *terms):
+    """Zero-extends every term to the width of the widest one
+
+    Returns:
+        list: The terms, all the same width
+    """
+    N = max(widthOf(term) for term in terms)
+    return [zeroExtend(tm, term, N) for term in terms]
+
+
+def multiply(tm, x, y, widen):
+    """Multiplies two bitvectors
+
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        x (cvc5.Term): Left operand
+        y (cvc5.Term): Right operand
+        widen (bool): Zero-extend both to the sum of their widths first so the product
+            can't overflow, otherwise they must already be the same width
+
+    Returns:
+        cvc5.Term: The product
+    """
+    if widen:
+        N = widthOf(x) + widthOf(y)
+        x, y = zeroExtend(tm, x, N), zeroExtend(tm, y, N)
+
+    return tm.mkTerm(Kind.BITVECTOR_MULT, x, y)
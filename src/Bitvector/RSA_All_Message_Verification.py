@@ -0,0 +1,122 @@
+import cvc5
+from cvc5 import Kind
+
+from src.Bitvector.Bitvector_Width import AUTO, bitWidth
+from src.Bitvector.RSA_Valid_Configuration import _checkFits, isValidRSAConfiguration, powerMod
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.Solver_Profiles import configure
+
+# How every message m below P*Q is checked to come back after encrypting and decrypting
+#   symbolic: One free message m < P*Q, asserting (m^E mod PQ)^D mod PQ != m, so unsat
+#       means no message breaks
+#   crt: By the CRT it is enough to do the same for a free message below P and one below
+#       Q, each circuit half the width of the symbolic one. By Fermat the exponents can
+#       also be reduced mod P-1 (or Q-1), keeping them at least 1 so the message 0 still
+#       maps to 0, which leaves a few squarings instead of one per bit of E and D
+MODES = ("symbolic", "crt")
+
+
+def _roundTripFails(tm, message, E, D, modulus):
+    """Builds (message^E mod modulus)^D mod modulus != message"""
+    cipher = powerMod(tm, message, E, modulus)
+    decrypted = powerMod(tm, cipher, D, modulus)
+
+    return tm.mkTerm(Kind.DISTINCT, decrypted, message)
+
+
+def _hasCounterexample(tm, solver, modulus, E, D, N):
+    """Whether some message below modulus doesn't survive the round trip"""
+    bitvector = tm.mkBitVectorSort(N)
+    modulusTerm = tm.mkBitVector(N, modulus)
+
+    solver.push()
+    try:
+        message = tm.mkConst(bitvector, 'message')
+        solver.assertFormula(tm.mkTerm(Kind.BITVECTOR_ULT, message, modulusTerm))
+        solver.assertFormula(_roundTripFails(tm, message, E, D, modulusTerm))
+
+        results = str(checkKnown(solver.checkSat()))
+    finally:
+        solver.pop()
+
+    return results == "sat"
+
+
+def allMessageDecryptEncryptVerification(P,Q,E,D, N, output=False, mode="crt", timer=None, primality="trial", profile=None,
+                                         budget=None):
+    """ Verifies every message remains the same after encryption and decryption
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        N (int): BITWIDTH of the messages, or AUTO to size them to the modulus
+        output (bool, optional): Print whether it sat. Defaults to False.
+        mode (str, optional): How the messages are checked, one of MODES. Defaults to "crt".
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        primality (str, optional): Primality encoding of the validity check. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        bool: Whether all messages remain the same
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown mode " + str(mode))
+
+    if N != AUTO:
+        _checkFits(P,Q,E,D, N)
+
+    # Every mode only holds for a valid configuration
+    if not isValidRSAConfiguration(P,Q,E,D, N, primality=primality, profile=profile, budget=budget):
+        if output:
+            print("RSA Configuration was: unsat")
+        return False
+
+    if mode == "symbolic":
+        checks = [(P*Q, E, D)]
+    else:
+        checks = [(prime, (E - 1) % (prime - 1) + 1, (D - 1) % (prime - 1) + 1) for prime in (P, Q)]
+
+    timer = timer or NULL_TIMER
+
+    # ------------- SETUP -------------
+
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Bitvector", "round-trip", profile, P,Q,E,D, budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
+
+    # ------------- MESSAGES -------------
+
+    with timer.phase("solve"):
+        results = not any(_hasCounterexample(tm, solver, modulus, e, d, bitWidth(modulus) if N == AUTO else N)
+                          for modulus, e, d in checks)
+
+    timer.recordStatistics(solver)
+
+    if output:
+        print("RSA Configuration was:", "sat" if results else "unsat")
+
+    return results
+
+if __name__ == '__main__':
+    # ------------- INPUT -------------
+    P = 11
+    Q = 13
+    E = 23
+    D = 47
+
+    N = 8 # BITVECTOR LENGTH
+
+    b = allMessageDecryptEncryptVerification(P,Q,E,D, N)
+
+    print("Messages are preserved:", b)
@@ -1,7 +1,78 @@
 import cvc5
 from cvc5 import Kind
 
-def findDecryptionExponent(P, Q, E, LOWER_BOUND, N, output=False):
+from src.Bitvector.Bitvector_Width import AUTO, bitWidth, matchWidths, multiply, widthOf
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.SmtLib_Export import CHECK_SAT, toSmtLib
+from src.Solver.Solver_Profiles import configure
+
+def _decryptionSolver(P, Q, E, LOWER_BOUND, N, timer, profile, budget=None):
+    """Builds the solver findDecryptionExponent checks, with every rule asserted
+
+    Returns:
+        tuple: (tm, solver, decrypt)
+    """
+    if N == AUTO:
+        primeWidth = bitWidth(P, Q)
+        encryptWidth = bitWidth(E)
+        decryptWidth = bitWidth(LOWER_BOUND + (P-1)*(Q-1))
+    else:
+        primeWidth = encryptWidth = decryptWidth = N
+
+    # ------------- SETUP -------------   
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+        
+        configure(solver, "Bitvector", "decrypt", profile, P, Q, E, LOWER_BOUND, budget=budget)
+        solver.setOption("produce-models", "true")
+
+    with timer.phase("terms"):
+        ONE  = tm.mkBitVector(primeWidth,1)
+
+        # ------------- VARIABLE DECLARATIONS -------------   
+        prime1 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime1')
+        prime2 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime2')
+
+        # Public and Private exponents
+        encrypt = tm.mkConst(tm.mkBitVectorSort(encryptWidth), 'encrypt')
+        decrypt = tm.mkConst(tm.mkBitVectorSort(decryptWidth), 'decrypt')
+
+        # ------------- INPUT ASSERTIONS -------------   
+        inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, tm.mkBitVector(primeWidth, P))
+        solver.assertFormula(inputPredicate1)
+
+        inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, tm.mkBitVector(primeWidth, Q))
+        solver.assertFormula(inputPredicate2)
+        
+        inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, tm.mkBitVector(encryptWidth, E))
+        solver.assertFormula(inputPredicate3)
+
+        # ------------- CONSTRAINTS -------------    
+        # Rule: Decryption Exponent must be greater than 1
+        d1 = tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, tm.mkBitVector(decryptWidth, 1))
+        solver.assertFormula(d1)
+
+        # Rule: Exponent custom lower bound
+        decrypt_lower_bound = tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, tm.mkBitVector(decryptWidth, LOWER_BOUND))
+        solver.assertFormula(decrypt_lower_bound)
+
+        # Calculate Euler totient function by (p-1)(q-1) 
+        pminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime1, ONE)
+        qminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime2, ONE)
+        totientN = multiply(tm, pminus1, qminus1, N == AUTO)
+
+        # Rule: Exponents must be mutliplicative inverses of each other modulo totient n
+        ed, totientN = matchWidths(tm, multiply(tm, encrypt, decrypt, N == AUTO), totientN)
+        moduloED = tm.mkTerm(Kind.BITVECTOR_UREM, ed, totientN)
+        moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, tm.mkBitVector(widthOf(ed), 1))
+        solver.assertFormula(moduloCongruence)
+
+    return tm, solver, decrypt
+
+
+def findDecryptionExponent(P, Q, E, LOWER_BOUND, N, output=False, timer=None, profile=None, budget=None):
     """ Finds a satisfying Decryption Exponent
 
     Args:
@@ -9,66 +80,163 @@ def findDecryptionExponent(P, Q, E, LOWER_BOUND, N, output=False):
         Q (int): Prime 2
         E (int): Encryption Exponent
         LOWER_BOUND (int): Lowest value the decryption exponent can be
-        N (int): Bitwidth
+        N (int): Bitwidth, or AUTO to size every operand to its value and zero-extend
+            multiplications so they can't overflow. D is then given enough bits to reach
+            the smallest valid decryption exponent above LOWER_BOUND
         output (bool, optional): Print whether it was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
 
     Returns:
-        int: Decryption Exponent 
+        int: Decryption Exponent, None if there is none
+    """
+    timer = timer or NULL_TIMER
+    tm, solver, decrypt = _decryptionSolver(P, Q, E, LOWER_BOUND, N, timer, profile, budget)
+
+    with timer.phase("solve"):
+        results = checkKnown(solver.checkSat())
+
+    timer.recordStatistics(solver)
+
+    if output:
+       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", results)
+
+    if not results.isSat():
+        return None
+
+    with timer.phase("model"):
+        return solver.getValue(tm.mkTerm(Kind.BITVECTOR_TO_NAT, decrypt))
+
+
+def decryptionScript(P, Q, E, LOWER_BOUND, N, profile=None, budget=None):
+    """SMT-LIB2 script of the query findDecryptionExponent asks cvc5, see SmtLib_Export
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        LOWER_BOUND (int): Lowest value the decryption exponent can be
+        N (int): Bitwidth, or AUTO
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Returns:
+        str: The script, the value of decrypt after sat is the Decryption Exponent
+    """
+    tm, solver, decrypt = _decryptionSolver(P, Q, E, LOWER_BOUND, N, NULL_TIMER, profile, budget)
+    return toSmtLib(solver, (CHECK_SAT, "(get-value (decrypt))"))
+
+
+def enumerateDecryptionExponents(P, Q, E, LOWER, UPPER, N, output=False, timer=None, profile=None,
+                                 budget=None):
+    """ Lazily yields every valid Decryption Exponent in [LOWER, UPPER)
+
+    One solver is kept alive for the whole enumeration, and after every model a blocking
+    clause rules that exponent out before the next checkSat. Exponents come out in
+    whatever order the solver finds them.
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        LOWER (int): Smallest value the decryption exponent can be
+        UPPER (int): Every decryption exponent is less than this, exponents stop at
+            2^N with a fixed bitwidth
+        N (int): Bitwidth, or AUTO to size every operand to its value and zero-extend
+            multiplications so they can't overflow
+        output (bool, optional): Print every result of checkSat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase of the whole
+            enumeration took. Defaults to None.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, after every exponent found before it
+
+    Yields:
+        int: The next Decryption Exponent
     """
+    if N == AUTO:
+        primeWidth = bitWidth(P, Q)
+        encryptWidth = bitWidth(E)
+        decryptWidth = bitWidth(LOWER, UPPER - 1)
+    else:
+        primeWidth = encryptWidth = decryptWidth = N
+
+    timer = timer or NULL_TIMER
+
     # ------------- SETUP -------------   
-    tm = cvc5.TermManager()
-    solver = cvc5.Solver(tm)
-    
-    solver.setLogic('QF_BV')
-    solver.setOption("produce-models", "true")
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
 
-    bitvectorN = solver.mkBitVectorSort(N)
-    ONE  = solver.mkBitVector(N,1)
+        configure(solver, "Bitvector", "decrypt", profile, P, Q, E, LOWER, UPPER, budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
 
-    # ------------- VARIABLE DECLARATIONS -------------   
-    prime1 = tm.mkConst(bitvectorN, 'prime1')
-    prime2 = tm.mkConst(bitvectorN, 'prime2')
+    with timer.phase("terms"):
+        ONE  = tm.mkBitVector(primeWidth,1)
 
-    # Public and Private exponents
-    encrypt = tm.mkConst(bitvectorN, 'encrypt')
-    decrypt = tm.mkConst(bitvectorN, 'decrypt')
+        # ------------- VARIABLE DECLARATIONS -------------   
+        prime1 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime1')
+        prime2 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime2')
 
-    # ------------- INPUT ASSERTIONS -------------   
-    inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, solver.mkBitVector(N, P))
-    solver.assertFormula(inputPredicate1)
+        # Public and Private exponents
+        encrypt = tm.mkConst(tm.mkBitVectorSort(encryptWidth), 'encrypt')
+        decrypt = tm.mkConst(tm.mkBitVectorSort(decryptWidth), 'decrypt')
 
-    inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, solver.mkBitVector(N, Q))
-    solver.assertFormula(inputPredicate2)
-    
-    inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, solver.mkBitVector(N, E))
-    solver.assertFormula(inputPredicate3)
-
-    # ------------- CONSTRAINTS -------------    
-    # Rule: Decryption Exponent must be greater than 1
-    d1 = tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, ONE)
-    solver.assertFormula(d1)
-
-    # Rule: Exponent custom lower bound
-    decrypt_lower_bound = tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, solver.mkBitVector(N, LOWER_BOUND))
-    solver.assertFormula(decrypt_lower_bound)
-
-    # Calculate Euler totient function by (p-1)(q-1) 
-    pminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime1, ONE)
-    qminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime2, ONE)
-    totientN = tm.mkTerm(Kind.BITVECTOR_MULT, pminus1, qminus1)
-
-    # Rule: Exponents must be mutliplicative inverses of each other modulo totient n
-    ed = tm.mkTerm(Kind.BITVECTOR_MULT, encrypt, decrypt)
-    moduloED = tm.mkTerm(Kind.BITVECTOR_UREM, ed, totientN)
-    moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, ONE)
-    solver.assertFormula(moduloCongruence)
-    
-    solver.checkSat()
+        # ------------- INPUT ASSERTIONS -------------   
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, prime1, tm.mkBitVector(primeWidth, P)))
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, prime2, tm.mkBitVector(primeWidth, Q)))
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, encrypt, tm.mkBitVector(encryptWidth, E)))
 
-    if output:
-       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", solver.checkSat())
+        # ------------- CONSTRAINTS -------------    
+        # Rule: Decryption Exponent must be greater than 1
+        solver.assertFormula(tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, tm.mkBitVector(decryptWidth, 1)))
+
+        # Rule: Exponent lies in [LOWER, UPPER)
+        if LOWER >= 2**decryptWidth:
+            return
+
+        solver.assertFormula(tm.mkTerm(Kind.BITVECTOR_UGE, decrypt, tm.mkBitVector(decryptWidth, max(LOWER, 0))))
+
+        if UPPER < 2**decryptWidth:
+            solver.assertFormula(tm.mkTerm(Kind.BITVECTOR_ULT, decrypt, tm.mkBitVector(decryptWidth, max(UPPER, 0))))
+
+        # Calculate Euler totient function by (p-1)(q-1) 
+        pminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime1, ONE)
+        qminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime2, ONE)
+        totientN = multiply(tm, pminus1, qminus1, N == AUTO)
+
+        # Rule: Exponents must be mutliplicative inverses of each other modulo totient n
+        ed, totientN = matchWidths(tm, multiply(tm, encrypt, decrypt, N == AUTO), totientN)
+        moduloED = tm.mkTerm(Kind.BITVECTOR_UREM, ed, totientN)
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, moduloED, tm.mkBitVector(widthOf(ed), 1)))
+
+    while True:
+        with timer.phase("solve"):
+            results = checkKnown(solver.checkSat())
+
+        if output:
+            print("Finding Decryption in ["+str(LOWER)+", "+str(UPPER)+") was", results)
+
+        if not results.isSat():
+            break
+
+        with timer.phase("model"):
+            value = solver.getValue(decrypt)
+
+        yield int(value.getBitVectorValue(), 2)
+
+        # Rule: Every exponent is only found once
+        with timer.phase("terms"):
+            solver.assertFormula(tm.mkTerm(Kind.DISTINCT, decrypt, value))
 
-    return solver.getValue(tm.mkTerm(Kind.BITVECTOR_TO_NAT, decrypt))
+    timer.recordStatistics(solver)
 
 
 if __name__ == '__main__':
@@ -2,102 +2,225 @@ import math
 import cvc5
 from cvc5 import Kind
 
-def isValidRSAConfiguration(P,Q,E,D, N, output=False):
-    """Verifies input satisfies properties specified in RSA
+from src.Bitvector.Bitvector_Width import AUTO, bitWidth, matchWidths, multiply, widthOf
+from src.Primes.Primality_Certificate import prattCertificate, smallestDivisor, trialPrimes
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.SmtLib_Export import toSmtLib
+from src.Solver.Solver_Profiles import configure
+from src.Solver.Term_Cache import DEFAULT_SIZE, TermCache
+
+
+def _checkFits(P,Q,E,D, N):
+    assert(len(bin(P*Q)[2:]) <= N), "Modulus can't fit in "+str(N)+" bits"
+    assert(len(bin(E)[2:]) <= N), "Encryption Exponent can't fit in "+str(N)+" bits"
+    assert(len(bin(D)[2:]) <= N), "Decryption Exponent can't fit in "+str(N)+" bits"
+
+
+# Trial divides by every number up to sqrt(P), sieve only by the primes up to sqrt(P),
+# pratt checks a Pratt certificate (or a single divisor) found ahead of time in Python.
+# All three give the same answers.
+PRIMALITY_MODES = ("trial", "sieve", "pratt")
+
+
+def powerMod(tm, base, exponent, modulus):
+    """Builds base^exponent mod modulus by square and multiply over the bits of the exponent
+
+    Every product is taken in twice the width of the modulus and reduced right away, so
+    nothing overflows and every intermediate stays the width of the modulus.
 
     Args:
-        P (int): Prime 1
-        Q (int): Prime 2
-        E (int): Encryption Exponent
-        D (int): Decryption Exponent
+        tm (cvc5.TermManager): Term manager the terms belong to
+        base (cvc5.Term): Bitvector the same width as modulus
+        exponent (int or cvc5.Term): Concrete exponent, or a bitvector term whose bits are
+            each turned into an ITE between multiplying by base or not
+        modulus (cvc5.Term): Bitvector modulus
+
+    Returns:
+        cvc5.Term: base^exponent mod modulus, the width of modulus
+    """
+    N = widthOf(modulus)
+    extend = tm.mkOp(Kind.BITVECTOR_ZERO_EXTEND, N)
+    truncate = tm.mkOp(Kind.BITVECTOR_EXTRACT, N - 1, 0)
+    wideModulus = tm.mkTerm(extend, modulus)
+    wideBase = tm.mkTerm(extend, base)
+
+    def mulMod(x, y):
+        product = tm.mkTerm(Kind.BITVECTOR_MULT, tm.mkTerm(extend, x), y)
+        return tm.mkTerm(truncate, tm.mkTerm(Kind.BITVECTOR_UREM, product, wideModulus))
+
+    result = tm.mkBitVector(N, 1)
+
+    if isinstance(exponent, int):
+        for bit in bin(exponent)[2:]:
+            result = mulMod(result, tm.mkTerm(extend, result))
+
+            if bit == "1":
+                result = mulMod(result, wideBase)
+
+        return result
+
+    ONE = tm.mkBitVector(1, 1)
+    for i in reversed(range(widthOf(exponent))):
+        result = mulMod(result, tm.mkTerm(extend, result))
+
+        bit = tm.mkTerm(tm.mkOp(Kind.BITVECTOR_EXTRACT, i, i), exponent)
+        result = tm.mkTerm(Kind.ITE, tm.mkTerm(Kind.EQUAL, bit, ONE), mulMod(result, wideBase), result)
+
+    return result
+
+
+def _prattConstraints(tm, prime, certificate, N):
+    """Builds the checks of a Pratt certificate
+
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime (cvc5.Term): Bitvector term being checked
+        certificate (tuple): From prattCertificate
         N (int): BITWIDTH
-        output (bool, optional): Print whether it was sat. Defaults to False.
 
     Returns:
-        bool: whether it is a valid or not
+        list: Formulas asserting prime - 1 factors as the certificate says, the witness
+            has order prime - 1, and every factor is itself prime
     """
+    n, a, factors = certificate
+    ONE = tm.mkBitVector(N, 1)
+    witness = tm.mkBitVector(N, a)
 
-    assert(len(bin(P*Q)[2:]) <= N), "Modulus can't fit in "+str(N)+" bits"
-    assert(len(bin(E)[2:]) <= N), "Encryption Exponent can't fit in "+str(N)+" bits"
-    assert(len(bin(D)[2:]) <= N), "Decryption Exponent can't fit in "+str(N)+" bits"
+    # Rule: The factors multiply back to prime - 1
+    product = []
+    for factor in factors:
+        q = factor if factor == 2 else factor[0]
+        m = n - 1
+        while m % q == 0:
+            product.append(tm.mkBitVector(N, q))
+            m //= q
 
-    # ------------- SETUP -------------   
-    tm = cvc5.TermManager()
-    solver = cvc5.Solver(tm)
-    
-    solver.setLogic('QF_BV')
-    solver.setOption("produce-models", "true")
+    pminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime, ONE)
+    product = product[0] if len(product) == 1 else tm.mkTerm(Kind.BITVECTOR_MULT, *product)
+    constraints = [tm.mkTerm(Kind.EQUAL, pminus1, product)]
 
-    bitvectorN = solver.mkBitVectorSort(N)
-    ZERO  = solver.mkBitVector(N,0)
-    ONE  = solver.mkBitVector(N,1)
+    # Rule: witness^(prime-1) = 1 but witness^((prime-1)/q) != 1 for every factor q
+    constraints.append(tm.mkTerm(Kind.EQUAL, powerMod(tm, witness, n - 1, prime), ONE))
 
-    # ------------- VARIABLE DECLARATIONS -------------   
-    prime1 = tm.mkConst(bitvectorN, 'prime1')
-    prime2 = tm.mkConst(bitvectorN, 'prime2')
+    for factor in factors:
+        q = factor if factor == 2 else factor[0]
+        power = powerMod(tm, witness, (n - 1) // q, prime)
+        constraints.append(tm.mkTerm(Kind.NOT, tm.mkTerm(Kind.EQUAL, power, ONE)))
 
-    # Public and Private exponents
-    encrypt = tm.mkConst(bitvectorN, 'encrypt')
-    decrypt = tm.mkConst(bitvectorN, 'decrypt')
+        if factor != 2:
+            constraints.extend(_prattConstraints(tm, tm.mkBitVector(N, q), factor, N))
 
-    # ------------- INPUT ASSERTIONS -------------   
-    inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, solver.mkBitVector(N, P))
-    solver.assertFormula(inputPredicate1)
+    return constraints
 
-    inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, solver.mkBitVector(N, Q))
-    solver.assertFormula(inputPredicate2)
-    
-    inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, solver.mkBitVector(N, E))
-    solver.assertFormula(inputPredicate3)
 
-    inputPredicate4 = tm.mkTerm(Kind.EQUAL, decrypt, solver.mkBitVector(N, D))
-    solver.assertFormula(inputPredicate4)
+def _primalityConstraints(tm, prime, value, N, primality="trial"):
+    """Builds the constraints that make a bitvector prime
 
-    # ------------- Constraints -------------    
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime (cvc5.Term): Bitvector term being checked
+        value (int): Concrete value of the prime, bounds the trial divisors
+        N (int): BITWIDTH
+        primality (str, optional): One of PRIMALITY_MODES. Defaults to "trial".
 
-    # Rule: Input should be primes
-    for i in range(2, math.ceil(P ** 0.5)+1):
-        x = tm.mkBitVector(N, i)
-        remainder = solver.mkTerm(Kind.BITVECTOR_UREM, prime1, x)
-        solver.assertFormula(solver.mkTerm(Kind.NOT, solver.mkTerm(Kind.EQUAL, remainder, ZERO)))
+    Returns:
+        list: Formulas asserting prime has no divisor in 2..sqrt(value)
+    """
+    ZERO = tm.mkBitVector(N, 0)
 
-    for i in range(2, math.ceil(Q ** 0.5)+1):
+    if primality == "trial":
+        divisors = range(2, math.ceil(value ** 0.5)+1)
+
+    elif primality == "sieve":
+        divisors = trialPrimes(value)
+
+    elif primality == "pratt":
+        if value < 2:
+            return []
+
+        divisor = smallestDivisor(value)
+        if divisor is None:
+            return _prattConstraints(tm, prime, prattCertificate(value), N)
+
+        divisors = [divisor]
+
+    else:
+        raise ValueError("Unknown primality mode " + str(primality))
+
+    constraints = []
+    for i in divisors:
         x = tm.mkBitVector(N, i)
-        remainder = solver.mkTerm(Kind.BITVECTOR_UREM, prime2, x)
-        solver.assertFormula(solver.mkTerm(Kind.NOT, solver.mkTerm(Kind.EQUAL, remainder, ZERO)))
+        remainder = tm.mkTerm(Kind.BITVECTOR_UREM, prime, x)
+        constraints.append(tm.mkTerm(Kind.NOT, tm.mkTerm(Kind.EQUAL, remainder, ZERO)))
 
-    # Rule: Primes are positive integers greater than 1
-    p1 = tm.mkTerm(Kind.BITVECTOR_UGT, prime1, ONE)
-    solver.assertFormula(p1)
+    return constraints
+
+
+def _operandWidths(P,Q,E,D, N):
+    """Bitwidths of the primes, encryption exponent and decryption exponent
+
+    With N = AUTO each gets the smallest width its value fits in, otherwise all are N.
+    """
+    if N == AUTO:
+        return (bitWidth(P, Q), bitWidth(E), bitWidth(D))
+
+    _checkFits(P,Q,E,D, N)
+    return (N, N, N)
+
+
+def _structuralConstraints(tm, prime1, prime2, encrypt, decrypt, widen=False):
+    """Builds every RSA rule that does not depend on the concrete input values
+
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime1 (cvc5.Term): Prime 1
+        prime2 (cvc5.Term): Prime 2, same width as prime 1
+        encrypt (cvc5.Term): Encryption Exponent
+        decrypt (cvc5.Term): Decryption Exponent
+        widen (bool, optional): Zero-extend multiplications so they can't overflow, for
+            terms of differing widths. Otherwise every term must be the same width and
+            products wrap around. Defaults to False.
+
+    Returns:
+        list: Formulas to assert
+    """
+    ONE = tm.mkBitVector(widthOf(prime1), 1)
 
-    p2 = tm.mkTerm(Kind.BITVECTOR_UGT, prime2, ONE)
-    solver.assertFormula(p2)
+    constraints = []
+
+    # Rule: Primes are positive integers greater than 1
+    constraints.append(tm.mkTerm(Kind.BITVECTOR_UGT, prime1, ONE))
+    constraints.append(tm.mkTerm(Kind.BITVECTOR_UGT, prime2, ONE))
 
     # Rule: Primes should not be equal to each other
-    p3 = tm.mkTerm(Kind.DISTINCT, prime1, prime2)
-    solver.assertFormula(p3)
+    constraints.append(tm.mkTerm(Kind.DISTINCT, prime1, prime2))
 
     # Rule: Expononts must be greater than 1
-    e1 = tm.mkTerm(Kind.BITVECTOR_UGT, encrypt, ONE)
-    solver.assertFormula(e1)
-
-    d1 = tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, ONE)
-    solver.assertFormula(d1)
+    constraints.append(tm.mkTerm(Kind.BITVECTOR_UGT, encrypt, tm.mkBitVector(widthOf(encrypt), 1)))
+    constraints.append(tm.mkTerm(Kind.BITVECTOR_UGT, decrypt, tm.mkBitVector(widthOf(decrypt), 1)))
 
-    # Calculate Euler totient function by (p-1)(q-1) 
+    # Calculate Euler totient function by (p-1)(q-1)
     pminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime1, ONE)
     qminus1 = tm.mkTerm(Kind.BITVECTOR_SUB, prime2, ONE)
-    totientN = tm.mkTerm(Kind.BITVECTOR_MULT, pminus1, qminus1)
+    totientN = multiply(tm, pminus1, qminus1, widen)
 
     # TODO: DO EUCLIDEAN DIVISION ALGORITHM
     # Rule: Encryption Exponont must be relatively prime to totient n
+    wideEncrypt, wideTotient = matchWidths(tm, encrypt, totientN)
+
+    N = widthOf(wideTotient)
+    bitvectorN = tm.mkBitVectorSort(N)
+    ZERO = tm.mkBitVector(N, 0)
+    ONE = tm.mkBitVector(N, 1)
+
     cd = tm.mkConst(bitvectorN, 'commonDenominator')
-    divideEncryption = tm.mkTerm(Kind.BITVECTOR_UREM, encrypt, cd)
-    divideTotient = tm.mkTerm(Kind.BITVECTOR_UREM, totientN, cd)
+    divideEncryption = tm.mkTerm(Kind.BITVECTOR_UREM, wideEncrypt, cd)
+    divideTotient = tm.mkTerm(Kind.BITVECTOR_UREM, wideTotient, cd)
 
     gcd = tm.mkConst(bitvectorN, 'greatestCommonDenominator')
-    gcdDividesEncryption = tm.mkTerm(Kind.BITVECTOR_UREM, encrypt, gcd)
-    gcdDividesTotient = tm.mkTerm(Kind.BITVECTOR_UREM, totientN, gcd)
+    gcdDividesEncryption = tm.mkTerm(Kind.BITVECTOR_UREM, wideEncrypt, gcd)
+    gcdDividesTotient = tm.mkTerm(Kind.BITVECTOR_UREM, wideTotient, gcd)
 
     sameDivisor = tm.mkTerm(Kind.EQUAL, divideTotient, divideEncryption, ZERO)
     properDivisor = tm.mkTerm(Kind.BITVECTOR_UGT, cd, ZERO)
@@ -112,18 +235,99 @@ def isValidRSAConfiguration(P,Q,E,D, N, output=False):
 
     greatestCommonDivisorCondition = tm.mkTerm(Kind.AND, properDivisor,sameDivisor,commonDivisorCondition, greatestDivisor, isRelativelyPrime)
 
-    solver.assertFormula(greatestCommonDivisorCondition)
+    constraints.append(greatestCommonDivisorCondition)
 
     # Rule: Encryption Exponent and Decryption Exponent must be multiplicative inverses modulo totient n
-    ed = tm.mkTerm(Kind.BITVECTOR_MULT, encrypt, decrypt)
-    moduloED = tm.mkTerm(Kind.BITVECTOR_UREM, ed, totientN)
-    moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, ONE)
-    solver.assertFormula(moduloCongruence)
-    
-    results = str(solver.checkSat())
+    ed, wideTotient = matchWidths(tm, multiply(tm, encrypt, decrypt, widen), totientN)
+    moduloED = tm.mkTerm(Kind.BITVECTOR_UREM, ed, wideTotient)
+    moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, tm.mkBitVector(widthOf(ed), 1))
+    constraints.append(moduloCongruence)
+
+    return constraints
+
+
+def _verificationSolver(P,Q,E,D, N, timer, primality, profile, budget=None):
+    """Builds the solver isValidRSAConfiguration checks, with every rule asserted"""
+    primeWidth, encryptWidth, decryptWidth = _operandWidths(P,Q,E,D, N)
+
+    # ------------- SETUP -------------
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Bitvector", "verify", profile, P,Q,E,D, budget=budget)
+        solver.setOption("produce-models", "true")
+
+    with timer.phase("terms"):
+        # ------------- VARIABLE DECLARATIONS -------------
+        prime1 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime1')
+        prime2 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime2')
+
+        # Public and Private exponents
+        encrypt = tm.mkConst(tm.mkBitVectorSort(encryptWidth), 'encrypt')
+        decrypt = tm.mkConst(tm.mkBitVectorSort(decryptWidth), 'decrypt')
+
+        # ------------- INPUT ASSERTIONS -------------
+        inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, tm.mkBitVector(primeWidth, P))
+        solver.assertFormula(inputPredicate1)
+
+        inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, tm.mkBitVector(primeWidth, Q))
+        solver.assertFormula(inputPredicate2)
+
+        inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, tm.mkBitVector(encryptWidth, E))
+        solver.assertFormula(inputPredicate3)
+
+        inputPredicate4 = tm.mkTerm(Kind.EQUAL, decrypt, tm.mkBitVector(decryptWidth, D))
+        solver.assertFormula(inputPredicate4)
+
+        # ------------- Constraints -------------
+
+        # Rule: Input should be primes
+        for constraint in _primalityConstraints(tm, prime1, P, primeWidth, primality):
+            solver.assertFormula(constraint)
+
+        for constraint in _primalityConstraints(tm, prime2, Q, primeWidth, primality):
+            solver.assertFormula(constraint)
+
+        for constraint in _structuralConstraints(tm, prime1, prime2, encrypt, decrypt, widen=N == AUTO):
+            solver.assertFormula(constraint)
+
+    return solver
+
+
+def isValidRSAConfiguration(P,Q,E,D, N, output=False, timer=None, primality="trial", profile=None,
+                            budget=None):
+    """Verifies input satisfies properties specified in RSA
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        N (int): BITWIDTH, or AUTO to size every operand to its value and zero-extend
+            multiplications so they can't overflow
+        output (bool, optional): Print whether it was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        bool: whether it is a valid or not
+    """
+    timer = timer or NULL_TIMER
+    solver = _verificationSolver(P,Q,E,D, N, timer, primality, profile, budget)
+
+    with timer.phase("solve"):
+        results = str(checkKnown(solver.checkSat()))
+
+    timer.recordStatistics(solver)
 
     if output:
-        print("RSA Configuration was: ", solver.checkSat())
+        print("RSA Configuration was: ", results)
 
     if results == "sat":
         return True
@@ -131,12 +335,246 @@ def isValidRSAConfiguration(P,Q,E,D, N, output=False):
     return False
 
 
+def verificationScript(P,Q,E,D, N, primality="trial", profile=None, budget=None):
+    """SMT-LIB2 script of the query isValidRSAConfiguration asks cvc5, see SmtLib_Export
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        N (int): BITWIDTH, or AUTO
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Returns:
+        str: The script, sat means the input is valid
+    """
+    return toSmtLib(_verificationSolver(P,Q,E,D, N, NULL_TIMER, primality, profile, budget))
+
+
+def isValidRSAConfigurationBatch(inputs, N, output=False, timer=None, primality="trial", profile=None,
+                                 budget=None):
+    """Verifies a batch of inputs in one solver
+
+    Every input's rules are asserted behind its own guard literal, and checkSatAssuming
+    on each guard in turn answers one input at a time, so the solver is only built and
+    set up once for the whole batch.
+
+    Args:
+        inputs (list): (P, Q, E, D) tuples
+        N (int): BITWIDTH, or AUTO
+        output (bool, optional): Print whether each was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase of the whole batch took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        list: whether each input is valid or not, in order
+    """
+    widths = [_operandWidths(P,Q,E,D, N) for P,Q,E,D in inputs]
+
+    timer = timer or NULL_TIMER
+
+    # ------------- SETUP -------------
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Bitvector", "verify", profile, *[value for inp in inputs for value in inp],
+                  budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
+
+    with timer.phase("terms"):
+        guards = []
+
+        for k, ((P,Q,E,D), (primeWidth, encryptWidth, decryptWidth)) in enumerate(zip(inputs, widths)):
+            # ------------- INPUT ASSERTIONS -------------
+            # Inputs are literals rather than constants bound by equalities, since behind a
+            # guard the equalities can't be substituted away and the whole circuit gets bit-blasted
+            prime1 = tm.mkBitVector(primeWidth, P)
+            prime2 = tm.mkBitVector(primeWidth, Q)
+            encrypt = tm.mkBitVector(encryptWidth, E)
+            decrypt = tm.mkBitVector(decryptWidth, D)
+
+            # ------------- Constraints -------------
+            constraints = _primalityConstraints(tm, prime1, P, primeWidth, primality)
+            constraints += _primalityConstraints(tm, prime2, Q, primeWidth, primality)
+            constraints += _structuralConstraints(tm, prime1, prime2, encrypt, decrypt, widen=N == AUTO)
+
+            guard = tm.mkConst(tm.getBooleanSort(), 'input' + str(k))
+            solver.assertFormula(tm.mkTerm(Kind.IMPLIES, guard, tm.mkTerm(Kind.AND, *constraints)))
+            guards.append(guard)
+
+    with timer.phase("solve"):
+        results = [str(checkKnown(solver.checkSatAssuming(guard))) for guard in guards]
+
+    timer.recordStatistics(solver)
+
+    if output:
+        print("RSA Configurations were: ", results)
+
+    return [result == "sat" for result in results]
+
+
+class IncrementalVerifier:
+    """Reusable verifier that keeps one solver alive across many inputs
+
+    The RSA rules are asserted once over symbolic P, Q, E, D of a fixed bitwidth
+    and every call to isValidRSAConfiguration binds the concrete inputs inside a
+    push/pop scope, so the TermManager and Solver are only ever built once. The input
+    assertions and primality constraints of every value seen are kept in a TermCache,
+    so repeated values don't rebuild any terms.
+
+    With N = AUTO the operand widths change with the inputs, so the rules are asserted
+    once per combination of widths behind a guard literal that is only switched on
+    inside the push/pop scope of inputs with those widths.
+
+    Args:
+        N (int): BITWIDTH used for every check, or AUTO
+        timer (PhaseTimer, optional): Records how long building the solver took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        cacheSize (int, optional): Most constants and subterms kept in the TermCache. Defaults to DEFAULT_SIZE.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto" for the fastest over every size. Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+    """
+
+    def __init__(self, N, timer=None, primality="trial", cacheSize=DEFAULT_SIZE, profile=None, budget=None):
+        if primality not in PRIMALITY_MODES:
+            raise ValueError("Unknown primality mode " + str(primality))
+
+        self.N = N
+        self.primality = primality
+        self._statistics = None
+
+        # (prime width, encrypt width, decrypt width) -> (guard, prime1, prime2, encrypt, decrypt)
+        self._operands = {}
+
+        timer = timer or NULL_TIMER
+
+        # ------------- SETUP -------------
+        with timer.phase("setup"):
+            self.tm = cvc5.TermManager()
+            self.solver = cvc5.Solver(self.tm)
+            self.terms = TermCache(self.tm, "Bitvector", cacheSize)
+
+            configure(self.solver, "Bitvector", "verify", profile, budget=budget)
+            self.solver.setOption("produce-models", "true")
+            self.solver.setOption("incremental", "true")
+
+        with timer.phase("terms"):
+            if N != AUTO:
+                self._declare((N, N, N))
+
+    def _declare(self, widths):
+        """Declares P, Q, E, D of the given widths and asserts the RSA rules over them"""
+        tm = self.terms
+        primeWidth, encryptWidth, decryptWidth = widths
+
+        # ------------- VARIABLE DECLARATIONS -------------
+        prime1 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime1')
+        prime2 = tm.mkConst(tm.mkBitVectorSort(primeWidth), 'prime2')
+
+        encrypt = tm.mkConst(tm.mkBitVectorSort(encryptWidth), 'encrypt')
+        decrypt = tm.mkConst(tm.mkBitVectorSort(decryptWidth), 'decrypt')
+
+        # ------------- Constraints -------------
+        constraints = _structuralConstraints(tm, prime1, prime2, encrypt, decrypt, widen=self.N == AUTO)
+
+        if self.N == AUTO:
+            guard = tm.mkConst(tm.getBooleanSort(), 'widths_' + '_'.join(map(str, widths)))
+            self.solver.assertFormula(tm.mkTerm(Kind.IMPLIES, guard, tm.mkTerm(Kind.AND, *constraints)))
+        else:
+            guard = None
+            for constraint in constraints:
+                self.solver.assertFormula(constraint)
+
+        self._operands[widths] = (guard, prime1, prime2, encrypt, decrypt)
+        return self._operands[widths]
+
+    def _bind(self, term, value):
+        """Cached assertion that term equals value"""
+        terms = self.terms
+        N = widthOf(term)
+        return terms.get(N, value, lambda: terms.mkTerm(Kind.EQUAL, term, terms.mkBitVector(N, value)), name=(term.getId(), "="))
+
+    def _primality(self, prime, value):
+        """Cached primality constraints of prime being value"""
+        terms = self.terms
+        N = widthOf(prime)
+        return terms.get(N, value, lambda: _primalityConstraints(terms, prime, value, N, self.primality), name=(prime.getId(), "prime"))
+
+    def isValidRSAConfiguration(self, P,Q,E,D, output=False, timer=None):
+        """Verifies input satisfies properties specified in RSA
+
+        Args:
+            P (int): Prime 1
+            Q (int): Prime 2
+            E (int): Encryption Exponent
+            D (int): Decryption Exponent
+            output (bool, optional): Print whether it was sat. Defaults to False.
+            timer (PhaseTimer, optional): Records how long each phase took, statistics
+                only cover this call. Defaults to None.
+
+        Raises:
+            SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+        Returns:
+            bool: whether it is a valid or not
+        """
+        widths = _operandWidths(P,Q,E,D, self.N)
+
+        timer = timer or NULL_TIMER
+        solver = self.solver
+
+        with timer.phase("terms"):
+            operands = self._operands.get(widths) or self._declare(widths)
+            guard, prime1, prime2, encrypt, decrypt = operands
+
+        solver.push()
+        try:
+            with timer.phase("terms"):
+                if guard is not None:
+                    solver.assertFormula(guard)
+
+                # ------------- INPUT ASSERTIONS -------------
+                solver.assertFormula(self._bind(prime1, P))
+                solver.assertFormula(self._bind(prime2, Q))
+                solver.assertFormula(self._bind(encrypt, E))
+                solver.assertFormula(self._bind(decrypt, D))
+
+                # Rule: Input should be primes
+                for constraint in self._primality(prime1, P):
+                    solver.assertFormula(constraint)
+
+                for constraint in self._primality(prime2, Q):
+                    solver.assertFormula(constraint)
+
+            with timer.phase("solve"):
+                results = str(checkKnown(solver.checkSat()))
+
+            self._statistics = timer.recordStatistics(solver, since=self._statistics)
+        finally:
+            solver.pop()
+
+        if output:
+            print("RSA Configuration was: ", results)
+
+        return results == "sat"
+
+
 if __name__ == '__main__':
-    
+
     # ------------- INPUT -------------
-    P = 11 
+    P = 11
     Q = 13
-    E = 23 
+    E = 23
     D = 47
 
     N = 32 # BITVECTOR LENGTH
@@ -144,6 +582,6 @@ if __name__ == '__main__':
     D = isValidRSAConfiguration(P,Q,E,D, N)
 
     if D:
-        print("This is a valid configuration")    
+        print("This is a valid configuration")
     else:
-        print("This is not a valid configuration")    
+        print("This is not a valid configuration")
@@ -0,0 +1,211 @@
+"""
+BENCHMARK SUITE
+
+Times the Python, Integer and Bitvector findDecryptionExponent backends on a fixed
+workload with warmup calls and repeated measurements, and summarizes every backend with
+robust statistics (median, p95, p99, MAD) in a JSON file that can be diffed between
+commits to catch performance regressions.
+
+THE WORKLOAD IS
+    - The first NUM_OF_INPUTS (P, Q, E) triples of the CONSECUTIVE window, with the
+        decryption exponent greater than LOWER_BOUND and BITWIDTH bits for bitvectors
+"""
+
+import itertools
+import json
+import os
+import platform
+import statistics
+import time
+
+from src.Python.RSA_Finding_Valid_Decryption import findDecryptionExponent as pyFindDecrypt
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+from src.Primes.Prime_Window import consecutiveWindow
+
+BACKENDS = ("Python", "Integer", "Bitvector")
+METRICS = ("median", "p95", "p99", "mad", "mean", "min", "max")
+
+
+def decryptionWorkload(numOfInputs, lowerBound=500, bitwidth=64):
+    """Describes the decryption workload every backend is run on
+
+    Args:
+        numOfInputs (int): How many (P, Q, E) triples
+        lowerBound (int, optional): Decryption exponent will be greater than this. Defaults to 500.
+        bitwidth (int, optional): Bitwidth for bitvectors. Defaults to 64.
+
+    Returns:
+        dict: The workload, stored in the summary so runs are only compared like for like
+    """
+    return {"name": "decryption", "numOfInputs": numOfInputs, "lowerBound": lowerBound, "bitwidth": bitwidth}
+
+
+def _backendCall(backend, workload):
+    """Returns a function that runs the backend on one (P, Q, E)"""
+    lowerBound = workload["lowerBound"]
+
+    if backend == "Python":
+        return lambda P,Q,E: pyFindDecrypt(P,Q,E, lowerBound)
+
+    elif backend == "Integer":
+        return lambda P,Q,E: intFindDecrypt(P,Q,E, lowerBound)
+
+    elif backend == "Bitvector":
+        bitwidth = workload["bitwidth"]
+        return lambda P,Q,E: bvFindDecrypt(P,Q,E, lowerBound, bitwidth)
+
+    raise ValueError("Unknown backend " + str(backend))
+
+
+def _percentile(ordered, q):
+    """Linearly interpolated percentile of an already sorted list, q in [0, 100]"""
+    if len(ordered) == 1:
+        return ordered[0]
+
+    position = (len(ordered) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def summarize(samples):
+    """Robust statistics of timing samples, in seconds
+
+    Args:
+        samples (list): Timings in seconds
+
+    Returns:
+        dict: Every metric in METRICS plus the sample count
+    """
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+
+    return {
+        "samples": len(ordered),
+        "median": median,
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "mad": statistics.median(abs(x - median) for x in ordered),
+        "mean": statistics.fmean(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+
+def pinCpu(cpu):
+    """Pins this process to one CPU where the platform allows it
+
+    Args:
+        cpu (int): CPU index
+
+    Returns:
+        bool: Whether the process was pinned
+    """
+    if cpu is None or not hasattr(os, "sched_setaffinity"):
+        return False
+
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError:
+        return False
+
+    return True
+
+
+def runBenchmark(workload, backends=BACKENDS, warmup=3, repeats=5, cpu=None):
+    """Times every backend on the workload
+
+    Each input is first run warmup times untimed, then repeats times timed with
+    perf_counter_ns.
+
+    Args:
+        workload (dict): From decryptionWorkload
+        backends (tuple, optional): Backends to run. Defaults to BACKENDS.
+        warmup (int, optional): Untimed calls per input. Defaults to 3.
+        repeats (int, optional): Timed calls per input. Defaults to 5.
+        cpu (int, optional): CPU to pin to. Defaults to None.
+
+    Returns:
+        dict: Summary with the workload, settings, environment and per backend statistics
+    """
+    pinned = pinCpu(cpu)
+    triples = list(itertools.islice(consecutiveWindow(), workload["numOfInputs"]))
+
+    results = {}
+    for backend in backends:
+        call = _backendCall(backend, workload)
+
+        samples = []
+        for P, Q, E in triples:
+            for _ in range(warmup):
+                call(P,Q,E)
+
+            for _ in range(repeats):
+                start = time.perf_counter_ns()
+
+                call(P,Q,E)
+
+                end = time.perf_counter_ns()
+                samples.append((end - start) / 1e9)
+
+        results[backend] = summarize(samples)
+
+    try:
+        import cvc5
+        cvc5Version = cvc5.__version__
+    except (ImportError, AttributeError):
+        cvc5Version = None
+
+    return {
+        "workload": workload,
+        "settings": {"warmup": warmup, "repeats": repeats, "cpu": cpu if pinned else None},
+        "environment": {"python": platform.python_version(), "cvc5": cvc5Version,
+                        "machine": platform.machine(), "processor": platform.processor()},
+        "results": results,
+    }
+
+
+def saveSummary(summary, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w") as file:
+        json.dump(summary, file, indent=2, sort_keys=True)
+
+
+def loadSummary(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compareSummaries(baseline, current, threshold=0.10, metrics=("median", "p95")):
+    """Finds backends that got slower between two summaries
+
+    Args:
+        baseline (dict): Summary from the earlier commit
+        current (dict): Summary from this commit
+        threshold (float, optional): Allowed relative slowdown. Defaults to 0.10.
+        metrics (tuple, optional): Metrics to compare. Defaults to ("median", "p95").
+
+    Returns:
+        list: (backend, metric, baseline value, current value, relative change) for every regression
+    """
+    if baseline["workload"] != current["workload"]:
+        raise ValueError("Summaries were run on different workloads")
+
+    regressions = []
+    for backend, stats in current["results"].items():
+        if backend not in baseline["results"]:
+            continue
+
+        for metric in metrics:
+            before = baseline["results"][backend][metric]
+            after = stats[metric]
+
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append((backend, metric, before, after, after / before - 1))
+
+    return regressions
@@ -0,0 +1,100 @@
+"""
+EXPERIMENT CHECKPOINTS
+
+Keeps how far an experiment got so an interrupted run can pick up where it stopped
+instead of starting again from index 0.
+
+Every experiment writes its rows in a fixed order, so progress is a high-water mark per
+type: how many of the first rows are on disk, and how long the data file was once they
+were. That is a few numbers however big the sweep is, and a resumed run starts from the
+row after it.
+
+The checkpoint is rewritten atomically (a temporary file replaces it) after every flush
+of the rows, so pass Checkpoint.commit as the onFlush of the StreamingResultWriter the
+rows go to, tell it which file that is with track and call mark before writing each row.
+Rows that reached the data file after the last commit, like when a crash hit between the
+two or left a torn last line, are cut off by resume and run again, so nothing is written
+twice.
+"""
+
+import json
+import os
+
+
+class Checkpoint:
+    """High-water marks of the rows of every type of an experiment
+
+    Args:
+        path (str): Checkpoint file, usually inside the experiment's DATA_DIRECTORY
+        reset (bool, optional): Forget any previous progress. Defaults to False.
+    """
+
+    def __init__(self, path, reset=False):
+        self.path = path
+        # type -> {"rows": rows on disk, "path": file they are in, "offset": its length after them}
+        self._marks = {}
+        self._paths = {}
+        self._pending = {}
+
+        if reset and os.path.exists(path):
+            os.remove(path)
+
+        if os.path.exists(path):
+            with open(path) as file:
+                self._marks = json.load(file)
+
+    def rows(self, ty):
+        """How many of the type's first rows were committed"""
+        return self._marks[ty]["rows"] if ty in self._marks else 0
+
+    def resume(self, ty, dataPath):
+        """Cuts the type's data file back to its last commit, before anything is appended to it
+
+        Args:
+            ty (str): Type of the rows
+            dataPath (str): File the type's rows go to, emptied if none of them were committed yet
+
+        Raises:
+            ValueError: The data file is shorter than its checkpoint, so rows were lost
+
+        Returns:
+            int: How many of the type's first rows are on disk, the run starts after them
+        """
+        mark = self._marks.get(ty, {"rows": 0, "path": dataPath, "offset": 0})
+
+        if not os.path.exists(mark["path"]):
+            if mark["offset"]:
+                raise ValueError(mark["path"] + " is missing, start again without resuming")
+            return 0
+
+        if os.path.getsize(mark["path"]) < mark["offset"]:
+            raise ValueError(mark["path"] + " is shorter than its checkpoint, start again without resuming")
+
+        # Rows past the offset never made it into a commit, the last one may even be torn
+        os.truncate(mark["path"], mark["offset"])
+
+        return mark["rows"]
+
+    def track(self, ty, dataPath):
+        """Starts committing the type's rows along with the file they are written to"""
+        self._paths[ty] = dataPath
+        self.commit()
+
+    def mark(self, ty):
+        """Counts one more row of the type, it is saved on the next commit"""
+        self._pending[ty] = self._pending.get(ty, 0) + 1
+
+    def commit(self):
+        """Saves every marked row, call it once they are on disk"""
+        for ty, dataPath in self._paths.items():
+            self._marks[ty] = {"rows": self.rows(ty) + self._pending.pop(ty, 0),
+                               "path": dataPath,
+                               "offset": os.path.getsize(dataPath) if os.path.exists(dataPath) else 0}
+
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as file:
+            json.dump(self._marks, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary, self.path)
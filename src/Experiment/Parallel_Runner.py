@@ -0,0 +1,330 @@
+"""
+PARALLEL VERIFICATION RACE RUNNER
+
+Times isValidRSAConfiguration(i,j,k,l) on every input in range(0,INTEGER_BOUND)^4, or only
+some of them, sharded across a pool of worker processes. Every worker builds its verifiers
+once and times each call with perf_counter_ns, and rows come back in the order of the
+nested i,j,k,l loops however many workers there are.
+
+How an input is answered is set by runVerificationRace: a result cache, a prefilter for
+obviously invalid inputs, batches in one solver, a solver profile, an external SMT-LIB2
+solver or escalating budgets. An input the solver can't answer is recorded as "timeout",
+"unknown" or "error" and counted, never as invalid.
+"""
+
+import itertools
+import multiprocessing
+import time
+
+from src.Solver.Budget import SolverUnknown, retryWithBudgets, unknownAnswer
+from src.Solver.Instrumentation import COLUMNS, PhaseTimer
+from src.Solver.Prefilter import Prefilter
+from src.Solver.External_Backend import ExternalVerifier
+from src.Solver.Result_Cache import ResultCache, memoize
+from src.Solver.Solver_Pool import DEFAULT_TIMEOUT, SolverError, SolverPool
+from src.Solver.Solver_Profiles import resolveProfile
+
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfigurationBatch as intValidBatch
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfigurationBatch as bvValidBatch
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+
+
+# Everything the runner counts, see runVerificationRace
+COUNTS = ("answered", "solver", "unknown", "errors", "retries")
+
+# Solvers owned by the current worker process, keyed by (type, bitwidth, incremental, result cache, prefilter, profile,
+# external solver, budget)
+_verifiers = {}
+
+# Result caches opened by the current worker process, keyed by path
+_resultCaches = {}
+
+
+def _getVerifier(ty, N, incremental, resultCache=None, prefilter=False, profile=None, external=None, budget=None):
+    """Returns a verification function for a theory, building it once per process
+
+    external is None for cvc5's bindings, otherwise the (command, timeout) of the solver
+    every query is run on.
+    """
+    key = (ty, N, incremental, resultCache, prefilter, profile, external, budget)
+
+    if key not in _verifiers and prefilter:
+        _verifiers[key] = Prefilter(_getVerifier(ty, N, incremental, resultCache, profile=profile, external=external,
+                                                 budget=budget))
+
+    if key not in _verifiers and resultCache is not None:
+        if resultCache not in _resultCaches:
+            _resultCaches[resultCache] = ResultCache(resultCache)
+
+        width = N if ty == "Bitvector" else None
+        # Profiles and budgets never change answers, so they all share the same cached answers
+        _verifiers[key] = memoize(_getVerifier(ty, N, incremental, profile=profile, external=external, budget=budget),
+                                  _resultCaches[resultCache], "verify", ty, width)
+
+    if key not in _verifiers and external is not None:
+        command, timeout = external
+        _verifiers[key] = ExternalVerifier(SolverPool(1, command, timeout), ty, N, profile=profile,
+                                           budget=budget).isValidRSAConfiguration
+
+    if key not in _verifiers:
+        if ty == "Integer":
+            if incremental:
+                _verifiers[key] = IntVerifier(profile=profile, budget=budget).isValidRSAConfiguration
+            else:
+                _verifiers[key] = lambda P,Q,E,D, timer=None: intValid(P,Q,E,D, timer=timer, profile=profile, budget=budget)
+
+        elif ty == "Bitvector":
+            if incremental:
+                _verifiers[key] = BvVerifier(N, profile=profile, budget=budget).isValidRSAConfiguration
+            else:
+                _verifiers[key] = lambda P,Q,E,D, timer=None: bvValid(P,Q,E,D, N, timer=timer, profile=profile,
+                                                                      budget=budget)
+
+        else:
+            raise ValueError("Unknown type " + str(ty))
+
+    return _verifiers[key]
+
+
+def _getBatchVerifier(ty, N, profile=None):
+    """Returns a function that verifies a list of inputs in one solver"""
+    if ty == "Integer":
+        return lambda inputs, timer=None: intValidBatch(inputs, timer=timer, profile=profile)
+
+    elif ty == "Bitvector":
+        return lambda inputs, timer=None: bvValidBatch(inputs, N, timer=timer, profile=profile)
+
+    raise ValueError("Unknown type " + str(ty))
+
+
+def indexToInput(index, bound):
+    """Converts a position in the nested loops into its (i,j,k,l) input
+
+    Args:
+        index (int): Position in the order the nested loops visit inputs
+        bound (int): INTEGER_BOUND of the sweep
+
+    Returns:
+        tuple: (i,j,k,l)
+    """
+    index, l = divmod(index, bound)
+    index, k = divmod(index, bound)
+    i, j = divmod(index, bound)
+    return (i, j, k, l)
+
+
+def verifyShard(task):
+    """Runs one shard of the sweep inside a worker
+
+    Args:
+        task (tuple): (type, INTEGER_BOUND, BITWIDTH, settings, indices), settings holds
+            incremental, instrument, resultCache, bypass, prefilter, batchSize, profile, external
+            and budgets
+
+    Returns:
+        tuple: (rows, counts) where rows are (clock_time, (i,j,k,l), answer, phases) for
+            every input in the shard and counts says how many the prefilter answered, how
+            many went to the solver, how many no budget answered, how many the solver failed
+            on and how many retries ran
+    """
+    ty, bound, N, settings, indices = task
+
+    if settings["batchSize"]:
+        return _verifyShardInBatches(ty, bound, N, settings, indices)
+
+    budgets = settings["budgets"]
+
+    def verifier(budget, profile):
+        return _getVerifier(ty, N, settings["incremental"], settings["resultCache"], settings["prefilter"], profile,
+                            settings["external"], budget)
+
+    # Every input's first attempt goes through this one, so its prefilter counts cover every input once
+    first = budgets[0] if budgets else None
+    valid = verifier(first, (first and first.profile) or settings["profile"])
+    timer = PhaseTimer() if settings["instrument"] else None
+    options = {"bypass": settings["bypass"]} if settings["resultCache"] is not None else {}
+
+    before = valid.counts() if settings["prefilter"] else None
+    unknown = errors = retries = 0
+
+    results = []
+    for index in indices:
+        inp = indexToInput(index, bound)
+
+        if timer is not None:
+            timer.reset()
+
+        start = time.perf_counter_ns()
+
+        try:
+            d, attempts = retryWithBudgets(lambda budget, profile: verifier(budget, profile)(*inp, timer=timer, **options),
+                                           budgets, settings["profile"])
+        except SolverUnknown as error:
+            d, attempts = unknownAnswer(error), max(len(budgets), 1)
+            unknown += 1
+        except SolverError:
+            # The external solver is started again by the next query
+            d, attempts = "error", 1
+            errors += 1
+
+        retries += attempts - 1
+
+        end = time.perf_counter_ns()
+
+        phases = timer.row() if timer is not None else [None] * len(COLUMNS)
+        results.append(((end - start) / 1e9, inp, d, phases))
+
+    if before is None:
+        counts = {"answered": 0, "solver": len(results)}
+    else:
+        counts = {name: value - before[name] for name, value in valid.counts().items()}
+
+    counts["unknown"] = unknown
+    counts["errors"] = errors
+    counts["retries"] = retries
+
+    return results, counts
+
+
+def _verifyShardInBatches(ty, bound, N, settings, indices):
+    """Runs one shard batchSize inputs at a time, see verifyShard"""
+    validBatch = _getBatchVerifier(ty, N, settings["profile"])
+    timer = PhaseTimer() if settings["instrument"] else None
+    batchSize = settings["batchSize"]
+
+    results = []
+    unknown = errors = 0
+    for first in range(0, len(indices), batchSize):
+        inputs = [indexToInput(index, bound) for index in indices[first:first + batchSize]]
+
+        if timer is not None:
+            timer.reset()
+
+        start = time.perf_counter_ns()
+
+        # One input cvc5 gives up on leaves the rest of its batch unanswered too
+        try:
+            answers = validBatch(inputs, timer=timer)
+        except SolverUnknown as error:
+            answers = [unknownAnswer(error)] * len(inputs)
+            unknown += len(inputs)
+        except SolverError:
+            answers = ["error"] * len(inputs)
+            errors += len(inputs)
+
+        end = time.perf_counter_ns()
+
+        phases = timer.row() if timer is not None else [None] * len(COLUMNS)
+        for inp, d in zip(inputs, answers):
+            results.append(((end - start) / 1e9, inp, d, phases))
+
+    return results, {"answered": 0, "solver": len(results), "unknown": unknown, "errors": errors,
+                     "retries": 0}
+
+
+def _shards(ty, bound, N, settings, chunkSize, skip, indices=None):
+    """Splits the sweep, or only the given indices, into chunks, leaving out inputs that skip rejects"""
+    if indices is None:
+        total = bound ** 4
+        chunks = (range(start, min(start + chunkSize, total)) for start in range(0, total, chunkSize))
+    else:
+        remaining = iter(indices)
+        chunks = iter(lambda: list(itertools.islice(remaining, chunkSize)), [])
+
+    for chunk in chunks:
+        if skip is not None:
+            pending = [index for index in chunk if not skip(indexToInput(index, bound))]
+
+            if not pending:
+                continue
+            if len(pending) < len(chunk):
+                chunk = pending
+
+        yield (ty, bound, N, settings, chunk)
+
+
+def runVerificationRace(ty, bound, N, numOfWorkers=1, chunkSize=1000, incremental=True, skip=None, instrument=False,
+                        resultCache=None, bypass=False, prefilter=False, counts=None, batchSize=None, profile=None,
+                        solverCommand=None, solverTimeout=DEFAULT_TIMEOUT, budgets=None, indices=None):
+    """Times isValidRSAConfiguration on every input in range(0,bound)^4
+
+    Args:
+        ty (str): "Integer" or "Bitvector"
+        bound (int): INTEGER_BOUND of the sweep
+        N (int): Bitwidth for bitvectors
+        numOfWorkers (int, optional): Worker processes to shard across. Defaults to 1.
+        chunkSize (int, optional): Inputs handed to a worker at a time. Defaults to 1000.
+        incremental (bool, optional): Reuse one solver per worker. Defaults to True.
+        skip (callable, optional): Called with each (i,j,k,l), inputs it returns True for
+            are not run. Defaults to None.
+        instrument (bool, optional): Time every solver phase and keep cvc5's statistics,
+            otherwise the phase columns are left blank. Defaults to False.
+        resultCache (str, optional): SQLite file answers are memoized in, None to always
+            run the solver. Defaults to None.
+        bypass (bool, optional): Still run the solver for every input and only write the
+            answers to the result cache, so clock_time stays honest. Defaults to False.
+        prefilter (bool, optional): Answer obviously invalid inputs in Python without the
+            solver. Defaults to False.
+        counts (dict, optional): Filled in with how many inputs the prefilter "answered",
+            how many went to the "solver", how many no budget answered ("unknown"), how many
+            the solver failed on ("errors") and how many "retries" ran as results come back.
+            Defaults to None.
+        batchSize (int, optional): Verify this many inputs at a time in one solver instead
+            of one call per input, the clock_time of every input is then its whole batch's
+            and incremental is ignored. Can't be combined with resultCache or prefilter.
+            Defaults to None.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto" for the one
+            tuned fastest at the size of bound. Defaults to None, the baseline.
+        solverCommand (tuple, optional): Command line of an external SMT-LIB2 solver every
+            query is run on instead of cvc5's bindings, like Solver_Pool.DEFAULT_COMMAND.
+            incremental is then ignored and it can't be combined with batchSize. Defaults to None.
+        solverTimeout (float, optional): Seconds an external query may take before its solver
+            is restarted and the answer is "timeout". Defaults to DEFAULT_TIMEOUT.
+        budgets (list, optional): Escalation ladder of Budgets, every query gets the limits of
+            the first and is retried with each next one while the solver can't answer it.
+            Can't be combined with batchSize. Defaults to None, no limits.
+        indices (iterable, optional): Indices of the inputs to run (see indexToInput) instead
+            of every input, rows then come back in this order. Defaults to None.
+
+    Yields:
+        tuple: (clock_time, (i,j,k,l), answer, phases) in nested loop order or the order of indices,
+            phases lines up with Instrumentation.COLUMNS
+    """
+    if batchSize and (resultCache is not None or prefilter or solverCommand is not None or budgets):
+        raise ValueError("batchSize can't be combined with resultCache, prefilter, solverCommand or budgets")
+
+    # Resolved once here so every worker uses the same profile
+    profile = resolveProfile(profile, ty, "verify", max(bound - 1, 0))
+    budgets = tuple(budget._replace(profile=resolveProfile(budget.profile, ty, "verify", max(bound - 1, 0)))
+                    if budget.profile else budget for budget in budgets or ())
+
+    settings = {"incremental": incremental, "instrument": instrument, "resultCache": resultCache,
+                "bypass": bypass, "prefilter": prefilter, "batchSize": batchSize, "profile": profile,
+                "external": None if solverCommand is None else (tuple(solverCommand), solverTimeout),
+                "budgets": budgets}
+    tasks = _shards(ty, bound, N, settings, chunkSize, skip, indices)
+
+    if counts is not None:
+        for name in COUNTS:
+            counts.setdefault(name, 0)
+
+    if numOfWorkers <= 1:
+        shards = map(verifyShard, tasks)
+    else:
+        pool = multiprocessing.Pool(numOfWorkers)
+        # imap hands results back in task order no matter which worker finishes first
+        shards = pool.imap(verifyShard, tasks)
+
+    try:
+        for results, shardCounts in shards:
+            if counts is not None:
+                for name, value in shardCounts.items():
+                    counts[name] += value
+
+            yield from results
+    finally:
+        if numOfWorkers > 1:
+            pool.terminate()
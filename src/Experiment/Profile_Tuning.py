@@ -0,0 +1,158 @@
+"""
+SOLVER PROFILE TUNING
+
+Times every solver profile of a theory on a sample of an experiment's workload, and
+records the fastest profile of every input size bucket in the tuning table that
+profile="auto" reads (Solver_Profiles.TUNING_FILE).
+
+THE SAMPLES ARE
+    - verify: For consecutive primes starting at 2^(bits-1), the valid (P, Q, E, D) with D
+        the inverse of E, and the invalid (P, Q, E, D+1) next to it
+    - decrypt: The same consecutive window (P, Q, E) triples with a decryption exponent
+        greater than lowerBound
+
+Every profile is timed on every input, the fastest of repeats calls counting, and a
+bucket's fastest profile is the one with the smallest total over the bucket. The fastest
+over the whole sample is kept under Solver_Profiles.ALL_SIZES for calls that don't know
+their size. Profiles must give the same verification answers, tuning stops if they don't.
+"""
+
+import itertools
+import json
+import os
+import time
+
+from src.Bitvector.Bitvector_Width import AUTO
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+from src.Primes.Prime_Window import consecutiveWindow, primeStream
+from src.Solver.Solver_Profiles import ALL_SIZES, TUNING_FILE, profilesFor, sizeBucket
+
+QUERIES = ("verify", "decrypt")
+
+
+def _windows(bits, perBucket):
+    """perBucket consecutive window triples starting at 2^(b-1) for every b in bits"""
+    for b in bits:
+        yield from itertools.islice(consecutiveWindow(primeStream(2 ** (b - 1))), perBucket)
+
+
+def verificationSample(bits=(8, 12, 16), perBucket=5):
+    """Valid and invalid (P, Q, E, D) inputs of every size in bits
+
+    Args:
+        bits (tuple, optional): Bit lengths of the primes. Defaults to (8, 12, 16).
+        perBucket (int, optional): Windows per bit length, each gives two inputs. Defaults to 5.
+
+    Returns:
+        list: (P, Q, E, D) tuples
+    """
+    inputs = []
+
+    for P, Q, E in _windows(bits, perBucket):
+        D = pow(E, -1, (P-1)*(Q-1))
+        inputs.append((P, Q, E, D))
+        inputs.append((P, Q, E, D + 1))
+
+    return inputs
+
+
+def decryptionSample(bits=(8, 12, 16), perBucket=5, lowerBound=0):
+    """(P, Q, E, lowerBound) inputs of every size in bits
+
+    Args:
+        bits (tuple, optional): Bit lengths of the primes. Defaults to (8, 12, 16).
+        perBucket (int, optional): Windows per bit length. Defaults to 5.
+        lowerBound (int, optional): Decryption exponent will be greater than this. Defaults to 0.
+
+    Returns:
+        list: (P, Q, E, lowerBound) tuples
+    """
+    return [(P, Q, E, lowerBound) for P, Q, E in _windows(bits, perBucket)]
+
+
+def _queryCall(theory, query, N, profile):
+    """Returns a function that answers one input of the query with a profile"""
+    if theory == "Integer":
+        if query == "verify":
+            return lambda *inp: intValid(*inp, profile=profile)
+        elif query == "decrypt":
+            return lambda *inp: intFindDecrypt(*inp, profile=profile)
+
+    elif theory == "Bitvector":
+        if query == "verify":
+            return lambda *inp: bvValid(*inp, N, profile=profile)
+        elif query == "decrypt":
+            return lambda *inp: bvFindDecrypt(*inp, N, profile=profile)
+
+    raise ValueError("Unknown theory or query " + str(theory) + ", " + str(query))
+
+
+def tuneProfiles(theory, query, inputs, N=AUTO, profiles=None, repeats=3):
+    """Times every profile on every input and picks the fastest per size bucket
+
+    Args:
+        theory (str): "Integer" or "Bitvector"
+        query (str): "verify" or "decrypt"
+        inputs (list): Sample from verificationSample or decryptionSample
+        N (int, optional): Bitwidth for bitvectors. Defaults to AUTO.
+        profiles (list, optional): Profiles to compare. Defaults to every profile of the theory.
+        repeats (int, optional): Timed calls per input and profile, the fastest counts. Defaults to 3.
+
+    Returns:
+        dict: {"fastest": {bucket: profile}, "seconds": {bucket: {profile: total seconds}}}
+    """
+    profiles = profiles or profilesFor(theory)
+    calls = {profile: _queryCall(theory, query, N, profile) for profile in profiles}
+
+    seconds = {}
+    for inp in inputs:
+        answers = {}
+
+        for profile in profiles:
+            best = None
+            for _ in range(repeats):
+                start = time.perf_counter_ns()
+
+                answers[profile] = calls[profile](*inp)
+
+                end = time.perf_counter_ns()
+                best = end - start if best is None else min(best, end - start)
+
+            for bucket in (sizeBucket(*inp), ALL_SIZES):
+                totals = seconds.setdefault(bucket, dict.fromkeys(profiles, 0.0))
+                totals[profile] += best / 1e9
+
+        # Decryption exponents can differ between profiles, any valid one is an answer
+        if query == "verify" and len(set(answers.values())) > 1:
+            raise ValueError("Profiles disagree on " + str(inp) + ": " + str(answers))
+
+    fastest = {bucket: min(totals, key=totals.get) for bucket, totals in seconds.items()}
+
+    return {"fastest": fastest, "seconds": seconds}
+
+
+def saveTuning(theory, query, fastest, path=TUNING_FILE):
+    """Merges the fastest profile per bucket of one theory and query into the tuning table
+
+    Args:
+        theory (str): "Integer" or "Bitvector"
+        query (str): "verify" or "decrypt"
+        fastest (dict): {bucket: profile} from tuneProfiles
+        path (str, optional): Tuning table. Defaults to TUNING_FILE.
+    """
+    table = {}
+    if os.path.exists(path):
+        with open(path) as file:
+            table = json.load(file)
+
+    table.setdefault(theory, {})[query] = fastest
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "w") as file:
+        json.dump(table, file, indent=2, sort_keys=True)
@@ -0,0 +1,163 @@
+"""
+STREAMING RESULT WRITER
+
+Writes experiment rows to disk in chunks as they are produced instead of holding every
+timing, input and answer in memory until the end of the run.
+
+THE FORMATS ARE
+    - "csv": Plain CSV, same layout the plot scripts already read. Every chunk is flushed
+        and fsync'd, so a crash loses at most the last unflushed chunk
+
+    - "arrow": Arrow IPC stream with one record batch per chunk (needs pyarrow).
+        A partial file can be read back up to its last complete batch. Streams can't be
+        appended to, so appending starts the next free <name>.<n>.arrow part file instead.
+        Every column's type comes from COLUMN_TYPES by its name, blank cells are nulls
+"""
+
+import csv
+import os
+
+from src.Solver.Instrumentation import PHASES
+
+FORMATS = ("csv", "arrow")
+
+# Arrow type of every column the experiments write, any other column is a string.
+# Answers hold "timeout", "unknown" or "error" next to True and False, and the decryption
+# exponent can outgrow int64, so both are strings like in the csv files
+COLUMN_TYPES = {"type": "string", "clock_time": "float64",
+                "P": "int64", "Q": "int64", "E": "int64", "D": "int64",
+                "Answers": "string", "calculated_D": "string", "source": "string", "stratum": "string",
+                "cvc5_statistics": "string",
+                **{phase + "_ns": "int64" for phase in PHASES}}
+
+
+def _toColumnValue(value, type):
+    """Converts a cell to the column's type, blanks become nulls and everything else in a
+    string column is stringified like csv does"""
+    if value is None or value == "":
+        return None
+    if type == "string":
+        return str(value)
+    if type == "int64":
+        return int(value)
+    return float(value)
+
+
+def _nextPartPath(path):
+    """First of path, <name>.1<ext>, <name>.2<ext>, ... that is missing or empty"""
+    stem, ext = os.path.splitext(path)
+    candidate = path
+    part = 0
+
+    while os.path.exists(candidate) and os.path.getsize(candidate) > 0:
+        part += 1
+        candidate = stem + "." + str(part) + ext
+
+    return candidate
+
+
+class StreamingResultWriter:
+    """Buffers rows and writes them out every chunkSize rows
+
+    Args:
+        path (str): File to write to
+        header (list): Column names
+        chunkSize (int, optional): Rows kept in memory before flushing. Defaults to 10000.
+        format (str, optional): One of FORMATS. Defaults to "csv".
+        mode (str, optional): "w" to start a new file, "a" to append to an existing one. Defaults to "w".
+        fsync (bool, optional): fsync after every flush so flushed rows survive a crash. Defaults to True.
+        onFlush (callable, optional): Called after every flush, once the rows are on disk. Defaults to None.
+    """
+
+    def __init__(self, path, header, chunkSize=10000, format="csv", mode="w", fsync=True, onFlush=None):
+        if format not in FORMATS:
+            raise ValueError("Unknown format " + str(format) + ", expected one of " + str(FORMATS))
+
+        self.path = path
+        self.header = list(header)
+        self.chunkSize = chunkSize
+        self.format = format
+        self.fsync = fsync
+        self.onFlush = onFlush
+        self.rowsWritten = 0
+
+        self._buffer = []
+
+        if format == "csv":
+            newFile = mode == "w" or not os.path.exists(path) or os.path.getsize(path) == 0
+
+            self._file = open(path, mode, newline='')
+            self._writer = csv.writer(self._file)
+
+            if newFile:
+                self._writer.writerow(self.header)
+
+        elif format == "arrow":
+            try:
+                import pyarrow
+            except ImportError as e:
+                raise ImportError("The arrow format needs pyarrow, pip install pyarrow") from e
+
+            if mode == "a":
+                path = _nextPartPath(path)
+                self.path = path
+
+            self._pa = pyarrow
+            self._file = open(path, "wb")
+            self._types = [COLUMN_TYPES.get(name, "string") for name in self.header]
+            self._schema = pyarrow.schema([(name, getattr(pyarrow, type)())
+                                           for name, type in zip(self.header, self._types)])
+            self._writer = pyarrow.ipc.new_stream(self._file, self._schema)
+
+    def write(self, row):
+        """Adds one row, flushing if the chunk is full"""
+        self._buffer.append(row)
+
+        if len(self._buffer) >= self.chunkSize:
+            self.flush()
+
+    def writeRows(self, rows):
+        """Adds many rows, flushing whenever a chunk fills up"""
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        """Writes every buffered row to disk"""
+        if self._buffer:
+            if self.format == "csv":
+                self._writer.writerows(self._buffer)
+
+            elif self.format == "arrow":
+                columns = [[_toColumnValue(v, type) for v in column]
+                           for column, type in zip(zip(*self._buffer), self._types)]
+
+                self._writer.write_batch(self._pa.record_batch(columns, schema=self._schema))
+
+            self.rowsWritten += len(self._buffer)
+            self._buffer = []
+
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        if self.onFlush is not None:
+            self.onFlush()
+
+    def close(self):
+        """Flushes what is left and closes the file"""
+        if self._file.closed:
+            return
+
+        self.flush()
+
+        if self.format == "arrow":
+            self._writer.close()
+
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
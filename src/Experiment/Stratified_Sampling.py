@@ -0,0 +1,370 @@
+"""
+ADAPTIVE STRATIFIED SAMPLING OF THE VERIFICATION RACE
+
+Instead of timing all of range(0,bound)^4 and sampling the rows afterwards, this draws a
+sample of inputs before anything runs and only times those, round after round, until
+the latency of every stratum is known well enough.
+
+THE STRATA ARE
+    - spread: The spread metric of the plots, sqrt(P^2 + Q^2 + E^2 + D^2), cut into
+        spreadBins equally wide bins over 0..2(bound-1)
+    - validity: "trivial" for inputs Prefilter.isTriviallyInvalid rejects, "valid" for
+        valid configurations and "invalid" for the rest, worked out in Python so it is
+        known before the solver runs
+
+so the rare valid inputs and the far out spreads get timed even though a uniform sample
+would almost never draw them. Every stratum's population is counted exactly (from the
+sums of squares of its (P,Q) and (E,D) pairs) and inputs are drawn uniformly inside it
+without repeats, so population / samples weighs a stratum back up to the whole sweep.
+
+EVERY ROUND
+    - Every stratum starts with initialSamples inputs (or its whole population)
+    - The confidence interval of each stratum's mean clock_time is worked out, a stratum
+        has converged once its half-width is within tolerance of its mean or it has run
+        out of inputs
+    - The next roundSize inputs go to the strata that haven't converged, in proportion to
+        how many more samples each still needs, so strata with a high timing variance
+        get the most
+
+which stops once every stratum has converged or maxSamples inputs have been timed. Each
+round is one runVerificationRace over the drawn inputs. With more than one worker every
+round starts new workers, so their first calls include building the solver again.
+
+A sample can't be resumed. The weights only hold for the samples of one run, and which
+inputs a round draws depends on the timings of the rounds before it.
+"""
+
+import bisect
+import itertools
+import math
+import random
+import statistics
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.Prefilter import isTriviallyInvalid
+
+VALIDITY = ("trivial", "invalid", "valid")
+
+SPREAD_BINS = 10
+INITIAL_SAMPLES = 20
+ROUND_SIZE = 200
+# Half-width of the confidence interval, relative to the mean
+TOLERANCE = 0.05
+CONFIDENCE = 0.95
+
+# Draws a stratum may waste on inputs of another class or repeats per input it needs
+_ATTEMPTS = 100
+
+
+def spreadMetric(P,Q,E,D):
+    """Euclidean distance of the input from 0, the spread metric of the plots"""
+    return math.sqrt(P*P + Q*Q + E*E + D*D)
+
+
+def validityClass(P,Q,E,D):
+    """"trivial", "invalid" or "valid", with the solver's own primality rules"""
+    if isTriviallyInvalid(P,Q,E,D):
+        return "trivial"
+
+    totient = (P-1)*(Q-1)
+    if math.gcd(E, totient) == 1 and E*D % totient == 1:
+        return "valid"
+
+    return "invalid"
+
+
+class _PairSums:
+    """Pairs (x, y) grouped by x^2 + y^2, to count and draw pairs by their sum of squares"""
+
+    def __init__(self, pairs):
+        groups = {}
+        for x, y in pairs:
+            groups.setdefault(x*x + y*y, []).append((x, y))
+
+        self.sums = sorted(groups)
+        self.groups = [groups[s] for s in self.sums]
+        self.cumulative = list(itertools.accumulate(len(group) for group in self.groups))
+
+    def _range(self, lo, hi):
+        """Pairs before the first sum >= lo and before the first sum >= hi"""
+        i = bisect.bisect_left(self.sums, lo)
+        j = bisect.bisect_left(self.sums, hi)
+        return (self.cumulative[i-1] if i else 0), (self.cumulative[j-1] if j else 0)
+
+    def count(self, lo, hi):
+        """How many pairs have a sum in [lo, hi)"""
+        before, end = self._range(lo, hi)
+        return end - before
+
+    def draw(self, lo, hi, rng):
+        """A uniformly drawn pair with a sum in [lo, hi)"""
+        before, end = self._range(lo, hi)
+        position = rng.randrange(before, end)
+        group = bisect.bisect_right(self.cumulative, position)
+        return self.groups[group][position - (self.cumulative[group-1] if group else 0)]
+
+
+class _Joint:
+    """Every (P,Q,E,D) with (P,Q) from one _PairSums and (E,D) from another and a spread in a bin"""
+
+    def __init__(self, first, second, lo, hi):
+        self.first = first
+        self.second = second
+        self.lo = lo
+        self.hi = hi
+        self.cumulative = list(itertools.accumulate(len(group) * second.count(lo - s, hi - s)
+                                                    for s, group in zip(first.sums, first.groups)))
+
+    def size(self):
+        return self.cumulative[-1] if self.cumulative else 0
+
+    def draw(self, rng):
+        """A uniformly drawn input"""
+        index = bisect.bisect_right(self.cumulative, rng.randrange(self.size()))
+        s = self.first.sums[index]
+
+        P, Q = rng.choice(self.first.groups[index])
+        E, D = self.second.draw(self.lo - s, self.hi - s, rng)
+
+        return (P,Q,E,D)
+
+
+class Stratum:
+    """One validity class inside one spread bin, and the clock_times sampled from it
+
+    Args:
+        validity (str): One of VALIDITY
+        spreadBin (int): Which spread bin
+        population (int): How many inputs of the sweep are in it
+        draw (callable): Called with rng, returns a uniformly drawn input of the bin that
+            may be of another validity class
+        inputs (list, optional): Every input, instead of drawing them. Defaults to None.
+    """
+
+    def __init__(self, validity, spreadBin, population, draw, inputs=None):
+        self.validity = validity
+        self.spreadBin = spreadBin
+        self.population = population
+        self.label = validity + ":" + str(spreadBin)
+
+        self.times = []
+        self.exhausted = False
+
+        self._draw = draw
+        self._inputs = inputs
+        self._seen = set()
+
+    def remaining(self):
+        return 0 if self.exhausted else self.population - len(self._seen)
+
+    def sample(self, k, rng):
+        """Up to k inputs that haven't been drawn yet, fewer once the stratum runs out"""
+        if k <= 0:
+            return []
+
+        if self._inputs is not None:
+            rng.shuffle(self._inputs)
+            drawn = self._inputs[-k:]
+            del self._inputs[-k:]
+            self._seen.update(drawn)
+
+            self.exhausted = not self._inputs
+            return drawn
+
+        drawn = []
+        for _ in range(_ATTEMPTS * k):
+            if len(drawn) == k or len(self._seen) == self.population:
+                break
+
+            inp = self._draw(rng)
+            if inp in self._seen or validityClass(*inp) != self.validity:
+                continue
+
+            self._seen.add(inp)
+            drawn.append(inp)
+        else:
+            # Too rare to draw, everything that could be found was
+            self.exhausted = True
+
+        if len(self._seen) == self.population:
+            self.exhausted = True
+
+        return drawn
+
+    def mean(self):
+        return statistics.fmean(self.times) if self.times else None
+
+    def halfWidth(self, z):
+        """Half-width of the confidence interval of the mean clock_time"""
+        n = len(self.times)
+        if self.remaining() == 0:
+            return 0.0
+        if n < 2:
+            return math.inf
+
+        # Finite population correction, sampling every input leaves no uncertainty
+        correction = math.sqrt(max(0.0, 1 - n / self.population))
+        return z * statistics.stdev(self.times) / math.sqrt(n) * correction
+
+    def needed(self, z, tolerance):
+        """How many more samples until the confidence interval converges, roughly"""
+        if self.remaining() == 0:
+            return 0
+
+        n = len(self.times)
+        if n < 2:
+            return min(self.remaining(), 2 - n)
+
+        target = tolerance * self.mean()
+        if self.halfWidth(z) <= target:
+            return 0
+
+        # Without the finite population correction, so it never undershoots
+        total = (z * statistics.stdev(self.times) / target) ** 2 if target > 0 else math.inf
+        return min(self.remaining(), max(1, math.ceil(total) - n))
+
+    def summary(self, z):
+        """JSON-ready summary, half_width is None while there are too few samples for one"""
+        halfWidth = self.halfWidth(z)
+
+        return {"validity": self.validity, "spread_bin": self.spreadBin, "population": self.population,
+                "samples": len(self.times), "mean": self.mean(),
+                "half_width": None if math.isinf(halfWidth) else halfWidth, "exhausted": self.exhausted}
+
+
+def stratify(bound, spreadBins=SPREAD_BINS):
+    """Every non-empty stratum of range(0,bound)^4
+
+    Args:
+        bound (int): INTEGER_BOUND of the sweep
+        spreadBins (int, optional): How many bins the spread metric is cut into. Defaults to SPREAD_BINS.
+
+    Returns:
+        list: Strata, by spread bin then validity
+    """
+    values = range(bound)
+    anyPairs = _PairSums(itertools.product(values, values))
+    primePairs = _PairSums((P, Q) for P, Q in itertools.product(values, values) if not isTriviallyInvalid(P, Q, 2, 2))
+    exponentPairs = _PairSums(itertools.product(range(2, bound), range(2, bound)))
+
+    # Sums of squares cut where the spread metric crosses a bin, the last bin takes the largest spread too
+    width = 2 * max(bound - 1, 1) / spreadBins
+    edges = [math.ceil((k * width) ** 2) for k in range(spreadBins)] + [4 * (bound - 1) ** 2 + 1]
+
+    def spreadBin(inp):
+        return bisect.bisect_right(edges, sum(x*x for x in inp)) - 1
+
+    # Valid inputs are rare enough to list, D is every inverse of E mod the totient below bound
+    valid = [[] for _ in range(spreadBins)]
+    for P, Q in itertools.chain.from_iterable(primePairs.groups):
+        totient = (P-1)*(Q-1)
+        for E in range(2, bound):
+            if math.gcd(E, totient) != 1:
+                continue
+
+            for D in range(pow(E, -1, totient), bound, totient):
+                if D > 1:
+                    valid[spreadBin((P,Q,E,D))].append((P,Q,E,D))
+
+    strata = []
+    for k in range(spreadBins):
+        lo, hi = edges[k], edges[k+1]
+        everything = _Joint(anyPairs, anyPairs, lo, hi)
+        candidates = _Joint(primePairs, exponentPairs, lo, hi)
+
+        populations = {"trivial": everything.size() - candidates.size(),
+                       "invalid": candidates.size() - len(valid[k]),
+                       "valid": len(valid[k])}
+
+        for validity in VALIDITY:
+            if populations[validity] == 0:
+                continue
+
+            if validity == "valid":
+                strata.append(Stratum(validity, k, populations[validity], None, inputs=valid[k]))
+            else:
+                joint = everything if validity == "trivial" else candidates
+                strata.append(Stratum(validity, k, populations[validity], joint.draw))
+
+    return strata
+
+
+def _allocate(strata, roundSize, z, tolerance, budget):
+    """How many inputs each stratum that hasn't converged draws next round"""
+    needed = {stratum: stratum.needed(z, tolerance) for stratum in strata}
+    needed = {stratum: n for stratum, n in needed.items() if n > 0}
+
+    total = sum(needed.values())
+    if total == 0 or budget <= 0:
+        return {}
+
+    size = min(roundSize, budget, total)
+    allocation = {stratum: max(1, round(size * n / total)) for stratum, n in needed.items()}
+
+    # Rounding up every stratum to 1 can overshoot the budget, the neediest go first
+    for stratum in sorted(allocation, key=needed.get):
+        if sum(allocation.values()) <= budget:
+            break
+        del allocation[stratum]
+
+    return {stratum: min(k, needed[stratum]) for stratum, k in allocation.items()}
+
+
+def runSampledRace(ty, bound, N, spreadBins=SPREAD_BINS, initialSamples=INITIAL_SAMPLES, roundSize=ROUND_SIZE,
+                   tolerance=TOLERANCE, confidence=CONFIDENCE, maxSamples=None, seed=None, strata=None, **options):
+    """Times isValidRSAConfiguration on an adaptive stratified sample of range(0,bound)^4
+
+    Args:
+        ty (str): "Integer" or "Bitvector"
+        bound (int): INTEGER_BOUND of the sweep
+        N (int): Bitwidth for bitvectors
+        spreadBins (int, optional): Bins of the spread metric. Defaults to SPREAD_BINS.
+        initialSamples (int, optional): Inputs every stratum starts with. Defaults to INITIAL_SAMPLES.
+        roundSize (int, optional): Inputs drawn every round after the first. Defaults to ROUND_SIZE.
+        tolerance (float, optional): Half-width of each stratum's confidence interval relative
+            to its mean that counts as converged. Defaults to TOLERANCE.
+        confidence (float, optional): Confidence level of the intervals. Defaults to CONFIDENCE.
+        maxSamples (int, optional): Most inputs timed in total. Defaults to None, no limit.
+        seed (int, optional): Seed of the draws, the same seed draws the same first round. Defaults to None.
+        strata (dict, optional): Filled in with a summary of every stratum by its label once
+            sampling stops, population / samples is its weight. Defaults to None.
+        options: Every other argument of runVerificationRace but skip and indices, like
+            numOfWorkers or profile
+
+    Yields:
+        tuple: (clock_time, (i,j,k,l), answer, stratum, phases) for every sampled input,
+            stratum is its label like "valid:3", phases lines up with Instrumentation.COLUMNS
+    """
+    rng = random.Random(seed)
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    budget = math.inf if maxSamples is None else maxSamples
+
+    everyStratum = stratify(bound, spreadBins)
+
+    allocation = {}
+    for stratum in everyStratum:
+        k = min(initialSamples, stratum.population, budget - sum(allocation.values()))
+        if k > 0:
+            allocation[stratum] = k
+
+    while allocation:
+        owners = {}
+        for stratum, k in allocation.items():
+            for inp in stratum.sample(k, rng):
+                owners[inp] = stratum
+
+        if not owners:
+            break
+
+        budget -= len(owners)
+        indices = [((P*bound + Q)*bound + E)*bound + D for P,Q,E,D in owners]
+
+        for clockTime, inp, d, phases in runVerificationRace(ty, bound, N, indices=indices, **options):
+            stratum = owners[inp]
+            stratum.times.append(clockTime)
+            yield (clockTime, inp, d, stratum.label, phases)
+
+        allocation = _allocate(everyStratum, roundSize, z, tolerance, budget)
+
+    if strata is not None:
+        strata.update({stratum.label: stratum.summary(z) for stratum in everyStratum})
@@ -0,0 +1,152 @@
+"""
+SYMMETRY AND PRUNING AWARE VERIFICATION RACE
+
+The verification race asks the solver about every (P,Q,E,D) in range(0,bound)^4, but most
+of those answers are known without asking it:
+
+    - pruned: Every input Prefilter.isTriviallyInvalid rejects (P, Q, E or D <= 1, P == Q,
+        or a composite P or Q by the solver's own primality rules, so 2 counts as composite)
+        is invalid, and whole (P, Q) blocks are pruned without looking at E and D
+    - mirror: Every RSA rule is symmetric in P and Q, so (Q,P,E,D) has the answer of (P,Q,E,D)
+
+Only canonical inputs, P < Q with both prime and E, D > 1, go to the solver
+(runVerificationRace with indices), which is about 3% of the sweep at bounds 50 to 100.
+
+The full result set is still emitted, every input exactly once and labelled with its
+source, "solver", "mirror" or "pruned". Rows come out one {P, Q} pair at a time, the
+(P,Q) block and then its (Q,P) block, so only one block is ever held for mirroring. A
+mirror row copies the clock_time and phases of the row it mirrors, and a pruned row has
+a clock_time of 0 and blank phases.
+
+That order is fixed, so a run can be resumed from the row a Checkpoint reached (start),
+and only canonical inputs whose mirror row is past it are run again.
+"""
+
+from src.Experiment.Parallel_Runner import COUNTS, runVerificationRace
+from src.Solver.Instrumentation import COLUMNS
+from src.Solver.Prefilter import isTriviallyInvalid
+
+SOURCES = ("solver", "mirror", "pruned")
+
+
+def isPrunedPair(P, Q):
+    """Whether every (P,Q,E,D) is trivially invalid, whatever E and D are"""
+    return isTriviallyInvalid(P, Q, 2, 2)
+
+
+def blockStart(P, Q, bound):
+    """Position in runSymmetricRace's rows of the first row of the (P,Q) block, P <= Q"""
+    # Every P' < P has one block for (P',P') and two for every other pair
+    blocks = 2*P*bound - P*P
+
+    if Q > P:
+        blocks += 1 + 2*(Q - P - 1)
+
+    return blocks * bound * bound
+
+
+def canonicalIndices(bound, start=0):
+    """Indices (see Parallel_Runner.indexToInput) of every input the solver has to answer
+
+    Args:
+        bound (int): INTEGER_BOUND of the sweep
+        start (int, optional): Rows of runSymmetricRace that are already done. A canonical
+            input is only left out once its mirror row is done too, since the mirror is
+            derived from it. Defaults to 0.
+
+    Yields:
+        int: Indices of canonical inputs, in increasing order
+    """
+    for P in range(bound):
+        for Q in range(P + 1, bound):
+            if isPrunedPair(P, Q):
+                continue
+
+            mirror = blockStart(P, Q, bound) + bound*bound
+            if mirror + bound*bound <= start:
+                continue
+
+            for E in range(2, bound):
+                first = ((P*bound + Q)*bound + E)*bound
+
+                for D in range(2, bound):
+                    if mirror + E*bound + D >= start:
+                        yield first + D
+
+
+def runSymmetricRace(ty, bound, N, start=0, counts=None, **options):
+    """Runs the verification race on canonical inputs and derives every other row
+
+    Args:
+        ty (str): "Integer" or "Bitvector"
+        bound (int): INTEGER_BOUND of the sweep
+        N (int): Bitwidth for bitvectors
+        start (int, optional): Rows to leave out at the start, like the ones a Checkpoint
+            already has. Defaults to 0.
+        counts (dict, optional): Filled in like runVerificationRace's, and with how many
+            rows were "mirror" and "pruned". Defaults to None.
+        options: Every other argument of runVerificationRace but skip and indices, like
+            numOfWorkers or profile
+
+    Yields:
+        tuple: (clock_time, (i,j,k,l), answer, source, phases) for every input, one {P, Q}
+            pair at a time, phases lines up with Instrumentation.COLUMNS
+    """
+    if counts is not None:
+        # The race only fills counts in once it runs, which it never does when start is past every canonical input
+        for name in COUNTS + ("mirror", "pruned"):
+            counts.setdefault(name, 0)
+
+    race = runVerificationRace(ty, bound, N, counts=counts, indices=canonicalIndices(bound, start), **options)
+    blank = [None] * len(COLUMNS)
+    size = bound*bound
+
+    try:
+        for P in range(bound):
+            for Q in range(P, bound):
+                blocks = [(P, Q), (Q, P)] if P != Q else [(P, Q)]
+                first = blockStart(P, Q, bound)
+
+                if first + len(blocks)*size <= start:
+                    continue
+
+                prunedPair = isPrunedPair(P, Q)
+
+                # Solved rows of the (P,Q) block, keyed by (E,D), for its (Q,P) block
+                solved = {}
+
+                for mirrored, (x, y) in enumerate(blocks):
+                    for E in range(bound):
+                        for D in range(bound):
+                            position = first + mirrored*size + E*bound + D
+                            inp = (x, y, E, D)
+
+                            if prunedPair or E <= 1 or D <= 1:
+                                row = (0.0, inp, False, "pruned", blank)
+
+                            elif mirrored:
+                                # Done along with the input it mirrors, so that was never run
+                                if position < start:
+                                    continue
+
+                                clockTime, d, phases = solved[(E, D)]
+                                row = (clockTime, inp, d, "mirror", phases)
+
+                            elif position + size < start:
+                                continue
+
+                            else:
+                                clockTime, _, d, phases = next(race)
+                                solved[(E, D)] = (clockTime, d, phases)
+                                row = (clockTime, inp, d, "solver", phases)
+
+                            if position < start:
+                                continue
+
+                            if counts is not None and row[3] != "solver":
+                                counts[row[3]] += 1
+
+                            yield row
+    finally:
+        # Stops the workers even when the rows aren't all read
+        race.close()
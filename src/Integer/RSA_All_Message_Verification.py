@@ -1,10 +1,86 @@
 import cvc5
 from cvc5 import Kind
 
-from RSA_Valid_Configuration import isValidRSAConfiguration
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration, powerMod
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.Solver_Profiles import configure
 
+# How every message m in 0..P*Q is checked to decrypt back to itself, m^(ED) mod PQ == m
+#   lemma: For distinct primes, that holds for every message exactly when P-1 and Q-1 both
+#       divide ED-1 (Fermat's little theorem and the CRT), so only that is asserted
+#   crt: By the CRT it is enough to check every message mod P and every message mod Q,
+#       P+Q messages instead of P*Q. Each is checked in Python with pow first, then in
+#       chunks of solver calls with square and multiply instead of one POW term, with
+#       the exponent reduced mod prime-1 first
+#   exhaustive: One POW assertion per message up to P*Q, only usable for toy primes
+MODES = ("lemma", "crt", "exhaustive")
+CHUNK_SIZE = 256
 
-def allMessageDecryptEncryptVerification(P,Q,E,D, output=False):
+
+def _lemmaCheck(tm, solver, P,Q,E,D):
+    """Asserts (P-1) | (ED-1) and (Q-1) | (ED-1)"""
+    ZERO = tm.mkInteger(0)
+    ONE = tm.mkInteger(1)
+
+    edminus1 = tm.mkTerm(Kind.SUB, tm.mkTerm(Kind.MULT, tm.mkInteger(E), tm.mkInteger(D)), ONE)
+
+    for prime in (P, Q):
+        primeminus1 = tm.mkTerm(Kind.SUB, tm.mkInteger(prime), ONE)
+        divides = tm.mkTerm(Kind.EQUAL, tm.mkTerm(Kind.INTS_MODULUS, edminus1, primeminus1), ZERO)
+        solver.assertFormula(divides)
+
+    return str(checkKnown(solver.checkSat())) == "sat"
+
+
+def _crtCheck(tm, solver, P,Q,E,D, chunkSize):
+    """Checks every message mod P and mod Q, chunkSize messages per solver call"""
+    for prime in (P, Q):
+        modulus = tm.mkInteger(prime)
+
+        # Fermat: a^ED == a^((ED-1) mod (prime-1) + 1) mod prime for every a, even a == 0
+        ed = (E*D - 1) % (prime - 1) + 1
+
+        for start in range(0, prime, chunkSize):
+            messages = range(start, min(start + chunkSize, prime))
+
+            # A message that doesn't come back in Python is already a counterexample
+            if any(pow(m, ed, prime) != m for m in messages):
+                return False
+
+            solver.push()
+            try:
+                for m in messages:
+                    message = tm.mkInteger(m)
+                    solver.assertFormula(tm.mkTerm(Kind.EQUAL, powerMod(tm, message, ed, modulus), message))
+
+                results = str(checkKnown(solver.checkSat()))
+            finally:
+                solver.pop()
+
+            if results != "sat":
+                return False
+
+    return True
+
+
+def _exhaustiveCheck(tm, solver, P,Q,E,D):
+    """Asserts one POW term per message up to P*Q"""
+    modulus = tm.mkTerm(Kind.MULT, tm.mkInteger(P), tm.mkInteger(Q))
+    ed = tm.mkTerm(Kind.MULT, tm.mkInteger(E), tm.mkInteger(D))
+
+    for i in range(0, P*Q):
+        cipherDecryptPower = tm.mkTerm(Kind.POW, tm.mkInteger(i), ed)
+        moduloPower = tm.mkTerm(Kind.INTS_MODULUS , cipherDecryptPower, modulus)
+        messageCongruence = tm.mkTerm(Kind.EQUAL, tm.mkInteger(i), moduloPower)
+
+        solver.assertFormula(messageCongruence)
+
+    return str(checkKnown(solver.checkSat())) == "sat"
+
+
+def allMessageDecryptEncryptVerification(P,Q,E,D, output=False, mode="crt", chunkSize=CHUNK_SIZE, timer=None, primality="trial", profile=None,
+                                         budget=None):
     """ Verifies every message remains the same after encryption and decryption
 
     Args:
@@ -13,67 +89,66 @@ def allMessageDecryptEncryptVerification(P,Q,E,D, output=False):
         E (int): Encryption Exponent
         D (int): Decryption Exponent
         output (bool, optional): Print whether it sat. Defaults to False.
+        mode (str, optional): How the messages are checked, one of MODES. Defaults to "crt".
+        chunkSize (int, optional): Messages per solver call in "crt" mode. Defaults to CHUNK_SIZE.
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        primality (str, optional): Primality encoding of the validity check. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
 
     Returns:
         bool: Whether all messages remain the same
     """
-    
-    # ------------- SETUP -------------   
-    
-    tm = cvc5.TermManager()
-    solver = cvc5.Solver(tm)
-    
-    solver.setLogic('NIA')
-    solver.setOption("produce-models", "true")
-    solver.setOption("finite-model-find", "true")
-
-    INT = solver.getIntegerSort()
-
-    # ------------- VARIABLE DECLARATIONS -------------   
-    
-    prime1 = tm.mkConst(INT, 'prime1')
-    prime2 = tm.mkConst(INT, 'prime2')
-
-    encrypt = tm.mkConst(INT, 'encrypt')
-    decrypt = tm.mkConst(INT, 'decrypt')
-
-    # ------------- INPUT ASSERTIONS -------------   
-    prime1 = tm.mkInteger(P)
-    prime2 = tm.mkInteger(Q)
-    encrypt = tm.mkInteger(E)
-    decrypt = tm.mkInteger(D)
-    
-    modulus = tm.mkTerm(Kind.MULT, prime1, prime2)
-    ed = tm.mkTerm(Kind.MULT, encrypt, decrypt)
-
-    r = isValidRSAConfiguration(P,Q,E,D)
-    solver.assertFormula(tm.mkBoolean(r))
+    if mode not in MODES:
+        raise ValueError("Unknown mode " + str(mode))
 
-    for i in range(0, P*Q):
-        cipherDecryptPower = tm.mkTerm(Kind.POW, tm.mkInteger(i), ed)
-        moduloPower = tm.mkTerm(Kind.INTS_MODULUS , cipherDecryptPower, modulus)
-        messageCongruence = tm.mkTerm(Kind.EQUAL, tm.mkInteger(i), moduloPower)
+    # Every mode only holds for a valid configuration
+    if not isValidRSAConfiguration(P,Q,E,D, primality=primality, profile=profile, budget=budget):
+        if output:
+            print("RSA Configuration was: unsat")
+        return False
 
-        solver.assertFormula(messageCongruence)
+    timer = timer or NULL_TIMER
+
+    # ------------- SETUP -------------
+
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Integer", "round-trip", profile, P,Q,E,D, budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
+
+    # ------------- MESSAGES -------------
 
-    results = str(solver.checkSat())
+    with timer.phase("solve"):
+        if mode == "lemma":
+            results = _lemmaCheck(tm, solver, P,Q,E,D)
+
+        elif mode == "crt":
+            results = _crtCheck(tm, solver, P,Q,E,D, chunkSize)
+
+        else:
+            results = _exhaustiveCheck(tm, solver, P,Q,E,D)
+
+    timer.recordStatistics(solver)
 
     if output:
-        print("RSA Configuration was:", solver.checkSat())
+        print("RSA Configuration was:", "sat" if results else "unsat")
 
-    if results == "sat":
-        return True
+    return results
 
-    return False
-    
 if __name__ == '__main__':
     # ------------- INPUT -------------
-    P = 11 
+    P = 11
     Q = 13
-    E = 23 
-    D = 47 
+    E = 23
+    D = 47
 
     b = allMessageDecryptEncryptVerification(P,Q,E,D)
 
-    print("Messages are preserved:", b)    
-
+    print("Messages are preserved:", b)
@@ -2,8 +2,77 @@ import math
 import cvc5
 from cvc5 import Kind
 
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.SmtLib_Export import CHECK_SAT, toSmtLib
+from src.Solver.Solver_Profiles import configure
 
-def findDecryptionExponent(P,Q,E,LOWER_BOUND, output=False):
+
+def _decryptionSolver(P,Q,E,LOWER_BOUND, timer, profile, budget=None):
+    """Builds the solver findDecryptionExponent checks, with every rule asserted
+
+    Returns:
+        tuple: (tm, solver, decrypt)
+    """
+    # ------------- SETUP -------------   
+    
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+        
+        configure(solver, "Integer", "decrypt", profile, P, Q, E, LOWER_BOUND, budget=budget)
+        solver.setOption("produce-models", "true")
+
+    with timer.phase("terms"):
+        INT = tm.getIntegerSort()
+        ONE = tm.mkInteger(1)
+
+        # ------------- VARIABLE DECLARATIONS -------------   
+        
+        prime1 = tm.mkConst(INT, 'prime1')
+        prime2 = tm.mkConst(INT, 'prime2')
+
+        # Public and Private exponents
+        encrypt = tm.mkConst(INT, 'encrypt')
+        decrypt = tm.mkConst(INT, 'decrypt')
+
+        # ------------- INPUT ASSERTIONS -------------   
+
+        inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, tm.mkInteger(P))
+        solver.assertFormula(inputPredicate1)
+
+        inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, tm.mkInteger(Q))
+        solver.assertFormula(inputPredicate2)
+        
+        inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, tm.mkInteger(E))
+        solver.assertFormula(inputPredicate3)
+
+        # ------------- CONSTRAINTS -------------    
+
+        # Rule: Decrypt Exponent must be greater than 1
+        d1 = tm.mkTerm(Kind.GT, decrypt, ONE)
+        solver.assertFormula(d1)
+
+        # Rule: Exponent custom lower bound
+        decrypt_lower_bound = tm.mkTerm(Kind.GT, decrypt, tm.mkInteger(LOWER_BOUND))
+        solver.assertFormula(decrypt_lower_bound)
+
+        # Calculate Euler totient function by (p-1)(q-1) 
+        pminus1 = tm.mkTerm(Kind.SUB, prime1, ONE)
+        qminus1 = tm.mkTerm(Kind.SUB, prime2, ONE)
+        totientN = tm.mkTerm(Kind.MULT, pminus1, qminus1)
+
+        # Rule: Exponents must be multiplicative inverses of each other modulo totient n
+        ed = tm.mkTerm(Kind.MULT, encrypt, decrypt)
+        moduloED = tm.mkTerm(Kind.INTS_MODULUS, ed, totientN)
+        moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, ONE)
+
+        solver.assertFormula(moduloCongruence)
+
+    return tm, solver, decrypt
+
+
+def findDecryptionExponent(P,Q,E,LOWER_BOUND, output=False, timer=None, profile=None, budget=None):
     """ Finds a satisfying Decryption Exponent
 
     ASSUMES THE FOLLOWING:
@@ -18,69 +87,148 @@ def findDecryptionExponent(P,Q,E,LOWER_BOUND, output=False):
         E (int): Encryption Exponent
         LOWER_BOUND (int): Lowest value the decryption exponent can be
         output (bool, optional): Print whether it was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        int: Decryption Exponent, None if there is none
+    """
+    timer = timer or NULL_TIMER
+    tm, solver, decrypt = _decryptionSolver(P,Q,E,LOWER_BOUND, timer, profile, budget)
+
+    with timer.phase("solve"):
+        results = checkKnown(solver.checkSat())
+
+    timer.recordStatistics(solver)
+
+    if output:
+       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", results)
+
+    if not results.isSat():
+        return None
+
+    with timer.phase("model"):
+        return solver.getValue(decrypt)
+
+
+def decryptionScript(P,Q,E,LOWER_BOUND, profile=None, budget=None):
+    """SMT-LIB2 script of the query findDecryptionExponent asks cvc5, see SmtLib_Export
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        LOWER_BOUND (int): Lowest value the decryption exponent can be
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
 
     Returns:
-        int: Decryption Exponent 
-    """    
+        str: The script, the value of decrypt after sat is the Decryption Exponent
+    """
+    tm, solver, decrypt = _decryptionSolver(P,Q,E,LOWER_BOUND, NULL_TIMER, profile, budget)
+    return toSmtLib(solver, (CHECK_SAT, "(get-value (decrypt))"))
+
+
+def enumerateDecryptionExponents(P,Q,E, LOWER, UPPER, output=False, timer=None, profile=None,
+                                 budget=None):
+    """ Lazily yields every valid Decryption Exponent in [LOWER, UPPER)
+
+    One solver is kept alive for the whole enumeration, and after every model a blocking
+    clause rules that exponent out before the next checkSat. Exponents come out in
+    whatever order the solver finds them.
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        LOWER (int): Smallest value the decryption exponent can be
+        UPPER (int): Every decryption exponent is less than this
+        output (bool, optional): Print every result of checkSat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase of the whole
+            enumeration took. Defaults to None.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, after every exponent found before it
+
+    Yields:
+        int: The next Decryption Exponent
+    """
+    timer = timer or NULL_TIMER
+
     # ------------- SETUP -------------   
-    
-    tm = cvc5.TermManager()
-    solver = cvc5.Solver(tm)
-    
-    solver.setLogic('QF_NIA')
-    solver.setOption("produce-models", "true")
 
-    INT = solver.getIntegerSort()
-    ONE = solver.mkInteger(1)
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
 
-    # ------------- VARIABLE DECLARATIONS -------------   
-    
-    prime1 = tm.mkConst(INT, 'prime1')
-    prime2 = tm.mkConst(INT, 'prime2')
+        configure(solver, "Integer", "decrypt", profile, P, Q, E, LOWER, UPPER, budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
 
-    # Public and Private exponents
-    encrypt = tm.mkConst(INT, 'encrypt')
-    decrypt = tm.mkConst(INT, 'decrypt')
+    with timer.phase("terms"):
+        INT = tm.getIntegerSort()
+        ONE = tm.mkInteger(1)
 
-    # ------------- INPUT ASSERTIONS -------------   
+        # ------------- VARIABLE DECLARATIONS -------------   
 
-    inputPredicate1 = tm.mkTerm(Kind.EQUAL, prime1, solver.mkInteger(P))
-    solver.assertFormula(inputPredicate1)
+        prime1 = tm.mkConst(INT, 'prime1')
+        prime2 = tm.mkConst(INT, 'prime2')
 
-    inputPredicate2 = tm.mkTerm(Kind.EQUAL, prime2, solver.mkInteger(Q))
-    solver.assertFormula(inputPredicate2)
-    
-    inputPredicate3 = tm.mkTerm(Kind.EQUAL, encrypt, solver.mkInteger(E))
-    solver.assertFormula(inputPredicate3)
+        # Public and Private exponents
+        encrypt = tm.mkConst(INT, 'encrypt')
+        decrypt = tm.mkConst(INT, 'decrypt')
 
-    # ------------- CONSTRAINTS -------------    
+        # ------------- INPUT ASSERTIONS -------------   
 
-    # Rule: Decrypt Exponent must be greater than 1
-    d1 = tm.mkTerm(Kind.GT, decrypt, ONE)
-    solver.assertFormula(d1)
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, prime1, tm.mkInteger(P)))
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, prime2, tm.mkInteger(Q)))
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, encrypt, tm.mkInteger(E)))
 
-    # Rule: Exponent custom lower bound
-    decrypt_lower_bound = tm.mkTerm(Kind.GT, decrypt, solver.mkInteger(LOWER_BOUND))
-    solver.assertFormula(decrypt_lower_bound)
+        # ------------- CONSTRAINTS -------------    
 
-    # Calculate Euler totient function by (p-1)(q-1) 
-    pminus1 = tm.mkTerm(Kind.SUB, prime1, ONE)
-    qminus1 = tm.mkTerm(Kind.SUB, prime2, ONE)
-    totientN = tm.mkTerm(Kind.MULT, pminus1, qminus1)
+        # Rule: Decrypt Exponent must be greater than 1
+        solver.assertFormula(tm.mkTerm(Kind.GT, decrypt, ONE))
 
-    # Rule: Exponents must be multiplicative inverses of each other modulo totient n
-    ed = tm.mkTerm(Kind.MULT, encrypt, decrypt)
-    moduloED = tm.mkTerm(Kind.INTS_MODULUS, ed, totientN)
-    moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, ONE)
+        # Rule: Exponent lies in [LOWER, UPPER)
+        solver.assertFormula(tm.mkTerm(Kind.GEQ, decrypt, tm.mkInteger(LOWER)))
+        solver.assertFormula(tm.mkTerm(Kind.LT, decrypt, tm.mkInteger(UPPER)))
 
-    solver.assertFormula(moduloCongruence)
+        # Calculate Euler totient function by (p-1)(q-1) 
+        pminus1 = tm.mkTerm(Kind.SUB, prime1, ONE)
+        qminus1 = tm.mkTerm(Kind.SUB, prime2, ONE)
+        totientN = tm.mkTerm(Kind.MULT, pminus1, qminus1)
 
-    solver.checkSat()
+        # Rule: Exponents must be multiplicative inverses of each other modulo totient n
+        ed = tm.mkTerm(Kind.MULT, encrypt, decrypt)
+        moduloED = tm.mkTerm(Kind.INTS_MODULUS, ed, totientN)
+        solver.assertFormula(tm.mkTerm(Kind.EQUAL, moduloED, ONE))
 
-    if output:
-       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", solver.checkSat())
+    while True:
+        with timer.phase("solve"):
+            results = checkKnown(solver.checkSat())
+
+        if output:
+            print("Finding Decryption in ["+str(LOWER)+", "+str(UPPER)+") was", results)
+
+        if not results.isSat():
+            break
+
+        with timer.phase("model"):
+            value = solver.getValue(decrypt)
+
+        yield value.getIntegerValue()
+
+        # Rule: Every exponent is only found once
+        with timer.phase("terms"):
+            solver.assertFormula(tm.mkTerm(Kind.DISTINCT, decrypt, value))
 
-    return solver.getValue(decrypt)
+    timer.recordStatistics(solver)
     
 
 if __name__ == '__main__':
@@ -2,74 +2,152 @@ import cvc5
 from cvc5 import Kind
 import math
 
-def isValidRSAConfiguration(P,Q,E,D, output=False):
-    """Verifies input satisfies properties specified in RSA
+from src.Primes.Primality_Certificate import prattCertificate, smallestDivisor, trialPrimes
+from src.Solver.Budget import checkKnown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.SmtLib_Export import toSmtLib
+from src.Solver.Solver_Profiles import configure
+from src.Solver.Term_Cache import DEFAULT_SIZE, TermCache
+
+
+# Trial divides by every number up to sqrt(P), sieve only by the primes up to sqrt(P),
+# pratt checks a Pratt certificate (or a single divisor) found ahead of time in Python.
+# All three give the same answers.
+PRIMALITY_MODES = ("trial", "sieve", "pratt")
+
+
+def powerMod(tm, base, exponent, modulus):
+    """Builds base^exponent mod modulus by square and multiply over the bits of a concrete exponent"""
+    result = tm.mkInteger(1)
+
+    for bit in bin(exponent)[2:]:
+        result = tm.mkTerm(Kind.INTS_MODULUS, tm.mkTerm(Kind.MULT, result, result), modulus)
+
+        if bit == "1":
+            result = tm.mkTerm(Kind.INTS_MODULUS, tm.mkTerm(Kind.MULT, result, base), modulus)
+
+    return result
+
+
+def _prattConstraints(tm, prime, certificate):
+    """Builds the checks of a Pratt certificate
 
     Args:
-        P (int): Prime 1
-        Q (int): Prime 2
-        E (int): Encryption Exponent
-        D (int): Decryption Exponent
-        output (bool, optional): Print whether it was sat. Defaults to False.
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime (cvc5.Term): Integer term being checked
+        certificate (tuple): From prattCertificate
 
     Returns:
-        bool: whether it is a valid or not
+        list: Formulas asserting prime - 1 factors as the certificate says, the witness
+            has order prime - 1, and every factor is itself prime
     """
-    # ------------- SETUP -------------   
-    
-    tm = cvc5.TermManager()
-    solver = cvc5.Solver(tm)
-    
-    solver.setLogic('NIA')
-    solver.setOption("produce-models", "true")
-    solver.setOption("finite-model-find", "true")
-
-    INT = solver.getIntegerSort()
-    ZERO = solver.mkInteger(0)
-    ONE = solver.mkInteger(1)
-
-    # ------------- INPUT ASSERTIONS -------------   
-
-    prime1 = tm.mkInteger(P)
-    prime2 = tm.mkInteger(Q)
-    encrypt = tm.mkInteger(E)
-    decrypt = tm.mkInteger(D)
-    
-    # Calculate Euler totient function by (p-1)(q-1) 
-    pminus1 = tm.mkTerm(Kind.SUB, prime1, ONE)
-    qminus1 = tm.mkTerm(Kind.SUB, prime2, ONE)
-    totientN = tm.mkTerm(Kind.MULT, pminus1, qminus1)
+    n, a, factors = certificate
+    ONE = tm.mkInteger(1)
+    witness = tm.mkInteger(a)
 
-    # ------------- RULES -------------    
+    # Rule: The factors multiply back to prime - 1
+    product = []
+    for factor in factors:
+        q = factor if factor == 2 else factor[0]
+        m = n - 1
+        while m % q == 0:
+            product.append(tm.mkInteger(q))
+            m //= q
 
-    # Rule: Input should be primes
-    for i in range(2, math.ceil(P ** 0.5)+1):
-        x = tm.mkInteger(i)
-        remainder = solver.mkTerm(Kind.INTS_MODULUS, prime1, x)
-        solver.assertFormula(solver.mkTerm(Kind.NOT, solver.mkTerm(Kind.EQUAL, remainder, ZERO)))
+    pminus1 = tm.mkTerm(Kind.SUB, prime, ONE)
+    product = product[0] if len(product) == 1 else tm.mkTerm(Kind.MULT, *product)
+    constraints = [tm.mkTerm(Kind.EQUAL, pminus1, product)]
+
+    # Rule: witness^(prime-1) = 1 but witness^((prime-1)/q) != 1 for every factor q
+    constraints.append(tm.mkTerm(Kind.EQUAL, powerMod(tm, witness, n - 1, prime), ONE))
+
+    for factor in factors:
+        q = factor if factor == 2 else factor[0]
+        power = powerMod(tm, witness, (n - 1) // q, prime)
+        constraints.append(tm.mkTerm(Kind.NOT, tm.mkTerm(Kind.EQUAL, power, ONE)))
+
+        if factor != 2:
+            constraints.extend(_prattConstraints(tm, tm.mkInteger(q), factor))
+
+    return constraints
+
+
+def _primalityConstraints(tm, prime, value, primality="trial"):
+    """Builds the constraints that make a term prime
+
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime (cvc5.Term): Integer term being checked
+        value (int): Concrete value of the prime, bounds the trial divisors
+        primality (str, optional): One of PRIMALITY_MODES. Defaults to "trial".
+
+    Returns:
+        list: Formulas asserting prime has no divisor in 2..sqrt(value)
+    """
+    ZERO = tm.mkInteger(0)
+
+    if primality == "trial":
+        divisors = range(2, math.ceil(value ** 0.5)+1)
+
+    elif primality == "sieve":
+        divisors = trialPrimes(value)
+
+    elif primality == "pratt":
+        if value < 2:
+            return []
+
+        divisor = smallestDivisor(value)
+        if divisor is None:
+            return _prattConstraints(tm, prime, prattCertificate(value))
+
+        divisors = [divisor]
+
+    else:
+        raise ValueError("Unknown primality mode " + str(primality))
 
-    for i in range(2, math.ceil(Q ** 0.5)+1):
+    constraints = []
+    for i in divisors:
         x = tm.mkInteger(i)
-        remainder = solver.mkTerm(Kind.INTS_MODULUS, prime2, x)
-        solver.assertFormula(solver.mkTerm(Kind.NOT, solver.mkTerm(Kind.EQUAL, remainder, ZERO)))
+        remainder = tm.mkTerm(Kind.INTS_MODULUS, prime, x)
+        constraints.append(tm.mkTerm(Kind.NOT, tm.mkTerm(Kind.EQUAL, remainder, ZERO)))
 
-    # Rule: Primes are positive integers greater than 1
-    p1 = tm.mkTerm(Kind.GT, prime1, ONE)
-    solver.assertFormula(p1)
+    return constraints
+
+
+def _structuralConstraints(tm, prime1, prime2, encrypt, decrypt):
+    """Builds every RSA rule that does not depend on the concrete input values
+
+    Args:
+        tm (cvc5.TermManager): Term manager the terms belong to
+        prime1 (cvc5.Term): Prime 1
+        prime2 (cvc5.Term): Prime 2
+        encrypt (cvc5.Term): Encryption Exponent
+        decrypt (cvc5.Term): Decryption Exponent
 
-    p2 = tm.mkTerm(Kind.GT, prime2, ONE)
-    solver.assertFormula(p2)
+    Returns:
+        list: Formulas to assert
+    """
+    INT = tm.getIntegerSort()
+    ZERO = tm.mkInteger(0)
+    ONE = tm.mkInteger(1)
+
+    constraints = []
+
+    # Calculate Euler totient function by (p-1)(q-1)
+    pminus1 = tm.mkTerm(Kind.SUB, prime1, ONE)
+    qminus1 = tm.mkTerm(Kind.SUB, prime2, ONE)
+    totientN = tm.mkTerm(Kind.MULT, pminus1, qminus1)
+
+    # Rule: Primes are positive integers greater than 1
+    constraints.append(tm.mkTerm(Kind.GT, prime1, ONE))
+    constraints.append(tm.mkTerm(Kind.GT, prime2, ONE))
 
     # Rule: Primes should not be equal to each other
-    p3 = tm.mkTerm(Kind.DISTINCT, prime1, prime2)
-    solver.assertFormula(p3)
+    constraints.append(tm.mkTerm(Kind.DISTINCT, prime1, prime2))
 
     # Rule: Exponents must be greater than 1
-    e1 = tm.mkTerm(Kind.GT, encrypt, ONE)
-    solver.assertFormula(e1)
-
-    d1 = tm.mkTerm(Kind.GT, decrypt, ONE)
-    solver.assertFormula(d1)
+    constraints.append(tm.mkTerm(Kind.GT, encrypt, ONE))
+    constraints.append(tm.mkTerm(Kind.GT, decrypt, ONE))
 
     # Rule: Encryption Exponent must be relatively prime to totient n
     cd = tm.mkConst(INT, 'commonDenominator')
@@ -79,13 +157,13 @@ def isValidRSAConfiguration(P,Q,E,D, output=False):
     gcd = tm.mkConst(INT, 'greatestCommonDenominator')
     gcdDividesEncryption = tm.mkTerm(Kind.INTS_MODULUS, encrypt, gcd)
     gcdDividesTotient = tm.mkTerm(Kind.INTS_MODULUS, totientN, gcd)
-    
+
     sameDivisor = tm.mkTerm(Kind.EQUAL, divideTotient, divideEncryption, ZERO)
     properDivisor = tm.mkTerm(Kind.GT, cd, ZERO)
 
     commonDivisorCondition = tm.mkTerm(Kind.AND, properDivisor, sameDivisor)
 
-    solver.assertFormula(commonDivisorCondition)
+    constraints.append(commonDivisorCondition)
 
     sameDivisor = tm.mkTerm(Kind.EQUAL, gcdDividesTotient, gcdDividesEncryption, ZERO)
     properDivisor = tm.mkTerm(Kind.GT, gcd, ZERO)
@@ -95,36 +173,299 @@ def isValidRSAConfiguration(P,Q,E,D, output=False):
 
     greatestCommonDivisorCondition = tm.mkTerm(Kind.AND, properDivisor,sameDivisor,greatestDivisor, isRelativelyPrime)
 
-    solver.assertFormula(greatestCommonDivisorCondition)
+    constraints.append(greatestCommonDivisorCondition)
 
     # Rule: Exponents must be multiplicative inverses of each other modulo totient n
     ed = tm.mkTerm(Kind.MULT, encrypt, decrypt)
     moduloED = tm.mkTerm(Kind.INTS_MODULUS, ed, totientN)
     moduloCongruence = tm.mkTerm(Kind.EQUAL, moduloED, ONE)
 
-    solver.assertFormula(moduloCongruence)
+    constraints.append(moduloCongruence)
+
+    return constraints
+
+
+def _verificationSolver(P,Q,E,D, timer, primality, profile, budget=None):
+    """Builds the solver isValidRSAConfiguration checks, with every rule asserted"""
+    # ------------- SETUP -------------
 
-    results = str(solver.checkSat())
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Integer", "verify", profile, P,Q,E,D, budget=budget)
+        solver.setOption("produce-models", "true")
+
+    with timer.phase("terms"):
+        # ------------- INPUT ASSERTIONS -------------
+
+        prime1 = tm.mkInteger(P)
+        prime2 = tm.mkInteger(Q)
+        encrypt = tm.mkInteger(E)
+        decrypt = tm.mkInteger(D)
+
+        # ------------- RULES -------------
+
+        # Rule: Input should be primes
+        for constraint in _primalityConstraints(tm, prime1, P, primality):
+            solver.assertFormula(constraint)
+
+        for constraint in _primalityConstraints(tm, prime2, Q, primality):
+            solver.assertFormula(constraint)
+
+        for constraint in _structuralConstraints(tm, prime1, prime2, encrypt, decrypt):
+            solver.assertFormula(constraint)
+
+    return solver
+
+
+def isValidRSAConfiguration(P,Q,E,D, output=False, timer=None, primality="trial", profile=None,
+                            budget=None):
+    """Verifies input satisfies properties specified in RSA
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        output (bool, optional): Print whether it was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        bool: whether it is a valid or not
+    """
+    timer = timer or NULL_TIMER
+    solver = _verificationSolver(P,Q,E,D, timer, primality, profile, budget)
+
+    with timer.phase("solve"):
+        results = str(checkKnown(solver.checkSat()))
+
+    timer.recordStatistics(solver)
 
     if output:
-        print("RSA Configuration was:", solver.checkSat())
+        print("RSA Configuration was:", results)
 
     if results == "sat":
         return True
 
     return False
-    
+
+
+def verificationScript(P,Q,E,D, primality="trial", profile=None, budget=None):
+    """SMT-LIB2 script of the query isValidRSAConfiguration asks cvc5, see SmtLib_Export
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Returns:
+        str: The script, sat means the input is valid
+    """
+    return toSmtLib(_verificationSolver(P,Q,E,D, NULL_TIMER, primality, profile, budget))
+
+
+def isValidRSAConfigurationBatch(inputs, output=False, timer=None, primality="trial", profile=None,
+                                 budget=None):
+    """Verifies a batch of inputs in one solver
+
+    Every input's rules are asserted behind its own guard literal, and checkSatAssuming
+    on each guard in turn answers one input at a time, so the solver is only built and
+    set up once for the whole batch.
+
+    Args:
+        inputs (list): (P, Q, E, D) tuples
+        output (bool, optional): Print whether each was sat. Defaults to False.
+        timer (PhaseTimer, optional): Records how long each phase of the whole batch took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto". Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Raises:
+        SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+    Returns:
+        list: whether each input is valid or not, in order
+    """
+    timer = timer or NULL_TIMER
+
+    # ------------- SETUP -------------
+
+    with timer.phase("setup"):
+        tm = cvc5.TermManager()
+        solver = cvc5.Solver(tm)
+
+        configure(solver, "Integer", "verify", profile, *[value for inp in inputs for value in inp],
+                  budget=budget)
+        solver.setOption("produce-models", "true")
+        solver.setOption("incremental", "true")
+
+    with timer.phase("terms"):
+        guards = []
+
+        for k, (P,Q,E,D) in enumerate(inputs):
+            # ------------- INPUT ASSERTIONS -------------
+
+            prime1 = tm.mkInteger(P)
+            prime2 = tm.mkInteger(Q)
+            encrypt = tm.mkInteger(E)
+            decrypt = tm.mkInteger(D)
+
+            # ------------- RULES -------------
+
+            constraints = _primalityConstraints(tm, prime1, P, primality)
+            constraints += _primalityConstraints(tm, prime2, Q, primality)
+            constraints += _structuralConstraints(tm, prime1, prime2, encrypt, decrypt)
+
+            guard = tm.mkConst(tm.getBooleanSort(), 'input' + str(k))
+            solver.assertFormula(tm.mkTerm(Kind.IMPLIES, guard, tm.mkTerm(Kind.AND, *constraints)))
+            guards.append(guard)
+
+    with timer.phase("solve"):
+        results = [str(checkKnown(solver.checkSatAssuming(guard))) for guard in guards]
+
+    timer.recordStatistics(solver)
+
+    if output:
+        print("RSA Configurations were:", results)
+
+    return [result == "sat" for result in results]
+
+
+class IncrementalVerifier:
+    """Reusable verifier that keeps one solver alive across many inputs
+
+    The RSA rules are asserted once over symbolic P, Q, E, D and every call to
+    isValidRSAConfiguration binds the concrete inputs inside a push/pop scope,
+    so the TermManager and Solver are only ever built once. The input assertions
+    and primality constraints of every value seen are kept in a TermCache, so
+    repeated values don't rebuild any terms.
+
+    Args:
+        timer (PhaseTimer, optional): Records how long building the solver took. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        cacheSize (int, optional): Most constants and subterms kept in the TermCache. Defaults to DEFAULT_SIZE.
+        profile (str, optional): Solver profile from Solver_Profiles, or "auto" for the fastest over every size. Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+    """
+
+    def __init__(self, timer=None, primality="trial", cacheSize=DEFAULT_SIZE, profile=None, budget=None):
+        if primality not in PRIMALITY_MODES:
+            raise ValueError("Unknown primality mode " + str(primality))
+
+        timer = timer or NULL_TIMER
+        self.primality = primality
+        self._statistics = None
+
+        # ------------- SETUP -------------
+
+        with timer.phase("setup"):
+            self.tm = cvc5.TermManager()
+            self.solver = cvc5.Solver(self.tm)
+            self.terms = TermCache(self.tm, "Integer", cacheSize)
+
+            configure(self.solver, "Integer", "verify", profile, budget=budget)
+            self.solver.setOption("produce-models", "true")
+            self.solver.setOption("incremental", "true")
+
+        with timer.phase("terms"):
+            INT = self.tm.getIntegerSort()
+
+            # ------------- VARIABLE DECLARATIONS -------------
+
+            self.prime1 = self.tm.mkConst(INT, 'prime1')
+            self.prime2 = self.tm.mkConst(INT, 'prime2')
+
+            self.encrypt = self.tm.mkConst(INT, 'encrypt')
+            self.decrypt = self.tm.mkConst(INT, 'decrypt')
+
+            # ------------- RULES -------------
+
+            for constraint in _structuralConstraints(self.terms, self.prime1, self.prime2, self.encrypt, self.decrypt):
+                self.solver.assertFormula(constraint)
+
+    def _bind(self, term, value):
+        """Cached assertion that term equals value"""
+        terms = self.terms
+        return terms.get(None, value, lambda: terms.mkTerm(Kind.EQUAL, term, terms.mkInteger(value)), name=(term.getId(), "="))
+
+    def _primality(self, prime, value):
+        """Cached primality constraints of prime being value"""
+        terms = self.terms
+        return terms.get(None, value, lambda: _primalityConstraints(terms, prime, value, self.primality), name=(prime.getId(), "prime"))
+
+    def isValidRSAConfiguration(self, P,Q,E,D, output=False, timer=None):
+        """Verifies input satisfies properties specified in RSA
+
+        Args:
+            P (int): Prime 1
+            Q (int): Prime 2
+            E (int): Encryption Exponent
+            D (int): Decryption Exponent
+            output (bool, optional): Print whether it was sat. Defaults to False.
+            timer (PhaseTimer, optional): Records how long each phase took, statistics
+                only cover this call. Defaults to None.
+
+        Raises:
+            SolverUnknown: cvc5 answered unknown, like when the budget ran out
+
+        Returns:
+            bool: whether it is a valid or not
+        """
+        timer = timer or NULL_TIMER
+        solver = self.solver
+
+        solver.push()
+        try:
+            with timer.phase("terms"):
+                # ------------- INPUT ASSERTIONS -------------
+
+                solver.assertFormula(self._bind(self.prime1, P))
+                solver.assertFormula(self._bind(self.prime2, Q))
+                solver.assertFormula(self._bind(self.encrypt, E))
+                solver.assertFormula(self._bind(self.decrypt, D))
+
+                # Rule: Input should be primes
+                for constraint in self._primality(self.prime1, P):
+                    solver.assertFormula(constraint)
+
+                for constraint in self._primality(self.prime2, Q):
+                    solver.assertFormula(constraint)
+
+            with timer.phase("solve"):
+                results = str(checkKnown(solver.checkSat()))
+
+            self._statistics = timer.recordStatistics(solver, since=self._statistics)
+        finally:
+            solver.pop()
+
+        if output:
+            print("RSA Configuration was:", results)
+
+        return results == "sat"
+
+
 if __name__ == '__main__':
     # ------------- INPUT -------------
-    P = 11 
+    P = 11
     Q = 13
-    E = 23 
+    E = 23
     D = 47
 
     b = isValidRSAConfiguration(P,Q,E,D)
 
     if b:
-        print("This is a valid configuration")    
+        print("This is a valid configuration")
     else:
-        print("This is not a valid configuration")    
+        print("This is not a valid configuration")
 
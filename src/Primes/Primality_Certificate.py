@@ -0,0 +1,175 @@
+"""
+PRIMALITY CERTIFICATES
+
+Finds the witnesses the compact primality encodings hand to the solver, so the solver only
+has to check a handful of constraints instead of one trial division per number up to sqrt(P).
+
+THE WITNESSES ARE
+    - The trial primes: every prime in 2..ceil(sqrt(n)), the only trial divisors that matter
+
+    - A divisor: for a number with a divisor d in 2..ceil(sqrt(n)), the same range trial
+        division checks, asserting n mod d != 0 is enough to make primality unsat
+
+    - A Pratt certificate: for a prime n, a generator a of the multiplicative group mod n
+        together with the prime factors q of n-1, where a^(n-1) = 1 mod n and
+        a^((n-1)/q) != 1 mod n for every q proves n is prime. Every q gets its own
+        certificate, down to 2
+"""
+
+import bisect
+import math
+import random
+
+from src.Primes.Prime_Window import _simpleSieve
+
+# Deterministic Miller-Rabin bases for every n < 3.3 * 10^24
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Primes sieved so far for trialPrimes, grown by doubling
+_sievedPrimes = []
+_sievedLimit = 1
+
+
+def trialPrimes(n):
+    """Every prime in 2..ceil(sqrt(n)), the same range trial division checks
+
+    Args:
+        n (int): Number to be checked
+
+    Returns:
+        list: The primes, in order
+    """
+    global _sievedPrimes, _sievedLimit
+
+    limit = math.ceil(n ** 0.5)
+    if limit > _sievedLimit:
+        _sievedLimit = max(limit, 2 * _sievedLimit)
+        _sievedPrimes = _simpleSieve(_sievedLimit)
+
+    return _sievedPrimes[:bisect.bisect_right(_sievedPrimes, limit)]
+
+
+def isProbablePrime(n):
+    """Miller-Rabin primality test, deterministic for n < 3.3 * 10^24
+
+    Args:
+        n (int): Number to test
+
+    Returns:
+        bool: Whether n is prime
+    """
+    if n < 2:
+        return False
+
+    for p in _MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for a in _MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+
+    return True
+
+
+def _pollardRho(n):
+    """Finds some nontrivial factor of an odd composite n"""
+    while True:
+        c = random.randrange(1, n)
+        f = lambda x: (x * x + c) % n
+        x = y = random.randrange(2, n)
+        d = 1
+
+        while d == 1:
+            x = f(x)
+            y = f(f(y))
+            d = math.gcd(abs(x - y), n)
+
+        if d != n:
+            return d
+
+
+def primeFactors(n):
+    """Distinct prime factors of n > 1
+
+    Args:
+        n (int): Number to factor
+
+    Returns:
+        list: Sorted distinct prime factors
+    """
+    factors = set()
+    stack = [n]
+
+    while stack:
+        m = stack.pop()
+        if m == 1:
+            continue
+
+        if isProbablePrime(m):
+            factors.add(m)
+            continue
+
+        for p in _MILLER_RABIN_BASES:
+            if m % p == 0:
+                factors.add(p)
+                while m % p == 0:
+                    m //= p
+                stack.append(m)
+                break
+        else:
+            d = _pollardRho(m)
+            stack.extend((d, m // d))
+
+    return sorted(factors)
+
+
+def smallestDivisor(n):
+    """Smallest divisor of n in 2..ceil(sqrt(n)), the range trial division checks
+
+    Args:
+        n (int): Number to check
+
+    Returns:
+        int: The divisor, or None if trial division would find none
+    """
+    if n < 2:
+        return None
+
+    divisor = primeFactors(n)[0]
+    if divisor <= math.ceil(n ** 0.5):
+        return divisor
+
+    return None
+
+
+def prattCertificate(n):
+    """Pratt certificate of a prime
+
+    Args:
+        n (int): Prime greater than 2
+
+    Returns:
+        tuple: (n, a, [certificate or 2 for each prime factor of n-1]) where a generates
+            the multiplicative group mod n
+    """
+    factors = primeFactors(n - 1)
+
+    a = 2
+    while not (pow(a, n - 1, n) == 1 and all(pow(a, (n - 1) // q, n) != 1 for q in factors)):
+        a += 1
+
+    return (n, a, [q if q == 2 else prattCertificate(q) for q in factors])
@@ -0,0 +1,78 @@
+"""
+PERSISTENT PRIME CACHE
+
+Keeps the table of the first primes in a compact .npy file (uint32 while every prime
+fits, uint64 after that) and memory-maps it on later runs, so experiments start in
+milliseconds and worker processes share the same pages.
+
+When a run asks for more primes than the file holds, the table is extended with the
+segmented sieve from Prime_Window and atomically swapped in, so processes still
+reading the old file keep a valid mapping.
+"""
+
+import itertools
+import os
+
+import numpy as np
+
+from src.Primes.Prime_Window import primeStream
+
+DEFAULT_CACHE = "./data/primes/primes.npy"
+
+
+def _openCache(path):
+    """Memory-maps the cache, or returns None if it has not been written yet"""
+    try:
+        return np.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+
+def _growCache(path, cached, n):
+    """Extends the cached table to hold at least n primes and writes it back"""
+    have = 0 if cached is None else len(cached)
+
+    if cached is not None and n <= have:
+        return cached
+
+    # At least double so asking for a few more primes at a time stays cheap
+    target = max(n, 2 * have)
+
+    start = 2 if have == 0 else int(cached[-1]) + 1
+    extra = list(itertools.islice(primeStream(start), target - have))
+
+    # Only an empty table, loadPrimes(0) before anything was cached, adds no primes
+    dtype = np.uint64 if extra and extra[-1] >= 2**32 else np.uint32
+    primes = np.empty(target, dtype=dtype)
+    if have:
+        primes[:have] = cached
+    primes[have:] = extra
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp = path + "." + str(os.getpid()) + ".tmp"
+    with open(tmp, "wb") as file:
+        np.save(file, primes)
+    os.replace(tmp, path)
+
+    return _openCache(path)
+
+
+def loadPrimes(n, path=DEFAULT_CACHE):
+    """Returns the first n primes as a read-only memory-mapped array
+
+    Args:
+        n (int): Number of primes
+        path (str, optional): Cache file. Defaults to DEFAULT_CACHE.
+
+    Returns:
+        numpy.ndarray: The first n primes
+    """
+    cached = _openCache(path)
+
+    if cached is None or len(cached) < n:
+        cached = _growCache(path, cached, n)
+
+    return cached[:n]
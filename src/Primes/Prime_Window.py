@@ -0,0 +1,152 @@
+"""
+PRIME LIST AND WINDOWS
+
+A segmented sieve that streams primes lazily, and the windows used to pick (P, Q, E)
+triples out of the list of primes for the decryption experiments.
+
+THE WINDOWS ARE
+    - CONSECUTIVE WINDOW: P, Q, E are three consecutive primes
+
+    - FORWARD SPLIT WINDOW: P is the ith prime, E is the prime right after it (or a fixed
+        exponent like 65537), and Q is the prime halfway between P and the end of the list
+
+Both windows skip any triple where E is not relatively prime to (P-1)*(Q-1), since those
+don't have a decryption exponent.
+"""
+
+import itertools
+import math
+
+SEGMENT_SIZE = 2**16
+
+
+def _simpleSieve(limit):
+    """Sieve of Eratosthenes for every prime up to and including limit"""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[:2] = bytes(min(2, limit + 1))
+
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, limit + 1, i)))
+
+    return list(itertools.compress(range(limit + 1), sieve))
+
+
+def primeStream(start=2, segmentSize=SEGMENT_SIZE):
+    """Lazily yields every prime greater than or equal to start, in order
+
+    Args:
+        start (int, optional): Smallest number to consider. Defaults to 2.
+        segmentSize (int, optional): How many numbers are sieved at a time. Defaults to SEGMENT_SIZE.
+
+    Yields:
+        int: The next prime
+    """
+    low = max(start, 2)
+    basePrimes = []
+    baseLimit = 1
+
+    while True:
+        high = low + segmentSize
+
+        # Only primes up to sqrt(high) are needed to sieve this segment
+        root = math.isqrt(high - 1)
+        if root > baseLimit:
+            baseLimit = max(root, 2 * baseLimit)
+            basePrimes = _simpleSieve(baseLimit)
+
+        segment = bytearray([1]) * segmentSize
+        for p in basePrimes:
+            if p * p >= high:
+                break
+
+            first = max(p * p, -(-low // p) * p)
+            segment[first - low::p] = bytes(len(range(first - low, segmentSize, p)))
+
+        yield from itertools.compress(range(low, high), segment)
+
+        low = high
+
+
+def firstPrimes(n):
+    """Returns the first n primes, what [sympy.prime(i) for i in range(1, n+1)] gives
+
+    Args:
+        n (int): Number of primes
+
+    Returns:
+        list: The first n primes
+    """
+    return list(itertools.islice(primeStream(), n))
+
+
+def _hasDecryptionExponent(P, Q, E):
+    return math.gcd(E, (P-1)*(Q-1)) == 1
+
+
+def consecutiveWindow(primes=None):
+    """Yields (P, Q, E) from every run of three consecutive primes
+
+    Args:
+        primes (iterable, optional): Primes to slide over. Defaults to a lazy primeStream().
+
+    Yields:
+        tuple: (P, Q, E) where E is relatively prime to (P-1)*(Q-1)
+    """
+    if primes is None:
+        primes = primeStream()
+
+    # Cached prime tables hold fixed width numpy ints, the totient needs python ints
+    primes = map(int, primes)
+    P = next(primes, None)
+    Q = next(primes, None)
+
+    for E in primes:
+        if _hasDecryptionExponent(P, Q, E):
+            yield (P, Q, E)
+
+        P, Q = Q, E
+
+
+def forwardSplitWindow(numOfPrimes, E=None, primes=None):
+    """Yields (P, Q, E) pairing each prime with the one halfway to the end of the list
+
+    For the ith of numOfPrimes primes, P is the ith prime and Q is the
+    (i + (numOfPrimes-i)//2 + 1)th, so P and Q are as far apart as the list allows.
+
+    Args:
+        numOfPrimes (int): Length of the prime list the window slides over
+        E (int, optional): Fixed Encryption Exponent, like 65537. Defaults to the prime after P.
+        primes (sequence, optional): Prime list to index into. Defaults to streaming the primes lazily.
+
+    Yields:
+        tuple: (P, Q, E) where E is relatively prime to (P-1)*(Q-1)
+    """
+    # The prime after P is taken as E, so the last two primes can't start a window
+    numOfWindows = numOfPrimes - 2
+
+    if primes is not None:
+        forward = map(int, primes[:numOfPrimes])
+        split = lambda i: int(primes[(i + (numOfPrimes-i)//2 + 1) % numOfPrimes])
+    else:
+        forward = primeStream()
+        splitStream = primeStream()
+        splitPrime = [-1, None]
+
+        def split(i):
+            # Split indices never decrease, so a second stream only ever moves forward
+            index = (i + (numOfPrimes-i)//2 + 1) % numOfPrimes
+            while splitPrime[0] < index:
+                splitPrime[0] += 1
+                splitPrime[1] = next(splitStream)
+            return splitPrime[1]
+
+    P = next(forward, None)
+    for i, nextPrime in zip(range(numOfWindows), forward):
+        Q = split(i)
+        exponent = nextPrime if E is None else E
+
+        if _hasDecryptionExponent(P, Q, exponent):
+            yield (P, Q, exponent)
+
+        P = nextPrime
@@ -1,52 +1,170 @@
-import cvc5
-from cvc5 import Kind
-import math
-
-def findDecryptionExponent(P,Q,E,LOWER_BOUND=0, print=False):
-
-    assert(P*Q), "unsat"
-    
-    # Rule: Primes are positive integers greater than 1
-    assert(P>1), "unsat"
-    assert(Q>1), "unsat"
-
-    # Rule: Primes should not be equal to each other
-    assert(not (P == Q)), "unsat"
-    
-    # Rule: Expononts must be greater than 1
-    assert(E>1), "unsat"
-
-    totientN = (P-1) * (Q-1)
-    
-    # Rule: Encryption Exponont must be relatively prime to totient n
-    assert(math.gcd(E, totientN) == 1),  "unsat "+str(P)+" "+str(Q)+" "+str(E)
-
-    d = 1
-    if(LOWER_BOUND):  
-        d = LOWER_BOUND 
-
-    while(d > 0):
-        if math.gcd(d*E, totientN) > 1:
-            d += 1
-            continue
-
-        break
-    
-    if print:
-       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", "sat")
-    return d
-    
-
-if __name__ == '__main__':
-    
-    # ------------- INPUT -------------
-    P = 11 
-    Q = 13
-    E = 23 
-    D_lower_bound  = 2000012223200 # D will be greater than this
-
-    D = findDecryptionExponent(P,Q,E,D_lower_bound)
-
-    print("A valid decryption number is: ", D)
-    
-
+import math
+import numpy as np
+
+# Inputs below these limits keep every intermediate of the array path inside int64
+INT64_PRIME_LIMIT = 2**30
+INT64_LOWER_BOUND_LIMIT = 2**62
+
+
+def findDecryptionExponent(P,Q,E,LOWER_BOUND=0, output=False):
+    """ Finds the smallest Decryption Exponent greater than LOWER_BOUND
+
+    The modular inverse of E modulo the totient is computed directly and then lifted
+    by multiples of the totient past LOWER_BOUND, so this runs in O(log totient) no
+    matter how large LOWER_BOUND is.
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        LOWER_BOUND (int, optional): Decryption exponent will be greater than this. Defaults to 0.
+        output (bool, optional): Print whether it was sat. Defaults to False.
+
+    Returns:
+        int: Decryption Exponent
+    """
+    # numpy integers (like the prime cache's uint32) would overflow and can't pow(E, -1, totientN)
+    P, Q, E, LOWER_BOUND = int(P), int(Q), int(E), int(LOWER_BOUND)
+
+    assert(P*Q), "unsat"
+
+    # Rule: Primes are positive integers greater than 1
+    assert(P>1), "unsat"
+    assert(Q>1), "unsat"
+
+    # Rule: Primes should not be equal to each other
+    assert(not (P == Q)), "unsat"
+
+    # Rule: Expononts must be greater than 1
+    assert(E>1), "unsat"
+
+    totientN = (P-1) * (Q-1)
+
+    # Rule: Encryption Exponont must be relatively prime to totient n
+    assert(math.gcd(E, totientN) == 1),  "unsat "+str(P)+" "+str(Q)+" "+str(E)
+
+    # Rule: Exponents must be multiplicative inverses of each other modulo totient n
+    d = pow(E, -1, totientN)
+
+    # Rule: Decryption Exponent must be greater than 1 and the custom lower bound
+    lower = max(LOWER_BOUND, 1)
+    if d <= lower:
+        d += ((lower - d) // totientN + 1) * totientN
+
+    if output:
+       print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", "sat")
+    return d
+
+
+def findDecryptionExponents(Ps, Qs, Es, LOWER_BOUND=0):
+    """ Finds the smallest Decryption Exponent greater than LOWER_BOUND for many inputs
+
+    Args:
+        Ps (list): Prime 1 of each input
+        Qs (list): Prime 2 of each input
+        Es (list): Encryption Exponent of each input
+        LOWER_BOUND (int or list, optional): One lower bound for all inputs or one per input. Defaults to 0.
+
+    Returns:
+        list: Decryption Exponent of each input
+    """
+    # numpy integer scalars aren't ints, but are one bound for all inputs too
+    if np.ndim(LOWER_BOUND) == 0:
+        LOWER_BOUND = [LOWER_BOUND] * len(Ps)
+
+    return [findDecryptionExponent(P,Q,E,lb) for P,Q,E,lb in zip(Ps, Qs, Es, LOWER_BOUND)]
+
+
+def _isInt64Safe(*arrays):
+    """Checks whether the array path can run in int64 without overflowing"""
+    P, Q, E, LOWER_BOUND = arrays
+
+    if any(a.dtype.kind not in "iu" for a in arrays):
+        return False
+
+    if P.size == 0:
+        return True
+
+    return (int(P.max()) < INT64_PRIME_LIMIT and int(Q.max()) < INT64_PRIME_LIMIT
+            and int(LOWER_BOUND.max()) < INT64_LOWER_BOUND_LIMIT)
+
+
+def _assertEach(condition, message):
+    """Raises like the scalar asserts, naming the first input that fails"""
+    if not np.all(condition):
+        raise AssertionError(message + " at index " + str(int(np.argmin(condition))))
+
+
+def findDecryptionExponentArray(Ps, Qs, Es, LOWER_BOUND=0):
+    """ Finds the smallest Decryption Exponent greater than LOWER_BOUND for arrays of inputs
+
+    Runs the extended Euclidean algorithm on every input at once, one array pass per
+    division step, so the whole window is solved in O(log totient) passes instead of one
+    interpreter call per input. Inputs that fit use int64 arrays and anything bigger
+    falls back to object arrays of python ints.
+
+    Args:
+        Ps (array_like): Prime 1 of each input
+        Qs (array_like): Prime 2 of each input
+        Es (array_like): Encryption Exponent of each input
+        LOWER_BOUND (int or array_like, optional): One lower bound for all inputs or one per input. Defaults to 0.
+
+    Returns:
+        numpy.ndarray: Decryption Exponent of each input, int64 or object dtype
+    """
+    P = np.asarray(Ps)
+    Q = np.asarray(Qs)
+    E = np.asarray(Es)
+    lower = np.broadcast_to(np.asarray(LOWER_BOUND), P.shape)
+
+    dtype = np.int64 if _isInt64Safe(P, Q, E, lower) else object
+    P, Q, E, lower = (a.astype(dtype) for a in (P, Q, E, lower))
+
+    # Rule: Primes are positive integers greater than 1
+    _assertEach(P > 1, "unsat")
+    _assertEach(Q > 1, "unsat")
+
+    # Rule: Primes should not be equal to each other
+    _assertEach(P != Q, "unsat")
+
+    # Rule: Expononts must be greater than 1
+    _assertEach(E > 1, "unsat")
+
+    totientN = (P-1) * (Q-1)
+
+    # Extended Euclid on (E mod totient, totient), rows that finish early stop updating
+    old_r, r = E % totientN, totientN.copy()
+    old_s, s = np.ones_like(totientN), np.zeros_like(totientN)
+
+    active = r != 0
+    while np.any(active):
+        q = np.where(active, old_r // np.where(active, r, 1), 0)
+        old_r, r = np.where(active, r, old_r), np.where(active, old_r - q*r, r)
+        old_s, s = np.where(active, s, old_s), np.where(active, old_s - q*s, s)
+        active = r != 0
+
+    # Rule: Encryption Exponont must be relatively prime to totient n
+    _assertEach(old_r == 1, "unsat")
+
+    # Rule: Exponents must be multiplicative inverses of each other modulo totient n
+    d = old_s % totientN
+
+    # Rule: Decryption Exponent must be greater than 1 and the custom lower bound
+    lower = np.maximum(lower, 1)
+    d = d + np.where(d <= lower, (lower - d) // totientN + 1, 0) * totientN
+
+    return d
+
+
+if __name__ == '__main__':
+
+    # ------------- INPUT -------------
+    P = 11
+    Q = 13
+    E = 23
+    D_lower_bound  = 2000012223200 # D will be greater than this
+
+    D = findDecryptionExponent(P,Q,E,D_lower_bound)
+
+    print("A valid decryption number is: ", D)
+
@@ -0,0 +1,438 @@
+"""
+RSA SOLVER SERVICE
+
+Serves isValidRSAConfiguration, findDecryptionExponent and enumerateDecryptionExponents
+over HTTP on localhost, so tools and experiments can share one set of warm solvers
+instead of each importing the functions and building their own.
+
+THE ENDPOINTS ARE
+    - GET /verify?theory=Integer&P=11&Q=13&E=23&D=47
+        {"answer": true}
+
+    - GET /decrypt?theory=Bitvector&N=auto&P=11&Q=13&E=23&lower=0
+        {"answer": 47}, a decryption exponent greater than lower, null if there is none
+
+    - GET /enumerate?theory=Integer&P=11&Q=13&E=23&lower=0&upper=500
+        {"answer": [47, 167, 287, 407], "complete": true}, every decryption exponent in
+        [lower, upper), complete is false when there were more than maxExponents
+
+    - GET /stats
+        Latency histograms of every endpoint and how many requests were solved, coalesced
+        and rejected
+
+Every query endpoint also takes profile (see Solver_Profiles) and time / resources, the
+Budget of the call (see Budget), and an answer cvc5 gives up on is "timeout" or "unknown".
+theory defaults to Integer and N to auto. Parameters can also be POSTed as a JSON object.
+
+Queries run on a bounded pool of worker processes, each keeping its verifiers warm across
+requests the way Parallel_Runner's workers do. Every theory, bitwidth, profile and budget
+a client asks for needs its own solver, so a worker only keeps the verifierCacheSize most
+recently used ones alive and drops the rest. Identical queries that arrive while one is
+already running wait for its answer instead of running again, and once workers + queueSize
+distinct queries are in flight, new ones are turned away with 503 and Retry-After so a
+burst can't queue up unbounded work.
+
+Everything listens on localhost only, and port 0 picks a free port (RSAService.port), so
+the service can be started and queried offline, like from a test.
+"""
+
+import asyncio
+import bisect
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from src.Bitvector.Bitvector_Width import AUTO
+from src.Solver.Budget import Budget, SolverUnknown, unknownAnswer
+
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+from src.Integer.RSA_Finding_Valid_Decryption import enumerateDecryptionExponents as intEnumerate
+from src.Bitvector.RSA_Finding_Valid_Decryption import enumerateDecryptionExponents as bvEnumerate
+
+HOST = "127.0.0.1"
+PORT = 8573
+
+DEFAULT_WORKERS = 2
+# Distinct queries that may wait for a worker before new ones are turned away
+QUEUE_SIZE = 8
+# Most exponents one enumerate request answers with
+MAX_EXPONENTS = 1000
+# Seconds a rejected client is told to wait
+RETRY_AFTER = 1
+# Most verifiers a worker keeps alive, one per theory, bitwidth, profile and budget
+VERIFIER_CACHE_SIZE = 8
+
+THEORIES = ("Integer", "Bitvector")
+
+# Inputs every endpoint takes, in the order the functions take them
+ENDPOINTS = {"verify": ("P", "Q", "E", "D"),
+             "decrypt": ("P", "Q", "E", "lower"),
+             "enumerate": ("P", "Q", "E", "lower", "upper")}
+
+# Upper bounds in milliseconds of the latency buckets, the last bucket holds everything slower
+LATENCY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+# Verifiers of the current worker process, keyed by (theory, bitwidth, profile, budget), least recently used first
+_verifiers = OrderedDict()
+_verifierCacheSize = VERIFIER_CACHE_SIZE
+
+
+def _getVerifier(theory, N, profile, budget):
+    """Returns a verification function for a query, building it once per worker and dropping the least recently used"""
+    key = (theory, N, profile, budget)
+
+    if key in _verifiers:
+        _verifiers.move_to_end(key)
+        return _verifiers[key]
+
+    if theory == "Integer":
+        verifier = IntVerifier(profile=profile, budget=budget)
+    else:
+        verifier = BvVerifier(N, profile=profile, budget=budget)
+
+    _verifiers[key] = verifier.isValidRSAConfiguration
+
+    while len(_verifiers) > _verifierCacheSize:
+        _verifiers.popitem(last=False)
+
+    return _verifiers[key]
+
+
+def _warmUp(profile, budget, verifierCacheSize):
+    """Builds the default verifiers of a worker before its first request"""
+    global _verifierCacheSize
+    _verifierCacheSize = verifierCacheSize
+
+    _getVerifier("Integer", None, profile, budget)
+    _getVerifier("Bitvector", AUTO, profile, budget)
+
+
+def _ready():
+    """Nothing, submitted to start every worker"""
+
+
+def _runQuery(query):
+    """Answers one query inside a worker
+
+    Args:
+        query (tuple): (endpoint, theory, N, profile, budget, inputs, maxExponents)
+
+    Returns:
+        dict: The response body
+    """
+    endpoint, theory, N, profile, budget, inputs, maxExponents = query
+
+    try:
+        if endpoint == "verify":
+            return {"answer": _getVerifier(theory, N, profile, budget)(*inputs)}
+
+        if endpoint == "decrypt":
+            if theory == "Integer":
+                value = intFindDecrypt(*inputs, profile=profile, budget=budget)
+            else:
+                value = bvFindDecrypt(*inputs, N, profile=profile, budget=budget)
+
+            return {"answer": None if value is None else value.getIntegerValue()}
+
+        if theory == "Integer":
+            exponents = intEnumerate(*inputs, profile=profile, budget=budget)
+        else:
+            exponents = bvEnumerate(*inputs, N, profile=profile, budget=budget)
+
+        found = list(itertools.islice(exponents, maxExponents + 1))
+        return {"answer": found[:maxExponents], "complete": len(found) <= maxExponents}
+
+    except SolverUnknown as error:
+        return {"answer": unknownAnswer(error)}
+
+
+class LatencyHistogram:
+    """Counts of request latencies in LATENCY_BUCKETS
+
+    Args:
+        bounds (tuple, optional): Upper bounds of the buckets in milliseconds. Defaults to LATENCY_BUCKETS.
+    """
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.slowest = 0.0
+
+    def record(self, milliseconds):
+        self.counts[bisect.bisect_left(self.bounds, milliseconds)] += 1
+        self.total += milliseconds
+        self.slowest = max(self.slowest, milliseconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket the q quantile falls in, the slowest latency past the last bound"""
+        count = sum(self.counts)
+        if count == 0:
+            return None
+
+        rank = max(1, round(q * count))
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.slowest)
+
+        return self.slowest
+
+    def snapshot(self):
+        """Everything recorded so far, as JSON-ready values"""
+        count = sum(self.counts)
+        labels = ["<=" + str(bound) for bound in self.bounds] + [">" + str(self.bounds[-1])]
+
+        return {"count": count,
+                "mean_ms": self.total / count if count else None,
+                "p50_ms": self.quantile(0.5),
+                "p95_ms": self.quantile(0.95),
+                "p99_ms": self.quantile(0.99),
+                "max_ms": self.slowest if count else None,
+                "buckets_ms": dict(zip(labels, self.counts))}
+
+
+class RSAService:
+    """asyncio HTTP front-end over a bounded pool of warm solver workers, see the module docstring
+
+    Args:
+        workers (int, optional): Worker processes, and queries that can run at once. Defaults to DEFAULT_WORKERS.
+        queueSize (int, optional): Distinct queries that may wait for a worker. Defaults to QUEUE_SIZE.
+        profile (str, optional): Solver profile of requests that don't pick one. Defaults to None, the baseline.
+        budget (Budget, optional): Limits of requests that don't set time or resources. Defaults to None, no limits.
+        maxExponents (int, optional): Most exponents an enumerate request answers with. Defaults to MAX_EXPONENTS.
+        verifierCacheSize (int, optional): Most verifiers each worker keeps alive. Defaults to VERIFIER_CACHE_SIZE.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queueSize=QUEUE_SIZE, profile=None, budget=None,
+                 maxExponents=MAX_EXPONENTS, verifierCacheSize=VERIFIER_CACHE_SIZE):
+        self.workers = workers
+        self.capacity = workers + queueSize
+        self.profile = profile
+        self.budget = budget
+        self.maxExponents = maxExponents
+        self.verifierCacheSize = verifierCacheSize
+        self.port = None
+
+        self.latency = {endpoint: LatencyHistogram() for endpoint in ENDPOINTS}
+        self.counts = {"requests": 0, "solved": 0, "coalesced": 0, "rejected": 0, "errors": 0}
+
+        self._executor = None
+        self._server = None
+        # Futures of the queries running or waiting for a worker, keyed by query
+        self._inflight = {}
+
+    async def start(self, host=HOST, port=PORT):
+        """Starts and warms every worker, then listens on host and port
+
+        Returns:
+            RSAService: itself, with port set to the port it listens on
+        """
+        loop = asyncio.get_running_loop()
+
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_warmUp,
+                                             initargs=(self.profile, self.budget, self.verifierCacheSize))
+        # One task per worker spawns all of them now, so no request waits for a solver to be built
+        await asyncio.gather(*[loop.run_in_executor(self._executor, _ready) for _ in range(self.workers)])
+
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+        return self
+
+    async def serveForever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops listening, drops queued queries and waits for the running ones"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def stats(self):
+        """Request counts and latency histograms of every endpoint"""
+        return {"workers": self.workers,
+                "capacity": self.capacity,
+                "inflight": len(self._inflight),
+                "counts": dict(self.counts),
+                "latency": {endpoint: histogram.snapshot() for endpoint, histogram in self.latency.items()}}
+
+    def _query(self, endpoint, params):
+        """Turns the parameters of a request into the query a worker runs, ValueError if they are malformed"""
+        # The query is the key identical requests are coalesced on, so every value has to be hashable
+        for name, value in params.items():
+            if value is not None and not isinstance(value, (str, int)):
+                raise ValueError("Parameter " + str(name) + " must be a string or an integer")
+
+        theory = params.get("theory", "Integer")
+        if theory not in THEORIES:
+            raise ValueError("Unknown theory " + str(theory))
+
+        N = None
+        if theory == "Bitvector":
+            N = params.get("N", AUTO)
+            N = AUTO if N == AUTO else int(N)
+
+        budget = self.budget
+        if "time" in params or "resources" in params:
+            budget = Budget(*[None if params.get(name) is None else int(params[name]) for name in ("time", "resources")])
+
+        values = dict(params)
+        values.setdefault("lower", 0)
+
+        missing = [name for name in ENDPOINTS[endpoint] if name not in values]
+        if missing:
+            raise ValueError("Missing " + ", ".join(missing))
+
+        inputs = tuple(int(values[name]) for name in ENDPOINTS[endpoint])
+
+        return (endpoint, theory, N, params.get("profile", self.profile), budget, inputs, self.maxExponents)
+
+    async def query(self, endpoint, params):
+        """Answers one request without going through HTTP
+
+        Args:
+            endpoint (str): "verify", "decrypt" or "enumerate"
+            params (dict): Parameters of the request, see the module docstring
+
+        Returns:
+            tuple: (status, body) of the response
+        """
+        start = time.perf_counter_ns()
+        self.counts["requests"] += 1
+
+        if endpoint not in ENDPOINTS:
+            return 404, {"error": "Unknown endpoint " + str(endpoint)}
+
+        try:
+            query = self._query(endpoint, params)
+        except ValueError as error:
+            return 400, {"error": str(error)}
+
+        future = self._inflight.get(query)
+
+        if future is not None:
+            self.counts["coalesced"] += 1
+
+        elif len(self._inflight) >= self.capacity:
+            self.counts["rejected"] += 1
+            return 503, {"error": "Every worker is busy"}
+
+        else:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, _runQuery, query)
+            future.add_done_callback(lambda _: self._inflight.pop(query, None))
+            self._inflight[query] = future
+            self.counts["solved"] += 1
+
+        try:
+            # A client that goes away mustn't cancel the answer other clients are waiting for
+            body = await asyncio.shield(future)
+        # Bad inputs, like values too wide for the bitwidth the query asked for
+        except (ValueError, AssertionError) as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            self.counts["errors"] += 1
+            return 500, {"error": type(error).__name__ + ": " + str(error)}
+
+        self.latency[endpoint].record((time.perf_counter_ns() - start) / 1e6)
+
+        return 200, body
+
+    async def _request(self, reader):
+        """Reads one HTTP request and answers it"""
+        requestLine = (await reader.readline()).decode("latin-1").split()
+        if len(requestLine) != 3:
+            raise ValueError("Malformed request line")
+
+        method, target, _ = requestLine
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+
+        if method == "POST":
+            length = int(headers.get("content-length", 0))
+            if length:
+                body = json.loads(await reader.readexactly(length))
+                if not isinstance(body, dict):
+                    raise ValueError("Body must be a JSON object")
+                params.update(body)
+
+        elif method != "GET":
+            return 405, {"error": "Only GET and POST are supported"}
+
+        endpoint = url.path.strip("/")
+
+        if endpoint == "stats":
+            return 200, self.stats()
+
+        return await self.query(endpoint, params)
+
+    async def _handle(self, reader, writer):
+        """Serves one connection, one request per connection"""
+        try:
+            status, body = await self._request(reader)
+        except (ValueError, asyncio.IncompleteReadError) as error:
+            status, body = 400, {"error": str(error)}
+
+        payload = json.dumps(body).encode()
+        head = ["HTTP/1.1 " + str(status) + " " + _REASONS[status],
+                "Content-Type: application/json",
+                "Content-Length: " + str(len(payload)),
+                "Connection: close"]
+
+        if status == 503:
+            head.append("Retry-After: " + str(RETRY_AFTER))
+
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+if __name__ == '__main__':
+    # ------------- SETTINGS -------------
+    WORKERS = os.cpu_count()
+    PROFILE = "auto"
+    BUDGET = Budget(60000)
+
+    async def main():
+        service = await RSAService(WORKERS, QUEUE_SIZE, PROFILE, BUDGET).start(HOST, PORT)
+        print("Serving on http://" + HOST + ":" + str(service.port))
+
+        async with service:
+            await service.serveForever()
+
+    asyncio.run(main())
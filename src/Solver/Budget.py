@@ -0,0 +1,83 @@
+"""
+SOLVER BUDGETS
+
+Per-call time and resource limits for every cvc5-backed function, so one hard input
+can't hang a whole experiment.
+
+A Budget sets cvc5's tlimit-per (milliseconds of wall time per checkSat) and rlimit-per
+(cvc5's deterministic resource units per checkSat) on the solver. A call whose budget
+runs out, or that cvc5 gives up on for any other reason, raises SolverUnknown instead of
+being answered as invalid, so unknown is always told apart from sat and unsat.
+
+A list of budgets is an escalation ladder for retryWithBudgets: every step is tried in
+order until one is answered, and a step with a profile also switches solver profile.
+"""
+
+from collections import namedtuple
+
+# time: Milliseconds per checkSat, resources: cvc5 resource units per checkSat, profile:
+# Solver profile to switch to, None for all three to leave that alone
+Budget = namedtuple("Budget", ["time", "resources", "profile"], defaults=[None, None, None])
+
+
+class SolverUnknown(Exception):
+    """The solver answered unknown, like when the budget ran out
+
+    Args:
+        reason (str): Why, like cvc5's unknown explanation "TIMEOUT" or "RESOURCEOUT"
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def applyBudget(solver, budget=None):
+    """Sets the limits of a budget on a solver nothing has been checked on yet"""
+    if budget is None:
+        return
+
+    if budget.time is not None:
+        solver.setOption("tlimit-per", str(int(budget.time)))
+
+    if budget.resources is not None:
+        solver.setOption("rlimit-per", str(int(budget.resources)))
+
+
+def checkKnown(result):
+    """Passes a cvc5 result through, raising SolverUnknown if it is unknown"""
+    if result.isUnknown():
+        raise SolverUnknown(str(result.getUnknownExplanation()).split(".")[-1])
+
+    return result
+
+
+def unknownAnswer(error):
+    """The answer recorded for a SolverUnknown, "timeout" if time ran out and "unknown" otherwise"""
+    return "timeout" if error.reason == "TIMEOUT" else "unknown"
+
+
+def retryWithBudgets(call, budgets, profile=None):
+    """Calls call(budget, profile) with every budget in turn until one is answered
+
+    Args:
+        call (callable): Called as call(budget, profile), raises SolverUnknown when unknown
+        budgets (list): Budgets to try in order, usually with growing limits, empty for one
+            call without a budget
+        profile (str, optional): Profile for budgets that don't switch it. Defaults to None.
+
+    Raises:
+        SolverUnknown: Every budget ran out, from the last one
+
+    Returns:
+        tuple: (answer, attempts) where attempts is how many budgets were tried
+    """
+    if not budgets:
+        return call(None, profile), 1
+
+    for attempt, budget in enumerate(budgets, 1):
+        try:
+            return call(budget, budget.profile or profile), attempt
+        except SolverUnknown:
+            if attempt == len(budgets):
+                raise
@@ -0,0 +1,159 @@
+"""
+EXTERNAL SOLVER BACKEND
+
+Answers isValidRSAConfiguration and findDecryptionExponent by exporting the query the
+Integer or Bitvector module would have asked cvc5 (verificationScript, decryptionScript)
+and running it on a SolverPool, so any SMT-LIB2 solver can stand in for the bindings.
+
+ExternalVerifier has the same isValidRSAConfiguration as IncrementalVerifier, so it can
+be dropped into anything that takes one. A query that runs past the pool's timeout
+raises SolverTimeout, and its solver is restarted for the next query. A budget is exported
+with the script as cvc5's tlimit-per and rlimit-per options, and an unknown answer raises
+SolverUnknown.
+"""
+
+import re
+
+from src.Solver.Budget import SolverUnknown
+from src.Solver.Instrumentation import NULL_TIMER
+from src.Solver.Solver_Pool import SolverError
+
+from src.Integer.RSA_Valid_Configuration import verificationScript as intVerificationScript
+from src.Bitvector.RSA_Valid_Configuration import verificationScript as bvVerificationScript
+from src.Integer.RSA_Finding_Valid_Decryption import decryptionScript as intDecryptionScript
+from src.Bitvector.RSA_Finding_Valid_Decryption import decryptionScript as bvDecryptionScript
+
+_VALUE = re.compile(r"\(\(\s*decrypt\s+(.+?)\s*\)\)")
+
+
+def _parseValue(value):
+    """Turns an SMT-LIB2 integer or bitvector literal into an int"""
+    if value.startswith("#b"):
+        return int(value[2:], 2)
+
+    if value.startswith("#x"):
+        return int(value[2:], 16)
+
+    if value.startswith("(_ bv"):
+        return int(value[5:].split()[0])
+
+    return int(value.replace("(", "").replace(")", "").replace("- ", "-"))
+
+
+def _status(lines):
+    """sat or unsat from the output of a script, SolverUnknown for unknown and SolverError for anything else"""
+    for line in lines:
+        if line in ("sat", "unsat"):
+            return line
+
+        # Some solvers follow unknown with the reason, like "unknown (RESOURCEOUT)"
+        if line.split(" ")[0] == "unknown":
+            raise SolverUnknown(line[len("unknown"):].strip(" ()") or "UNKNOWN")
+
+    raise SolverError("No answer from the solver: " + " ".join(lines))
+
+
+class ExternalVerifier:
+    """Verifier and decryption finder that runs every query on a SolverPool
+
+    Args:
+        pool (SolverPool): Solvers the scripts are run on
+        theory (str): "Integer" or "Bitvector"
+        N (int, optional): Bitwidth for bitvectors. Defaults to None.
+        primality (str, optional): How primality is encoded, one of PRIMALITY_MODES. Defaults to "trial".
+        profile (str, optional): Solver profile the scripts are exported with. Defaults to None, the baseline.
+        budget (Budget, optional): Time and resource limits the scripts are exported with. Defaults to None, no limits.
+    """
+
+    def __init__(self, pool, theory, N=None, primality="trial", profile=None, budget=None):
+        if theory not in ("Integer", "Bitvector"):
+            raise ValueError("Unknown type " + str(theory))
+
+        self.pool = pool
+        self.theory = theory
+        self.N = N
+        self.primality = primality
+        self.profile = profile
+        self.budget = budget
+
+    def verificationScript(self, P,Q,E,D):
+        if self.theory == "Integer":
+            return intVerificationScript(P,Q,E,D, self.primality, self.profile, self.budget)
+
+        return bvVerificationScript(P,Q,E,D, self.N, self.primality, self.profile, self.budget)
+
+    def decryptionScript(self, P,Q,E,LOWER_BOUND):
+        if self.theory == "Integer":
+            return intDecryptionScript(P,Q,E,LOWER_BOUND, self.profile, self.budget)
+
+        return bvDecryptionScript(P,Q,E,LOWER_BOUND, self.N, self.profile, self.budget)
+
+    def isValidRSAConfiguration(self, P,Q,E,D, output=False, timer=None):
+        """Verifies input satisfies properties specified in RSA on an external solver
+
+        Args:
+            P (int): Prime 1
+            Q (int): Prime 2
+            E (int): Encryption Exponent
+            D (int): Decryption Exponent
+            output (bool, optional): Print whether it was sat. Defaults to False.
+            timer (PhaseTimer, optional): terms is building the script, solve is running it. Defaults to None.
+
+        Raises:
+            SolverTimeout: The query ran past the pool's timeout
+            SolverUnknown: The solver answered unknown, like when the budget ran out
+
+        Returns:
+            bool: whether it is a valid or not
+        """
+        timer = timer or NULL_TIMER
+
+        with timer.phase("terms"):
+            script = self.verificationScript(P,Q,E,D)
+
+        with timer.phase("solve"):
+            results = _status(self.pool.run(script))
+
+        if output:
+            print("RSA Configuration was:", results)
+
+        return results == "sat"
+
+    def findDecryptionExponent(self, P,Q,E,LOWER_BOUND, output=False, timer=None):
+        """Finds a satisfying Decryption Exponent on an external solver
+
+        Args:
+            P (int): Prime 1
+            Q (int): Prime 2
+            E (int): Encryption Exponent
+            LOWER_BOUND (int): Lowest value the decryption exponent can be
+            output (bool, optional): Print whether it was sat. Defaults to False.
+            timer (PhaseTimer, optional): terms is building the script, solve is running it. Defaults to None.
+
+        Raises:
+            SolverTimeout: The query ran past the pool's timeout
+            SolverUnknown: The solver answered unknown, like when the budget ran out
+
+        Returns:
+            int: Decryption Exponent, None if there is none
+        """
+        timer = timer or NULL_TIMER
+
+        with timer.phase("terms"):
+            script = self.decryptionScript(P,Q,E,LOWER_BOUND)
+
+        with timer.phase("solve"):
+            lines = self.pool.run(script)
+
+        results = _status(lines)
+
+        if output:
+            print("Finding Decryption greater than "+str(LOWER_BOUND)+" was", results)
+
+        with timer.phase("model"):
+            for line in lines:
+                value = _VALUE.match(line)
+                if value:
+                    return _parseValue(value.group(1))
+
+        return None
@@ -0,0 +1,117 @@
+"""
+SOLVER PHASE INSTRUMENTATION
+
+Splits the runtime of a cvc5-backed call into phases measured with perf_counter_ns and
+keeps the solver's own statistics, so experiments can tell whether startup or solving
+is the real cost.
+
+THE PHASES ARE
+    - setup: Building the TermManager and Solver and setting the logic and options
+    - terms: Building and asserting every term
+    - solve: checkSat
+    - model: Reading values back out of the model
+
+Every Integer and Bitvector function takes an optional timer=PhaseTimer(), and leaving it
+out costs nothing.
+"""
+
+import json
+import re
+import time
+from contextlib import contextmanager, nullcontext
+
+PHASES = ("setup", "terms", "solve", "model")
+COLUMNS = [phase + "_ns" for phase in PHASES] + ["cvc5_statistics"]
+
+_DURATION = re.compile(r"^(\d+)ms$")
+
+
+def _flattenStatistics(statistics):
+    """Keeps only the value of every statistic cvc5 reports"""
+    return {name: stat["value"] for name, stat in statistics.items()}
+
+
+def _subtract(current, previous):
+    """Difference of two statistic values, cvc5 reports counters, "<n>ms" timers and histograms"""
+    if previous is None:
+        return current
+
+    if isinstance(current, int) and isinstance(previous, int):
+        return current - previous
+
+    if isinstance(current, str) and isinstance(previous, str):
+        now, before = _DURATION.match(current), _DURATION.match(previous)
+        if now and before:
+            return str(int(now.group(1)) - int(before.group(1))) + "ms"
+
+    if isinstance(current, dict) and isinstance(previous, dict):
+        return {key: _subtract(value, previous.get(key)) for key, value in current.items()}
+
+    return current
+
+
+class PhaseTimer:
+    """Nanosecond spans per phase and the solver statistics of one call
+
+    Args:
+        internal (bool, optional): Also keep cvc5's internal statistics. Defaults to False.
+    """
+
+    def __init__(self, internal=False):
+        self.internal = internal
+        self.reset()
+
+    def reset(self):
+        """Clears the spans and statistics so the timer can be reused for the next call"""
+        self.spans = dict.fromkeys(PHASES, 0)
+        self.statistics = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Adds the time spent inside the with block to a phase"""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.spans[name] += time.perf_counter_ns() - start
+
+    def recordStatistics(self, solver, since=None):
+        """Keeps the solver's statistics
+
+        Args:
+            solver (cvc5.Solver): Solver that was just used
+            since (dict, optional): Statistics from an earlier recordStatistics on the same
+                solver, only what changed after them is kept. Defaults to None.
+
+        Returns:
+            dict: Every statistic as it is now, to pass as since next time
+        """
+        current = _flattenStatistics(solver.getStatistics().get(self.internal, False))
+
+        if since is None:
+            self.statistics = current
+        else:
+            self.statistics = {name: _subtract(value, since.get(name)) for name, value in current.items()}
+
+        return current
+
+    def total(self):
+        """Nanoseconds across every phase"""
+        return sum(self.spans.values())
+
+    def row(self):
+        """Values for COLUMNS"""
+        return [self.spans[phase] for phase in PHASES] + [json.dumps(self.statistics, sort_keys=True)]
+
+
+class _NullTimer:
+    """Stands in when no timer is passed so instrumented code needs no branches"""
+
+    def phase(self, name):
+        return nullcontext()
+
+    def recordStatistics(self, solver, since=None):
+        return since
+
+
+NULL_TIMER = _NullTimer()
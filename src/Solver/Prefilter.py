@@ -0,0 +1,70 @@
+"""
+FAST-REJECT PREFILTER
+
+Answers inputs that are obviously not a valid RSA configuration in Python, before they
+reach cvc5. This is for throughput, since prefiltered answers are never timed as solves.
+
+AN INPUT IS REJECTED WHEN
+    - P <= 1, Q <= 1, P == Q, E <= 1 or D <= 1
+
+    - P or Q is below PRIMALITY_LIMIT and has a divisor in 2..ceil(sqrt(P)), the same
+        divisors the solver's primality constraints rule out
+
+Everything else goes to the solver, so the answers are always the solver's answers.
+"""
+
+from src.Primes.Primality_Certificate import smallestDivisor
+
+PRIMALITY_LIMIT = 2**32
+
+
+def isTriviallyInvalid(P,Q,E,D, primalityLimit=PRIMALITY_LIMIT):
+    """Whether the solver would find the input invalid without needing to solve anything hard
+
+    Args:
+        P (int): Prime 1
+        Q (int): Prime 2
+        E (int): Encryption Exponent
+        D (int): Decryption Exponent
+        primalityLimit (int, optional): Only check primality below this. Defaults to PRIMALITY_LIMIT.
+
+    Returns:
+        bool: True if it is definitely invalid, False if the solver has to decide
+    """
+    if P <= 1 or Q <= 1 or P == Q or E <= 1 or D <= 1:
+        return True
+
+    for prime in (P, Q):
+        if prime < primalityLimit and smallestDivisor(prime) is not None:
+            return True
+
+    return False
+
+
+class Prefilter:
+    """Puts the fast-reject stage in front of a verification function
+
+    Args:
+        function (callable): isValidRSAConfiguration, called as function(P,Q,E,D, **kwargs)
+            for every input the prefilter can't answer
+        primalityLimit (int, optional): Only check primality below this. Defaults to PRIMALITY_LIMIT.
+    """
+
+    def __init__(self, function, primalityLimit=PRIMALITY_LIMIT):
+        self.function = function
+        self.primalityLimit = primalityLimit
+
+        self.answered = 0
+        self.solved = 0
+
+    def __call__(self, P,Q,E,D, **kwargs):
+        if isTriviallyInvalid(P,Q,E,D, self.primalityLimit):
+            self.answered += 1
+            return False
+
+        self.solved += 1
+        return self.function(P,Q,E,D, **kwargs)
+
+    def counts(self):
+        """How many inputs the prefilter answered and how many went to the solver"""
+        return {"answered": self.answered, "solver": self.solved}
@@ -0,0 +1,160 @@
+"""
+RESULT CACHE
+
+Memoizes the answers of isValidRSAConfiguration and findDecryptionExponent, so repeat
+sweeps and overlapping bound ranges don't pay for a cvc5 solve they already did.
+
+Answers are kept in an in-memory LRU, and optionally in a SQLite file so they outlive the
+process and can be shared between runs and worker processes. Every answer is keyed by
+(query, theory, width, inputs, options), where query says which function answered
+("verify" or "decrypt") and options are the settings the function was built with (like
+the primality mode), so answers from differently configured functions never mix.
+
+Timings of cached answers only measure the lookup, so anything that is timed should pass
+bypass=True, which always runs the solver and only writes its answer to the cache.
+"""
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+DEFAULT_SIZE = 2**16
+
+# Returned by ResultCache.get when there is no answer, since None and False are answers
+MISSING = object()
+
+
+def _toPython(value):
+    """Turns a cvc5 integer value into an int so it can be stored, leaves bools alone"""
+    if hasattr(value, "isIntegerValue") and value.isIntegerValue():
+        return value.getIntegerValue()
+
+    return value
+
+
+class ResultCache:
+    """In-memory LRU of answers with an optional SQLite file behind it
+
+    Args:
+        path (str, optional): SQLite file answers are persisted to, None to only keep them
+            in memory. Defaults to None.
+        maxSize (int, optional): Most answers kept in memory. Defaults to DEFAULT_SIZE.
+    """
+
+    def __init__(self, path=None, maxSize=DEFAULT_SIZE):
+        self.path = path
+        self.maxSize = maxSize
+
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._connection = None
+
+        if path is not None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # WAL lets every worker process read while one of them writes
+            self._connection = sqlite3.connect(path, timeout=60)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._connection.commit()
+
+    @staticmethod
+    def key(query, theory, width, inputs, options=None):
+        """Builds the key of one call
+
+        Args:
+            query (str): Which function answered, like "verify" or "decrypt"
+            theory (str): "Integer" or "Bitvector"
+            width: Bitwidth, "auto", or None for integers
+            inputs (tuple): Arguments of the call, like (P,Q,E,D)
+            options (dict, optional): Settings the function was built with. Defaults to None.
+
+        Returns:
+            str: The key
+        """
+        return json.dumps([query, theory, width, list(inputs), sorted((options or {}).items())])
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+
+        if len(self._memory) > self.maxSize:
+            self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Looks up an answer
+
+        Returns:
+            The answer, or MISSING
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self._connection is not None:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+
+            if row is not None:
+                value = json.loads(row[0])
+                self._remember(key, value)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return MISSING
+
+    def put(self, key, value):
+        self._remember(key, value)
+
+        if self._connection is not None:
+            self._connection.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+            self._connection.commit()
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def memoize(function, cache, query, theory, width=None, **options):
+    """Puts a ResultCache in front of a verification or decryption function
+
+    Args:
+        function (callable): Called as function(*inputs, timer=timer) on a miss, already
+            set up with its width and options
+        cache (ResultCache): Where answers are kept
+        query (str): Which function this is, like "verify" or "decrypt"
+        theory (str): "Integer" or "Bitvector"
+        width (optional): Bitwidth the function was built with. Defaults to None.
+        options: Every other setting the function was built with, like primality
+
+    Returns:
+        callable: Called as call(*inputs, timer=None, bypass=False). Decryption exponents
+            come back as ints instead of cvc5 terms
+    """
+    def call(*inputs, timer=None, bypass=False):
+        key = cache.key(query, theory, width, inputs, options)
+
+        if not bypass:
+            value = cache.get(key)
+            if value is not MISSING:
+                return value
+
+        value = _toPython(function(*inputs, timer=timer))
+        cache.put(key, value)
+
+        return value
+
+    return call
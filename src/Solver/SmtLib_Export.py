@@ -0,0 +1,76 @@
+"""
+SMT-LIB2 EXPORT
+
+Turns a cvc5 solver everything has been asserted to into the SMT-LIB2 script of the same
+query, so it can be handed to an external solver (see Solver_Pool) or saved and replayed.
+
+A SCRIPT HOLDS
+    - A (set-option ...) for every option that was set on the solver and (set-logic ...),
+        so a query built with a solver profile exports with that profile
+    - (declare-fun ...) for every free constant the assertions use
+    - (assert ...) for every assertion
+    - (check-sat) and whatever commands should follow it, like (get-value (decrypt))
+"""
+
+from cvc5 import Kind
+
+CHECK_SAT = "(check-sat)"
+
+
+def _optionValue(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    return str(value)
+
+
+def _constants(terms):
+    """Every free constant in the terms, in the order they are first seen"""
+    constants = {}
+    stack = list(reversed(terms))
+    seen = set()
+
+    while stack:
+        term = stack.pop()
+        if term.getId() in seen:
+            continue
+        seen.add(term.getId())
+
+        if term.getKind() == Kind.CONSTANT:
+            constants[term.getId()] = term
+        else:
+            stack.extend(reversed(list(term)))
+
+    return list(constants.values())
+
+
+def toSmtLib(solver, commands=(CHECK_SAT,)):
+    """SMT-LIB2 script of everything asserted to a solver
+
+    Args:
+        solver (cvc5.Solver): Solver with its logic set and every rule asserted
+        commands (tuple, optional): Commands appended after the assertions. Defaults to (CHECK_SAT,).
+
+    Returns:
+        str: The script, one command per line
+    """
+    lines = []
+
+    for name in solver.getOptionNames():
+        info = solver.getOptionInfo(name)
+        if info["setByUser"]:
+            lines.append("(set-option :" + name + " " + _optionValue(info["current"]) + ")")
+
+    lines.append("(set-logic " + solver.getLogic() + ")")
+
+    assertions = solver.getAssertions()
+
+    for constant in _constants(assertions):
+        lines.append("(declare-fun " + constant.getSymbol() + " () " + str(constant.getSort()) + ")")
+
+    for assertion in assertions:
+        lines.append("(assert " + str(assertion) + ")")
+
+    lines.extend(commands)
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,209 @@
+"""
+EXTERNAL SOLVER POOL
+
+Runs SMT-LIB2 scripts (see SmtLib_Export) on long-lived solver subprocesses instead of
+the in-process cvc5 bindings, so other solvers can be compared on the same queries and a
+query that hangs can be killed without taking the experiment down with it.
+
+EVERY SCRIPT IS SENT AS
+    (reset)
+    <script>
+    (echo "<MARKER>")
+
+over stdin, and everything the solver prints before the marker comes back over stdout
+as the script's output. (reset) clears the assertions and options of the last script, so
+one process is reused for every script instead of starting a solver per query.
+
+A script that doesn't finish within its timeout has its process killed and replaced,
+and SolverTimeout is raised, so the next script starts on a fresh solver. SolverTimeout is
+also a Budget.SolverUnknown, so it is retried and recorded like any other unknown answer.
+"""
+
+import os
+import queue
+import selectors
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.Solver.Budget import SolverUnknown
+
+# Any solver that reads SMT-LIB2 from stdin and keeps going after (check-sat) works
+DEFAULT_COMMAND = ("cvc5", "--incremental", "--lang=smt2")
+DEFAULT_TIMEOUT = 60
+
+MARKER = "smt-rsa-script-done"
+
+
+class SolverError(Exception):
+    """The solver process died or couldn't be started"""
+
+
+class SolverTimeout(SolverError, SolverUnknown):
+    """A script ran past its timeout, the process was killed and the answer is unknown"""
+
+    def __init__(self, message):
+        SolverError.__init__(self, message)
+        self.reason = "TIMEOUT"
+
+
+class SolverProcess:
+    """One long-lived solver subprocess
+
+    Args:
+        command (tuple, optional): Command line of the solver. Defaults to DEFAULT_COMMAND.
+    """
+
+    def __init__(self, command=DEFAULT_COMMAND):
+        self.command = tuple(command)
+        self.restarts = 0
+
+        self._process = None
+        self._buffer = b""
+
+    def _start(self):
+        if self._process is not None:
+            self.restarts += 1
+
+        try:
+            self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                             stderr=subprocess.DEVNULL)
+        except OSError as error:
+            raise SolverError("Can't start " + " ".join(self.command) + ": " + str(error))
+
+        os.set_blocking(self._process.stdout.fileno(), False)
+        self._buffer = b""
+
+    def _readLine(self, deadline):
+        """Next line of output, or None once the deadline passes"""
+        stdout = self._process.stdout
+
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+
+            while b"\n" not in self._buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    return None
+
+                chunk = os.read(stdout.fileno(), 65536)
+                if not chunk:
+                    self.kill()
+                    raise SolverError(" ".join(self.command) + " exited with " + str(self._process.returncode))
+
+                self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line.decode().strip()
+
+    def run(self, script, timeout=DEFAULT_TIMEOUT):
+        """Runs a script
+
+        Args:
+            script (str): SMT-LIB2 script
+            timeout (float, optional): Seconds the script may take. Defaults to DEFAULT_TIMEOUT.
+
+        Returns:
+            list: Every line the solver printed, like ["sat", "((decrypt 47))"]
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+
+        deadline = time.monotonic() + timeout
+
+        try:
+            self._process.stdin.write(("(reset)\n" + script + '(echo "' + MARKER + '")\n').encode())
+            self._process.stdin.flush()
+        except BrokenPipeError:
+            self.kill()
+            raise SolverError(" ".join(self.command) + " exited with " + str(self._process.returncode))
+
+        lines = []
+        while True:
+            line = self._readLine(deadline)
+
+            if line is None:
+                self.kill()
+                raise SolverTimeout("Script ran past " + str(timeout) + "s")
+
+            if line.strip('"') == MARKER:
+                return lines
+
+            if line:
+                lines.append(line)
+
+    def kill(self):
+        """Kills the solver, the next script starts a new one"""
+        if self._process is None:
+            return
+
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+        self._process.stdin.close()
+        self._process.stdout.close()
+
+
+class SolverPool:
+    """A bounded pool of SolverProcesses that scripts are handed out to
+
+    Args:
+        size (int, optional): Solver processes, and scripts that can run at once. Defaults to 1.
+        command (tuple, optional): Command line of every solver. Defaults to DEFAULT_COMMAND.
+        timeout (float, optional): Seconds a script may take by default. Defaults to DEFAULT_TIMEOUT.
+    """
+
+    def __init__(self, size=1, command=DEFAULT_COMMAND, timeout=DEFAULT_TIMEOUT):
+        self.size = size
+        self.command = tuple(command)
+        self.timeout = timeout
+
+        self._processes = [SolverProcess(command) for _ in range(size)]
+        self._idle = queue.Queue()
+        for process in self._processes:
+            self._idle.put(process)
+
+    def run(self, script, timeout=None):
+        """Runs a script on the next idle solver, waiting for one if they are all busy
+
+        Raises:
+            SolverTimeout: The script ran past its timeout, its solver was restarted
+
+        Returns:
+            list: Every line the solver printed
+        """
+        process = self._idle.get()
+        try:
+            return process.run(script, self.timeout if timeout is None else timeout)
+        finally:
+            self._idle.put(process)
+
+    def map(self, scripts, timeout=None):
+        """Runs scripts on every solver at once, results come back in order
+
+        Returns:
+            list: The output lines of every script, or the SolverError it raised
+        """
+        def run(script):
+            try:
+                return self.run(script, timeout)
+            except SolverError as error:
+                return error
+
+        with ThreadPoolExecutor(self.size) as executor:
+            return list(executor.map(run, scripts))
+
+    def restarts(self):
+        """How many solvers had to be killed and started again"""
+        return sum(process.restarts for process in self._processes)
+
+    def close(self):
+        for process in self._processes:
+            process.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
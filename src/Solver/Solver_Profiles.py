@@ -0,0 +1,177 @@
+"""
+SOLVER PROFILES
+
+Named sets of cvc5 logic and options that every Integer and Bitvector function can be
+told to use with profile=<name>, so configurations can be compared on the same queries
+and experiments can run with whichever one was fastest.
+
+Once the inputs are bound every query is ground, so the quantifier machinery the
+baseline turns on for Integer verification (NIA with finite-model-find) is never needed.
+
+THE PROFILES ARE
+    - baseline: What every function has always used, NIA with finite-model-find for Integer
+        verification and round trips, QF_NIA for Integer decryption, QF_BV for bitvectors
+    - ground-qf: QF_NIA and QF_BV with no extra options
+    - nl-ext: QF_NIA solved by incremental linearization only (Integer)
+    - nl-cov: QF_NIA solved by cylindrical algebraic coverings first (Integer)
+    - bitblast-eager: QF_BV bit-blasted up front onto CaDiCaL (Bitvector)
+    - bitblast-eager-minisat: QF_BV bit-blasted up front onto MiniSat (Bitvector)
+    - auto: Whatever Profile_Tuning found fastest for the theory, query and input size,
+        baseline for anything that hasn't been tuned
+
+Profiles only change how cvc5 searches, never the answers. Options a function needs to
+work, like produce-models and incremental, are still set by the function itself.
+"""
+
+import json
+import os
+
+from src.Solver.Budget import applyBudget
+
+AUTO_PROFILE = "auto"
+
+# Where Profile_Tuning writes the fastest profile of every theory, query and size bucket
+TUNING_FILE = "./data/SolverProfiles/tuning.json"
+
+# Inputs are bucketed by the bit length of their largest value, rounded up to this
+BUCKET_BITS = 8
+
+# Bucket auto falls back to when the size isn't known, the fastest profile over everything
+ALL_SIZES = "all"
+
+_FINITE_MODEL_FIND = {"finite-model-find": "true"}
+
+# (logic, options) every query was written against, keyed by (theory, query)
+BASELINE = {
+    ("Integer", "verify"): ("NIA", _FINITE_MODEL_FIND),
+    ("Integer", "decrypt"): ("QF_NIA", {}),
+    ("Integer", "round-trip"): ("NIA", _FINITE_MODEL_FIND),
+    ("Bitvector", "verify"): ("QF_BV", {}),
+    ("Bitvector", "decrypt"): ("QF_BV", {}),
+    ("Bitvector", "round-trip"): ("QF_BV", {}),
+}
+
+# (logic, options) of every other profile, keyed by theory, a profile only exists for the
+# theories it lists
+PROFILES = {
+    "ground-qf": {
+        "Integer": ("QF_NIA", {}),
+        "Bitvector": ("QF_BV", {}),
+    },
+    "nl-ext": {
+        "Integer": ("QF_NIA", {"nl-ext": "full", "nl-cov": "false"}),
+    },
+    "nl-cov": {
+        "Integer": ("QF_NIA", {"nl-cov": "true"}),
+    },
+    "bitblast-eager": {
+        "Bitvector": ("QF_BV", {"bitblast": "eager", "bv-sat-solver": "cadical"}),
+    },
+    "bitblast-eager-minisat": {
+        "Bitvector": ("QF_BV", {"bitblast": "eager", "bv-sat-solver": "minisat"}),
+    },
+}
+
+# Tuning tables already read, keyed by path, with the modification time they were read at
+_tunings = {}
+
+
+def profilesFor(theory):
+    """Every named profile that applies to a theory, baseline first
+
+    Args:
+        theory (str): "Integer" or "Bitvector"
+
+    Returns:
+        list: Profile names
+    """
+    return ["baseline"] + [name for name, settings in PROFILES.items() if theory in settings]
+
+
+def sizeBucket(*values):
+    """Size bucket of an input, the bit length of its largest value rounded up to BUCKET_BITS
+
+    Args:
+        values (int): Every value of the input
+
+    Returns:
+        str: The bucket, like "16", or ALL_SIZES when there are no values
+    """
+    if not values:
+        return ALL_SIZES
+
+    bits = max(1, max(abs(value).bit_length() for value in values))
+    return str(-(-bits // BUCKET_BITS) * BUCKET_BITS)
+
+
+def loadTuning(path=TUNING_FILE):
+    """Reads a tuning table, {theory: {query: {bucket: profile}}}, empty if there is none
+
+    The table is only read again when the file changes.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    modified = os.path.getmtime(path)
+    if path not in _tunings or _tunings[path][0] != modified:
+        with open(path) as file:
+            _tunings[path] = (modified, json.load(file))
+
+    return _tunings[path][1]
+
+
+def resolveProfile(profile, theory, query, *values, tuning=TUNING_FILE):
+    """Turns a profile, possibly auto, into the name of a concrete profile
+
+    Args:
+        profile (str): Profile name, AUTO_PROFILE or None for baseline
+        theory (str): "Integer" or "Bitvector"
+        query (str): "verify", "decrypt" or "round-trip"
+        values (int): Input values, pick the size bucket auto looks up
+        tuning (str, optional): Tuning table auto reads. Defaults to TUNING_FILE.
+
+    Returns:
+        str: Profile name
+    """
+    if profile is None:
+        return "baseline"
+
+    if profile != AUTO_PROFILE:
+        return profile
+
+    buckets = loadTuning(tuning).get(theory, {}).get(query, {})
+    return buckets.get(sizeBucket(*values), buckets.get(ALL_SIZES, "baseline"))
+
+
+def configure(solver, theory, query, profile=None, *values, budget=None):
+    """Sets the logic and options of a fresh solver from a profile
+
+    Args:
+        solver (cvc5.Solver): Solver nothing has been asserted to yet
+        theory (str): "Integer" or "Bitvector"
+        query (str): "verify", "decrypt" or "round-trip"
+        profile (str, optional): Profile name, AUTO_PROFILE or None for baseline. Defaults to None.
+        values (int): Input values, pick the size bucket for auto
+        budget (Budget, optional): Time and resource limits of every checkSat. Defaults to None, no limits.
+
+    Returns:
+        str: Name of the profile that was applied
+    """
+    name = resolveProfile(profile, theory, query, *values)
+
+    if name == "baseline":
+        logic, options = BASELINE[(theory, query)]
+
+    elif name in PROFILES and theory in PROFILES[name]:
+        logic, options = PROFILES[name][theory]
+
+    else:
+        raise ValueError("Unknown profile " + str(profile) + " for " + str(theory))
+
+    solver.setLogic(logic)
+    for option, value in options.items():
+        solver.setOption(option, value)
+
+    applyBudget(solver, budget)
+
+    return name
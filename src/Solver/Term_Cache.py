@@ -0,0 +1,85 @@
+"""
+TERM CACHE
+
+A bounded LRU cache of cvc5 constants, sorts and reusable subterms for one TermManager,
+so a persistent solver checking input after input doesn't rebuild the same Python-side
+term objects on every call.
+
+Every entry is keyed by (theory, width, value, name)
+    - theory: "Integer" or "Bitvector"
+    - width: Bitwidth of the term, None for integers
+    - value: The constant the term is built from
+    - name: None for plain constants, otherwise what the entry is, like "sort" or
+        (id of prime1, "=") for the input assertion binding prime1 to value
+
+Terms only ever belong to the TermManager that built them, so each TermManager gets its
+own cache and it is dropped with it.
+"""
+
+from collections import OrderedDict
+
+DEFAULT_SIZE = 2**14
+
+
+class TermCache:
+    """Bounded LRU cache of the terms built by one TermManager
+
+    Args:
+        tm (cvc5.TermManager): Term manager every cached term belongs to
+        theory (str): "Integer" or "Bitvector"
+        maxSize (int, optional): Most entries kept before the least recently used is evicted.
+            Defaults to DEFAULT_SIZE.
+    """
+
+    def __init__(self, tm, theory, maxSize=DEFAULT_SIZE):
+        self.tm = tm
+        self.theory = theory
+        self.maxSize = maxSize
+
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, width, value, build, name=None):
+        """Returns the cached term, building and caching it on a miss
+
+        Args:
+            width (int): Bitwidth of the term, None for integers
+            value: Constant the term is built from
+            build (callable): Builds the term, only called on a miss
+            name (optional): What the entry is, None for plain constants. Defaults to None.
+
+        Returns:
+            The term, or whatever build returned
+        """
+        key = (self.theory, width, value, name)
+
+        term = self._entries.get(key)
+        if term is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return term
+
+        self.misses += 1
+        term = self._entries[key] = build()
+
+        if len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+        return term
+
+    def mkInteger(self, value):
+        return self.get(None, value, lambda: self.tm.mkInteger(value))
+
+    def mkBitVector(self, N, value):
+        return self.get(N, value, lambda: self.tm.mkBitVector(N, value))
+
+    def mkBitVectorSort(self, N):
+        return self.get(N, None, lambda: self.tm.mkBitVectorSort(N), name="sort")
+
+    def __getattr__(self, attribute):
+        # Everything that isn't cached, like mkTerm and mkConst, goes straight to the TermManager
+        return getattr(self.tm, attribute)
@@ -0,0 +1,30 @@
+"""
+Inputs shared by the tests that check a faster path answers like the one-shot verifier
+"""
+
+import math
+import random
+
+import pytest
+
+BOUND = 8
+RANDOM_INPUTS = 600
+
+
+def validInputs(bound):
+    """Every (P,Q,E,D) below bound that is a valid RSA configuration, worked out in Python"""
+    # Trial division by 2..ceil(sqrt(P)) turns 2 away, like the solvers do
+    primes = [p for p in range(3, bound) if all(p % i for i in range(2, math.isqrt(p) + 1))]
+
+    return [(P, Q, E, D) for P in primes for Q in primes if P != Q
+            for E in range(2, bound) for D in range(2, bound)
+            if math.gcd(E, (P-1)*(Q-1)) == 1 and (E*D) % ((P-1)*(Q-1)) == 1]
+
+
+@pytest.fixture(scope="session")
+def inputs():
+    """RANDOM_INPUTS seeded random inputs below BOUND and every valid one"""
+    rng = random.Random(0)
+    drawn = [tuple(rng.randrange(BOUND) for _ in range(4)) for _ in range(RANDOM_INPUTS)]
+
+    return drawn + validInputs(BOUND)
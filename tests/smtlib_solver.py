@@ -0,0 +1,50 @@
+"""
+Stand-in for an SMT-LIB2 solver binary, like cvc5 --incremental --lang=smt2, built on the
+cvc5 bindings so the external backend can be tested without one installed
+
+Reads commands from stdin and prints what each one answers, (reset) starts a new solver.
+"""
+
+import sys
+
+import cvc5
+
+
+def _fresh(tm):
+    solver = cvc5.Solver(tm)
+    solver.setOption("incremental", "true")
+    return solver, cvc5.SymbolManager(tm)
+
+
+def main():
+    tm = cvc5.TermManager()
+    solver, symbols = _fresh(tm)
+
+    command = ""
+    for line in sys.stdin:
+        if line.strip() == "(reset)":
+            solver, symbols = _fresh(tm)
+            continue
+
+        # Commands can span lines, every one of them ends once its parentheses are balanced
+        command += line
+        if command.count("(") != command.count(")"):
+            continue
+
+        parser = cvc5.InputParser(solver, symbols)
+        parser.setStringInput(cvc5.InputLanguage.SMT_LIB_2_6, command, "stdin")
+        command = ""
+
+        while True:
+            parsed = parser.nextCommand()
+            if parsed.isNull():
+                break
+
+            output = parsed.invoke(solver, symbols)
+            if output:
+                sys.stdout.write(output if output.endswith("\n") else output + "\n")
+                sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
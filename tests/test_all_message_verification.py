@@ -0,0 +1,76 @@
+"""
+Every all-message check has to say whether every message comes back after encrypting and
+decrypting, exactly when a brute force round trip of every message in Python does
+"""
+
+import math
+import random
+
+import pytest
+
+from src.Integer.RSA_All_Message_Verification import MODES, allMessageDecryptEncryptVerification as intAllMessages
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+
+from conftest import validInputs
+
+PRIMES = [3, 5, 7, 11, 13, 17, 19, 23]
+
+
+def _inputs():
+    """Valid configurations, ones only off in D, and ones where D works for every message but isn't E's inverse"""
+    rng = random.Random(0)
+    drawn = list(validInputs(8))
+
+    for _ in range(20):
+        P, Q = rng.sample(PRIMES, 2)
+        totient = (P-1)*(Q-1)
+        E = rng.choice([e for e in range(3, 30) if math.gcd(e, totient) == 1])
+        D = pow(E, -1, totient)
+        lcm = math.lcm(P-1, Q-1)
+        drawn += [(P, Q, E, D), (P, Q, E, D + 1), (P, Q, E, D + lcm if D + lcm < totient else D + totient)]
+
+    return drawn + [(4, 7, 5, 5), (7, 7, 5, 5), (3, 5, 3, 1)]
+
+
+def _roundTrips(P, Q, E, D):
+    modulus = P*Q
+    return all(pow(pow(m, E, modulus), D, modulus) == m for m in range(modulus))
+
+
+INPUTS = _inputs()
+
+
+@pytest.mark.parametrize("mode", ["lemma", "crt"])
+def test_matchesBruteForce(mode):
+    answers = []
+
+    for P, Q, E, D in INPUTS:
+        expected = intValid(P, Q, E, D) and _roundTrips(P, Q, E, D)
+        answers.append(expected)
+
+        assert intAllMessages(P, Q, E, D, mode=mode) == expected, (P, Q, E, D)
+        if mode == "crt":
+            assert intAllMessages(P, Q, E, D, mode=mode, chunkSize=3) == expected, (P, Q, E, D)
+
+    assert any(answers) and not all(answers)
+
+
+def test_exhaustiveMatchesOnToyPrimes():
+    for inp in validInputs(8) + [(3, 5, 3, 4), (4, 7, 5, 5)]:
+        assert intAllMessages(*inp, mode="exhaustive") == intAllMessages(*inp, mode="lemma"), inp
+
+
+def test_scalesPastToyPrimes():
+    # P*Q messages would be a million POW terms, the CRT check only needs P+Q
+    P, Q, E = 1009, 1013, 5
+    D = pow(E, -1, (P-1)*(Q-1))
+
+    assert intAllMessages(P, Q, E, D, mode="crt")
+    assert intAllMessages(P, Q, E, D, mode="lemma")
+    assert not intAllMessages(P, Q, E, D + 2, mode="crt")
+
+
+def test_unknownMode():
+    with pytest.raises(ValueError):
+        intAllMessages(3, 5, 3, 3, mode="pow")
+    assert set(MODES) == {"lemma", "crt", "exhaustive"}
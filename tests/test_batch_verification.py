@@ -0,0 +1,48 @@
+"""
+Batched verification asserts every input behind its own guard in one solver, so each
+input has to get the answer it gets alone, whatever else is in its batch
+"""
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfigurationBatch as intValidBatch
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfigurationBatch as bvValidBatch
+
+from conftest import BOUND
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND)])
+def test_matchesOneShot(ty, N, inputs):
+    if ty == "Integer":
+        expected = [intValid(*inp) for inp in inputs]
+        validBatch = intValidBatch
+    else:
+        expected = [bvValid(*inp, N) for inp in inputs]
+        validBatch = lambda batch: bvValidBatch(batch, N)
+
+    for batchSize in (1, 7, 100):
+        answers = []
+        for first in range(0, len(inputs), batchSize):
+            answers += validBatch(inputs[first:first + batchSize])
+
+        assert answers == expected, batchSize
+
+
+def test_batchedRace():
+    expected = [(inp, d) for _, inp, d, _ in runVerificationRace("Integer", 5, None)]
+
+    for numOfWorkers, batchSize in [(1, 16), (2, 50)]:
+        counts = {}
+        rows = [(inp, d) for _, inp, d, _ in runVerificationRace("Integer", 5, None, numOfWorkers, chunkSize=200,
+                                                                batchSize=batchSize, counts=counts)]
+
+        assert rows == expected
+        assert counts["solver"] == 5**4
+
+
+def test_batchedRaceRefusesPerInputFeatures():
+    with pytest.raises(ValueError):
+        list(runVerificationRace("Integer", 3, None, batchSize=4, prefilter=True))
@@ -0,0 +1,57 @@
+"""
+Benchmark summaries have to flag exactly the metrics that slowed down past the threshold
+"""
+
+import pytest
+
+from src.Experiment.Benchmark_Suite import (compareSummaries, decryptionWorkload, loadSummary, runBenchmark,
+                                            saveSummary, summarize)
+
+
+def _summary(results, workload=None):
+    return {"workload": workload or decryptionWorkload(10), "results": results}
+
+
+def test_summarize():
+    summary = summarize([5.0, 1.0, 3.0, 2.0, 4.0])
+
+    assert summary["samples"] == 5
+    assert summary["median"] == 3.0
+    assert summary["mad"] == 1.0
+    assert summary["p95"] == pytest.approx(4.8)
+    assert (summary["min"], summary["max"], summary["mean"]) == (1.0, 5.0, 3.0)
+
+
+def test_thresholds():
+    baseline = _summary({"Python": {"median": 1.0, "p95": 2.0},
+                         "Integer": {"median": 1.0, "p95": 2.0},
+                         "Bitvector": {"median": 0.0, "p95": 2.0}})
+    current = _summary({"Python": {"median": 1.1, "p95": 2.2},
+                        "Integer": {"median": 1.11, "p95": 1.0},
+                        "Bitvector": {"median": 5.0, "p95": 2.21},
+                        "Extra": {"median": 9.0, "p95": 9.0}})
+
+    regressions = compareSummaries(baseline, current, threshold=0.10)
+
+    # Exactly the threshold, getting faster, a zero baseline and a new backend are not regressions
+    assert [(backend, metric) for backend, metric, *_ in regressions] == [("Integer", "median"), ("Bitvector", "p95")]
+    assert regressions[0][2:4] == (1.0, 1.11)
+    assert regressions[0][4] == pytest.approx(0.11)
+
+    assert compareSummaries(baseline, current, threshold=0.2) == []
+    assert [metric for _, metric, *_ in compareSummaries(baseline, current, 0.0, metrics=("p95",))] == ["p95", "p95"]
+
+
+def test_differentWorkloads():
+    with pytest.raises(ValueError):
+        compareSummaries(_summary({}, decryptionWorkload(10)), _summary({}, decryptionWorkload(20)))
+
+
+def test_roundTrip(tmp_path):
+    summary = runBenchmark(decryptionWorkload(3), backends=("Python", "Integer"), warmup=1, repeats=2)
+    path = str(tmp_path / "summary.json")
+    saveSummary(summary, path)
+
+    assert loadSummary(path)["results"] == summary["results"]
+    assert summary["results"]["Integer"]["samples"] == 6
+    assert compareSummaries(summary, loadSummary(path)) == []
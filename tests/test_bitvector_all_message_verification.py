@@ -0,0 +1,52 @@
+"""
+The Bitvector round-trip check has to answer like the Integer one, in both of its modes
+and at fixed or auto widths
+"""
+
+import cvc5
+import pytest
+
+from src.Bitvector.RSA_All_Message_Verification import MODES, allMessageDecryptEncryptVerification as bvAllMessages
+from src.Bitvector.RSA_Valid_Configuration import powerMod
+from src.Integer.RSA_All_Message_Verification import allMessageDecryptEncryptVerification as intAllMessages
+
+from conftest import validInputs
+from test_all_message_verification import INPUTS
+
+
+# Fixed widths and the symbolic circuit get slow past toy primes, so only crt at auto widths sees every input
+TOY = validInputs(8) + [(3, 5, 3, 4), (5, 7, 5, 11), (4, 7, 5, 5), (7, 7, 5, 5)]
+
+
+def test_crtMatchesInteger():
+    for inp in INPUTS:
+        assert bvAllMessages(*inp, "auto") == intAllMessages(*inp, mode="lemma"), inp
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("N", ["auto", 8])
+def test_matchesIntegerOnToyPrimes(mode, N):
+    answers = [intAllMessages(*inp, mode="lemma") for inp in TOY]
+
+    assert [bvAllMessages(*inp, N, mode=mode) for inp in TOY] == answers
+    assert any(answers) and not all(answers)
+
+
+def test_crtLargerPrimes():
+    P, Q, E = 251, 257, 7
+    D = pow(E, -1, (P-1)*(Q-1))
+
+    assert bvAllMessages(P, Q, E, D, "auto")
+    assert not bvAllMessages(P, Q, E, D + 2, "auto")
+
+
+@pytest.mark.parametrize("base, exponent, modulus", [(0, 5, 7), (3, 0, 7), (6, 13, 7), (250, 65537, 251),
+                                                     (12345, 54321, 65521)])
+def test_powerMod(base, exponent, modulus):
+    tm = cvc5.TermManager()
+    solver = cvc5.Solver(tm)
+    N = modulus.bit_length()
+
+    term = powerMod(tm, tm.mkBitVector(N, base % modulus), exponent, tm.mkBitVector(N, modulus))
+
+    assert int(solver.simplify(term).getBitVectorValue(10)) == pow(base, exponent, modulus)
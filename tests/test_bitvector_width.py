@@ -0,0 +1,75 @@
+"""
+"auto" bitwidths size every operand to its value and widen multiplications, so Bitvector
+answers have to be the Integer ones however big the values are
+"""
+
+import math
+import random
+
+import pytest
+
+from src.Bitvector.Bitvector_Width import AUTO, bitWidth
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfigurationBatch as bvValidBatch
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+
+
+def _largerInputs():
+    """Inputs whose products overflow any one width that fits the operands, valid or one off"""
+    rng = random.Random(0)
+    primes = [61, 127, 251, 257, 509, 1021]
+    drawn = []
+
+    for _ in range(20):
+        P, Q = rng.sample(primes, 2)
+        totient = (P-1)*(Q-1)
+        E = rng.choice([e for e in (3, 5, 7, 11, 13, 17) if math.gcd(e, totient) == 1])
+        D = pow(E, -1, totient) + rng.choice([0, 0, 1, totient])
+        drawn.append((P, Q, E, D))
+
+    return drawn + [(61, 63, 7, 43), (1021, 1021, 7, 3), (1, 127, 5, 101)]
+
+
+def test_bitWidth():
+    assert [bitWidth(v) for v in (0, 1, 2, 3, 4, 255, 256)] == [2, 2, 2, 2, 3, 8, 9]
+    assert bitWidth(5, 300, 17) == 9
+
+
+def test_autoMatchesInteger(inputs):
+    expected = [intValid(*inp) for inp in inputs]
+    verifier = BvVerifier(AUTO)
+
+    assert [bvValid(*inp, AUTO) for inp in inputs] == expected
+    assert [verifier.isValidRSAConfiguration(*inp) for inp in inputs] == expected
+    assert bvValidBatch(inputs, AUTO) == expected
+
+
+def test_autoMatchesIntegerOnLargerValues():
+    inputs = _largerInputs()
+    expected = [intValid(*inp) for inp in inputs]
+    verifier = BvVerifier(AUTO)
+
+    assert any(expected) and not all(expected)
+    assert [bvValid(*inp, AUTO) for inp in inputs] == expected
+    assert [verifier.isValidRSAConfiguration(*inp) for inp in inputs] == expected
+
+
+def test_fixedWidthRefusesWhatDoesntFit():
+    with pytest.raises(AssertionError):
+        bvValid(127, 251, 7, 3, 8)
+
+
+@pytest.mark.parametrize("P, Q, E, lower", [(11, 13, 23, 0), (251, 257, 7, 1000), (4093, 1021, 7, 10**6),
+                                            (4093, 1021, 5, 10**6)])
+def test_autoDecryption(P, Q, E, lower):
+    D = bvFindDecrypt(P, Q, E, lower, AUTO)
+
+    assert (D is None) == (intFindDecrypt(P, Q, E, lower) is None)
+    assert (D is None) == (math.gcd(E, (P-1)*(Q-1)) != 1)
+
+    if D is not None:
+        D = D.getIntegerValue()
+        assert D > lower and (E*D) % ((P-1)*(Q-1)) == 1
@@ -0,0 +1,88 @@
+"""
+Budgets have to turn cvc5 giving up into SolverUnknown, and a ladder has to try its
+budgets in order until one answers
+"""
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.Budget import Budget, SolverUnknown, retryWithBudgets, unknownAnswer
+from src.Solver.Solver_Pool import SolverTimeout
+
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+
+
+def _ladder(answers):
+    """A call that gives up until its attempt has an answer, and the (budget, profile) of every attempt"""
+    attempts = []
+
+    def call(budget, profile):
+        attempts.append((budget, profile))
+        answer = answers[len(attempts) - 1]
+
+        if isinstance(answer, SolverUnknown):
+            raise answer
+        return answer
+
+    return call, attempts
+
+
+def test_escalatesInOrder():
+    budgets = [Budget(10), Budget(100, 1000), Budget(1000, profile="nl-cov"), Budget(10000)]
+    call, attempts = _ladder([SolverUnknown("TIMEOUT"), SolverUnknown("RESOURCEOUT"), True, False])
+
+    assert retryWithBudgets(call, budgets, "ground-qf") == (True, 3)
+    assert attempts == [(budgets[0], "ground-qf"), (budgets[1], "ground-qf"), (budgets[2], "nl-cov")]
+
+
+def test_lastUnknownIsRaised():
+    budgets = [Budget(10), Budget(100)]
+    call, attempts = _ladder([SolverUnknown("TIMEOUT"), SolverUnknown("RESOURCEOUT")])
+
+    with pytest.raises(SolverUnknown) as error:
+        retryWithBudgets(call, budgets)
+
+    assert error.value.reason == "RESOURCEOUT"
+    assert len(attempts) == 2
+
+
+def test_noBudgetsIsOneCall():
+    call, attempts = _ladder([47])
+
+    assert retryWithBudgets(call, [], "baseline") == (47, 1)
+    assert attempts == [(None, "baseline")]
+
+
+def test_unknownAnswers():
+    assert unknownAnswer(SolverUnknown("TIMEOUT")) == "timeout"
+    assert unknownAnswer(SolverTimeout("Script ran past 1s")) == "timeout"
+    assert unknownAnswer(SolverUnknown("RESOURCEOUT")) == "unknown"
+
+
+@pytest.mark.parametrize("verifier", [lambda budget: IntVerifier(budget=budget),
+                                      lambda budget: BvVerifier(16, budget=budget)])
+def test_budgetRunsOut(verifier):
+    with pytest.raises(SolverUnknown) as error:
+        verifier(Budget(resources=1)).isValidRSAConfiguration(11,13,23,47)
+
+    assert error.value.reason == "RESOURCEOUT"
+    assert verifier(Budget(60000)).isValidRSAConfiguration(11,13,23,47)
+
+
+def test_raceEscalates():
+    expected = [d for _, _, d, _ in runVerificationRace("Integer", 5, None)]
+
+    counts = {}
+    answers = [d for _, _, d, _ in runVerificationRace("Integer", 5, None, budgets=[Budget(resources=1), Budget()],
+                                                       counts=counts)]
+
+    assert answers == expected
+    assert counts["retries"] > 0 and counts["unknown"] == 0
+
+    counts = {}
+    answers = [d for _, _, d, _ in runVerificationRace("Integer", 5, None, budgets=[Budget(resources=1)],
+                                                       counts=counts)]
+
+    assert all(d == e or d == "unknown" for d, e in zip(answers, expected))
+    assert counts["unknown"] == answers.count("unknown") > 0
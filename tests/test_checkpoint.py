@@ -0,0 +1,83 @@
+"""
+A resumed run has to start right after the last committed row, with the data file cut back
+to exactly those rows
+"""
+
+import os
+
+import pytest
+
+from src.Experiment.Checkpoint import Checkpoint
+from src.Experiment.Result_Writer import StreamingResultWriter
+
+HEADER = ["type", "index"]
+
+
+def _write(checkpoint, path, rows, mode="w", chunkSize=3):
+    with StreamingResultWriter(path, HEADER, chunkSize, mode=mode, onFlush=checkpoint.commit) as writer:
+        checkpoint.track("Integer", writer.path)
+
+        for index in rows:
+            checkpoint.mark("Integer")
+            writer.write(["Integer", index])
+
+
+def _lines(path):
+    with open(path) as file:
+        return file.read().splitlines()
+
+
+def test_resumeCutsUncommittedRows(tmp_path):
+    data, path = str(tmp_path / "Integer.csv"), str(tmp_path / "checkpoint.json")
+
+    checkpoint = Checkpoint(path)
+    _write(checkpoint, data, range(7))
+
+    # A crash after the commit left rows that never made it into one, the last one torn
+    with open(data, "a") as file:
+        file.write("Integer,7\nInteger,8\nInteg")
+
+    checkpoint = Checkpoint(path)
+    assert checkpoint.rows("Integer") == 7
+    assert checkpoint.resume("Integer", data) == 7
+    assert _lines(data) == ["type,index"] + ["Integer," + str(i) for i in range(7)]
+
+    _write(checkpoint, data, range(7, 12), mode="a")
+
+    assert Checkpoint(path).rows("Integer") == 12
+    assert _lines(data) == ["type,index"] + ["Integer," + str(i) for i in range(12)]
+
+
+def test_resumeWithoutCommit(tmp_path):
+    data, path = str(tmp_path / "Integer.csv"), str(tmp_path / "checkpoint.json")
+
+    with open(data, "w") as file:
+        file.write("rows of an earlier run\n")
+
+    assert Checkpoint(path).resume("Integer", data) == 0
+    assert _lines(data) == []
+    assert Checkpoint(path).resume("Bitvector", str(tmp_path / "missing.csv")) == 0
+
+
+def test_resumeLostRows(tmp_path):
+    data, path = str(tmp_path / "Integer.csv"), str(tmp_path / "checkpoint.json")
+    _write(Checkpoint(path), data, range(5))
+
+    with open(data, "r+") as file:
+        file.truncate(10)
+
+    with pytest.raises(ValueError):
+        Checkpoint(path).resume("Integer", data)
+
+    os.remove(data)
+
+    with pytest.raises(ValueError):
+        Checkpoint(path).resume("Integer", data)
+
+
+def test_reset(tmp_path):
+    data, path = str(tmp_path / "Integer.csv"), str(tmp_path / "checkpoint.json")
+    _write(Checkpoint(path), data, range(5))
+
+    assert Checkpoint(path).rows("Integer") == 5
+    assert Checkpoint(path, reset=True).rows("Integer") == 0
@@ -0,0 +1,38 @@
+"""
+Enumerating decryption exponents has to give every exponent in the range exactly once,
+the ones a brute force scan finds, in any order
+"""
+
+import itertools
+
+import pytest
+
+from src.Integer.RSA_Finding_Valid_Decryption import enumerateDecryptionExponents as intEnumerate
+from src.Bitvector.RSA_Finding_Valid_Decryption import enumerateDecryptionExponents as bvEnumerate
+
+CASES = [(11, 13, 23, 0, 2000), (11, 13, 23, 48, 407), (17, 19, 5, 100, 1500), (11, 13, 12, 0, 500), (3, 5, 3, 0, 2)]
+
+
+def _bruteForce(P, Q, E, lower, upper):
+    totient = (P-1)*(Q-1)
+    return [d for d in range(max(lower, 2), upper) if (E*d) % totient == 1]
+
+
+@pytest.mark.parametrize("P, Q, E, lower, upper", CASES)
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", "auto"), ("Bitvector", 16)])
+def test_matchesBruteForce(ty, N, P, Q, E, lower, upper):
+    if ty == "Integer":
+        found = list(intEnumerate(P, Q, E, lower, upper))
+    else:
+        found = list(bvEnumerate(P, Q, E, lower, upper, N))
+
+    assert sorted(found) == _bruteForce(P, Q, E, lower, upper)
+    assert len(set(found)) == len(found)
+
+
+def test_lazy():
+    # Taking a few exponents out of a huge range doesn't enumerate the rest
+    first = list(itertools.islice(intEnumerate(11, 13, 23, 0, 2**31 - 1), 3))
+
+    assert len(first) == 3
+    assert all((23*d) % 120 == 1 for d in first)
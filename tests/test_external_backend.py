@@ -0,0 +1,74 @@
+"""
+Queries exported as SMT-LIB2 and run on an external solver have to answer like the same
+queries asked of cvc5's bindings in process
+"""
+
+import os
+import sys
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.External_Backend import ExternalVerifier
+from src.Solver.Solver_Pool import SolverPool
+
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+
+COMMAND = (sys.executable, os.path.join(os.path.dirname(__file__), "smtlib_solver.py"))
+
+CASES = [(11,13,23,47), (11,13,23,48), (4,13,23,47), (13,13,7,7), (17,19,5,173), (2,3,5,5), (3,5,3,3)]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with SolverPool(2, COMMAND, timeout=30) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", 16), ("Bitvector", "auto")])
+@pytest.mark.parametrize("primality", ["trial", "sieve", "pratt"])
+def test_verifyMatchesBindings(pool, ty, N, primality):
+    external = ExternalVerifier(pool, ty, N, primality=primality)
+
+    for case in CASES:
+        if ty == "Integer":
+            expected = intValid(*case, primality=primality)
+        else:
+            expected = bvValid(*case, N, primality=primality)
+
+        assert external.isValidRSAConfiguration(*case) == expected, case
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", 16), ("Bitvector", "auto")])
+def test_decryptMatchesBindings(pool, ty, N):
+    external = ExternalVerifier(pool, ty, N)
+
+    for P, Q, E, lower in [(11,13,23,0), (11,13,23,100), (17,19,5,200), (11,13,12,0)]:
+        if ty == "Integer":
+            value = intFindDecrypt(P,Q,E, lower)
+        else:
+            value = bvFindDecrypt(P,Q,E, lower, N)
+
+        expected = None if value is None else value.getIntegerValue()
+        assert external.findDecryptionExponent(P,Q,E, lower) == expected, (P,Q,E, lower)
+
+
+def test_raceMatchesBindings():
+    external = [d for _, _, d, _ in runVerificationRace("Integer", 5, None, numOfWorkers=2, chunkSize=100,
+                                                        solverCommand=COMMAND, solverTimeout=30)]
+    inProcess = [d for _, _, d, _ in runVerificationRace("Integer", 5, None)]
+
+    assert external == inProcess
+
+
+@pytest.mark.parametrize("command", [("/nonexistent/solver",), (sys.executable, "-c", "print('garbage')")])
+def test_raceRecordsSolverErrors(command):
+    counts = {}
+    answers = [d for _, _, d, _ in runVerificationRace("Integer", 3, None, solverCommand=command, solverTimeout=5,
+                                                       counts=counts)]
+
+    assert answers == ["error"] * 3**4
+    assert counts["errors"] == 3**4
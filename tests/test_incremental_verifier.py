@@ -0,0 +1,43 @@
+"""
+IncrementalVerifier reuses one solver across inputs with push/pop, so every answer has to
+be what a fresh one-shot isValidRSAConfiguration gives
+"""
+
+import pytest
+
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+
+from conftest import BOUND, validInputs
+
+
+def _oneShot(ty, N):
+    if ty == "Integer":
+        return lambda P,Q,E,D: intValid(P,Q,E,D)
+    return lambda P,Q,E,D: bvValid(P,Q,E,D, N)
+
+
+def _incremental(ty, N):
+    return IntVerifier() if ty == "Integer" else BvVerifier(N)
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND)])
+def test_matchesOneShot(ty, N, inputs):
+    valid = _oneShot(ty, N)
+    verifier = _incremental(ty, N)
+
+    expected = [valid(*inp) for inp in inputs]
+
+    assert [verifier.isValidRSAConfiguration(*inp) for inp in inputs] == expected
+    assert all(valid(*inp) for inp in validInputs(BOUND))
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND)])
+def test_scopesDontLeak(ty, N):
+    # A valid input right after an invalid one with the same values must not see its bindings
+    verifier = _incremental(ty, N)
+    sequence = [(3,5,3,3), (3,5,3,4), (3,5,3,3), (5,3,3,3), (4,5,3,3), (3,5,3,3)]
+
+    assert [verifier.isValidRSAConfiguration(*inp) for inp in sequence] == [True, False, True, True, False, True]
@@ -0,0 +1,40 @@
+"""
+Sharding the sweep across workers must not change which inputs are run, in which order,
+or what they answer
+"""
+
+import pytest
+
+from src.Experiment.Parallel_Runner import indexToInput, runVerificationRace
+
+BOUND = 5
+
+
+def test_indexToInput():
+    order = [(i, j, k, l) for i in range(BOUND) for j in range(BOUND) for k in range(BOUND) for l in range(BOUND)]
+
+    assert [indexToInput(index, BOUND) for index in range(BOUND**4)] == order
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", 8)])
+def test_workersMatchSerial(ty, N):
+    serial = [(inp, d) for _, inp, d, _ in runVerificationRace(ty, BOUND, N, incremental=False)]
+
+    for numOfWorkers, chunkSize, incremental in [(1, 1000, True), (2, 37, True), (3, 100, False)]:
+        counts = {}
+        rows = [(inp, d) for _, inp, d, _ in runVerificationRace(ty, BOUND, N, numOfWorkers, chunkSize, incremental,
+                                                                counts=counts)]
+
+        assert rows == serial, (numOfWorkers, chunkSize, incremental)
+        assert counts["solver"] == BOUND**4
+
+
+def test_skipAndIndices():
+    serial = {inp: d for _, inp, d, _ in runVerificationRace("Integer", BOUND, None)}
+    indices = [600, 3, 17, 255, 256]
+
+    picked = [(inp, d) for _, inp, d, _ in runVerificationRace("Integer", BOUND, None, 2, 2, indices=indices)]
+    assert picked == [(indexToInput(index, BOUND), serial[indexToInput(index, BOUND)]) for index in indices]
+
+    skipped = [inp for _, inp, _, _ in runVerificationRace("Integer", BOUND, None, 2, 50, skip=lambda inp: inp[0] != 3)]
+    assert skipped == [inp for inp in serial if inp[0] == 3]
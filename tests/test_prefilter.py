@@ -0,0 +1,48 @@
+"""
+The prefilter only answers inputs the solver would reject anyway, so a prefiltered race
+has to answer every input like the solver does
+"""
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.Prefilter import Prefilter, isTriviallyInvalid
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+
+from conftest import BOUND
+
+LARGER = [(61, 127, 7, 4483), (61, 121, 7, 1), (91, 127, 5, 757), (2**31 - 1, 2**13 - 1, 5, 7), (4, 4, 3, 3)]
+
+
+def test_neverRejectsValid(inputs):
+    for inp in inputs + LARGER:
+        if isTriviallyInvalid(*inp):
+            assert not intValid(*inp), inp
+
+
+def test_matchesSolver(inputs):
+    prefilter = Prefilter(lambda P,Q,E,D, **kwargs: intValid(P,Q,E,D))
+
+    assert [prefilter(*inp) for inp in inputs] == [intValid(*inp) for inp in inputs]
+
+    counts = prefilter.counts()
+    assert counts["answered"] + counts["solver"] == len(inputs)
+    assert counts["answered"] > counts["solver"]
+
+
+def test_primalityLimit():
+    assert isTriviallyInvalid(91, 127, 5, 757)
+    assert not isTriviallyInvalid(91, 127, 5, 757, primalityLimit=64)
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND)])
+def test_prefilteredRace(ty, N):
+    expected = [(inp, d) for _, inp, d, _ in runVerificationRace(ty, 6, N)]
+
+    counts = {}
+    rows = [(inp, d) for _, inp, d, _ in runVerificationRace(ty, 6, N, numOfWorkers=2, chunkSize=100, prefilter=True,
+                                                            counts=counts)]
+
+    assert rows == expected
+    assert counts["answered"] + counts["solver"] == 6**4
+    assert counts["answered"] == sum(isTriviallyInvalid(*inp) for inp, _ in expected)
@@ -0,0 +1,92 @@
+"""
+The sieve and pratt primality encodings only change how primality is asserted, so they
+have to answer like trial division, and the witnesses they are built from have to be right
+"""
+
+import math
+
+import pytest
+
+from src.Primes.Prime_Window import firstPrimes
+from src.Primes.Primality_Certificate import isProbablePrime, prattCertificate, smallestDivisor, trialPrimes
+from src.Integer.RSA_Valid_Configuration import PRIMALITY_MODES
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+
+from conftest import BOUND
+
+# Primes, squares of primes, 2 and composites around them, each with the D that would make it valid
+VALUES = [2, 3, 4, 9, 15, 25, 49, 53, 91, 97, 121, 169, 193, 221, 256, 257]
+LARGER = [(P, Q, 5, pow(5, -1, (P-1)*(Q-1))) for P in VALUES for Q in (7, 11, 97)
+          if P != Q and math.gcd(5, (P-1)*(Q-1)) == 1]
+
+
+def _verifiers(ty, N, primality):
+    if ty == "Integer":
+        return (lambda P,Q,E,D: intValid(P,Q,E,D, primality=primality),
+                IntVerifier(primality=primality).isValidRSAConfiguration)
+
+    return (lambda P,Q,E,D: bvValid(P,Q,E,D, N, primality=primality),
+            BvVerifier(N, primality=primality).isValidRSAConfiguration)
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND)])
+def test_modesMatchTrial(ty, N, inputs):
+    oneShot, _ = _verifiers(ty, N, "trial")
+    expected = [oneShot(*inp) for inp in inputs]
+
+    for primality in PRIMALITY_MODES[1:]:
+        oneShot, incremental = _verifiers(ty, N, primality)
+
+        assert [oneShot(*inp) for inp in inputs] == expected, primality
+        assert [incremental(*inp) for inp in inputs] == expected, primality
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", "auto")])
+def test_modesMatchTrialOnLargerValues(ty, N):
+    oneShot, _ = _verifiers(ty, N, "trial")
+    expected = [oneShot(*inp) for inp in LARGER]
+
+    assert any(expected) and not all(expected)
+
+    for primality in PRIMALITY_MODES[1:]:
+        oneShot, incremental = _verifiers(ty, N, primality)
+
+        assert [oneShot(*inp) for inp in LARGER] == expected, primality
+        assert [incremental(*inp) for inp in LARGER] == expected, primality
+
+
+def test_witnesses():
+    primes = set(firstPrimes(2000))
+
+    for n in range(2, max(primes)):
+        assert isProbablePrime(n) == (n in primes), n
+
+        limit = math.ceil(n ** 0.5)
+        assert trialPrimes(n) == [p for p in range(2, limit + 1) if p in primes], n
+
+        divisors = [d for d in range(2, limit + 1) if n % d == 0]
+        assert smallestDivisor(n) == (divisors[0] if divisors else None), n
+
+    for p in (3, 5, 7, 257, 65537, 2**61 - 1):
+        _checkCertificate(prattCertificate(p))
+
+
+def _checkCertificate(certificate):
+    n, a, factors = certificate
+    qs = [factor if factor == 2 else factor[0] for factor in factors]
+
+    assert pow(a, n - 1, n) == 1
+    assert all(pow(a, (n - 1) // q, n) != 1 for q in qs)
+
+    m = n - 1
+    for q in qs:
+        while m % q == 0:
+            m //= q
+    assert m == 1
+
+    for factor in factors:
+        if factor != 2:
+            _checkCertificate(factor)
@@ -0,0 +1,72 @@
+"""
+The list and array paths of the Python baseline have to give the scalar function's answer
+for every input, including numpy inputs like the prime cache's
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.Primes.Prime_Cache import loadPrimes
+from src.Python.RSA_Finding_Valid_Decryption import (INT64_PRIME_LIMIT, findDecryptionExponent,
+                                                     findDecryptionExponentArray, findDecryptionExponents)
+
+WINDOWS = 300
+
+
+@pytest.fixture(scope="module")
+def triples(tmp_path_factory):
+    primes = loadPrimes(WINDOWS + 2, str(tmp_path_factory.mktemp("primes") / "primes.npy"))
+    assert primes.dtype == np.uint32
+
+    # Consecutive windows straight from the cache, so P, Q and E stay numpy.uint32
+    return [(P, Q, E) for P, Q, E in zip(primes, primes[1:], primes[2:])
+            if math.gcd(int(E), (int(P) - 1) * (int(Q) - 1)) == 1]
+
+
+def test_numpyScalars(triples):
+    P, Q, E = triples[-1]
+    assert isinstance(P, np.uint32)
+
+    expected = findDecryptionExponent(int(P), int(Q), int(E), 12345)
+
+    assert findDecryptionExponent(P, Q, E, np.uint32(12345)) == expected
+    assert (int(E) * expected) % ((int(P) - 1) * (int(Q) - 1)) == 1
+
+
+@pytest.mark.parametrize("lower", [0, 7, 10**6, 2**70])
+def test_batchesMatchScalar(triples, lower):
+    Ps, Qs, Es = (list(column) for column in zip(*triples))
+    expected = [findDecryptionExponent(int(P), int(Q), int(E), lower) for P, Q, E in triples]
+
+    assert findDecryptionExponents(Ps, Qs, Es, lower) == expected
+    assert list(findDecryptionExponentArray(Ps, Qs, Es, lower)) == expected
+
+
+def test_batchesMatchScalarPerInputBounds(triples):
+    Ps, Qs, Es = (np.array(column) for column in zip(*triples))
+    lowers = np.arange(len(triples)) * 1000
+
+    expected = [findDecryptionExponent(int(P), int(Q), int(E), int(lb)) for P, Q, E, lb in zip(Ps, Qs, Es, lowers)]
+
+    assert findDecryptionExponents(Ps, Qs, Es, lowers) == expected
+    assert list(findDecryptionExponentArray(Ps, Qs, Es, lowers)) == expected
+
+
+def test_objectFallback():
+    # Primes past INT64_PRIME_LIMIT make the array path use python ints
+    Ps, Qs, Es = [2**31 - 1, 11], [2**61 - 1, 13], [65537, 23]
+
+    result = findDecryptionExponentArray(Ps, Qs, Es, 10)
+
+    assert max(Qs) > INT64_PRIME_LIMIT and result.dtype == object
+    assert list(result) == [findDecryptionExponent(P, Q, E, 10) for P, Q, E in zip(Ps, Qs, Es)]
+
+
+def test_unsat():
+    with pytest.raises(AssertionError):
+        findDecryptionExponents([11, 11], [13, 11], [23, 23])
+
+    with pytest.raises(AssertionError):
+        findDecryptionExponentArray([11, 11], [13, 13], [23, 3])
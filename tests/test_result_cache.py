@@ -0,0 +1,86 @@
+"""
+Memoized answers have to be the answers the solver gives, across processes and runs, and
+only ever be reused for the same query, theory, width and options
+"""
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.Result_Cache import MISSING, ResultCache, memoize
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+
+BOUND = 5
+
+
+class _Counting:
+    """Wraps a function and counts how often it really runs"""
+
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, *inputs, timer=None):
+        self.calls += 1
+        return self.function(*inputs)
+
+
+def test_memoizeMatchesSolver(tmp_path, inputs):
+    path = str(tmp_path / "results.sqlite")
+    valid = _Counting(intValid)
+
+    with ResultCache(path) as cache:
+        call = memoize(valid, cache, "verify", "Integer")
+
+        expected = [intValid(*inp) for inp in inputs]
+        assert [call(*inp) for inp in inputs] == expected
+        assert valid.calls == len(set(inputs))
+
+    # A new process only has the file
+    with ResultCache(path) as cache:
+        call = memoize(valid, cache, "verify", "Integer")
+        calls = valid.calls
+
+        assert [call(*inp) for inp in inputs] == expected
+        assert valid.calls == calls
+
+        call(*inputs[0], bypass=True)
+        assert valid.calls == calls + 1
+
+
+def test_keysKeepSettingsApart():
+    with ResultCache() as cache:
+        key = cache.key("verify", "Bitvector", 8, (3, 5, 3, 3))
+        cache.put(key, True)
+
+        assert cache.get(key) is True
+        assert cache.get(cache.key("verify", "Bitvector", 16, (3, 5, 3, 3))) is MISSING
+        assert cache.get(cache.key("verify", "Integer", None, (3, 5, 3, 3))) is MISSING
+        assert cache.get(cache.key("verify", "Bitvector", 8, (3, 5, 3, 3), {"primality": "pratt"})) is MISSING
+
+        # None and False are answers too
+        cache.put(cache.key("decrypt", "Integer", None, (11, 13, 12, 0)), None)
+        assert cache.get(cache.key("decrypt", "Integer", None, (11, 13, 12, 0))) is None
+
+
+def test_memoizedDecryption(tmp_path):
+    with ResultCache(str(tmp_path / "results.sqlite")) as cache:
+        find = memoize(lambda P,Q,E, lower, timer=None: intFindDecrypt(P,Q,E, lower), cache, "decrypt", "Integer")
+
+        for P, Q, E, lower in [(11, 13, 23, 0), (11, 13, 23, 1000), (11, 13, 12, 0)]:
+            expected = intFindDecrypt(P,Q,E, lower)
+            expected = None if expected is None else expected.getIntegerValue()
+
+            assert find(P,Q,E, lower) == expected
+            assert find(P,Q,E, lower) == expected
+
+
+def test_cachedRace(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    expected = [(inp, d) for _, inp, d, _ in runVerificationRace("Bitvector", BOUND, 8)]
+
+    for numOfWorkers, bypass in [(2, False), (1, False), (2, True)]:
+        rows = [(inp, d) for _, inp, d, _ in runVerificationRace("Bitvector", BOUND, 8, numOfWorkers, chunkSize=50,
+                                                                resultCache=path, bypass=bypass)]
+        assert rows == expected, (numOfWorkers, bypass)
+
+    with ResultCache(path) as cache:
+        assert all(cache.get(cache.key("verify", "Bitvector", 8, inp)) == d for inp, d in expected)
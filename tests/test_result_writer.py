@@ -0,0 +1,67 @@
+"""
+StreamingResultWriter has to keep every chunk's rows, whatever types the cells of the
+first chunk happened to have
+"""
+
+import csv
+
+import pytest
+
+from src.Experiment.Result_Writer import StreamingResultWriter
+from src.Solver.Instrumentation import COLUMNS
+
+HEADER = ["type", "clock_time", "P", "Q", "E", "D", "Answers", "source"] + COLUMNS
+
+# A solver row, then rows a budget, an external solver and a pruned mirror write later on
+ROWS = [["Integer", 0.5, 11, 13, 23, 47, True, "solver", 1, 2, 3, 4, "{}"],
+        ["Integer", 0.25, 11, 13, 23, 48, "timeout", "solver", 5, 6, 7, 8, "{}"],
+        ["Integer", 0.0, 0, 0, 0, 0, False, "pruned", None, None, None, None, None],
+        ["Integer", 0.125, 13, 11, 23, 47, "error", "mirror", None, None, None, None, None],
+        ["Integer", 0.75, 11, 13, 23, 167, "unknown", "solver", 9, 10, 11, 12, '{"a": 1}']]
+
+
+def test_arrowMixedChunks(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "rows.arrow")
+
+    with StreamingResultWriter(path, HEADER, chunkSize=1, format="arrow") as writer:
+        writer.writeRows(ROWS)
+
+    with pa.OSFile(path) as file:
+        table = pa.ipc.open_stream(file).read_all()
+
+    assert table.num_rows == len(ROWS)
+    assert table.schema.field("Answers").type == pa.string()
+    assert table.schema.field("setup_ns").type == pa.int64()
+    assert table.column("Answers").to_pylist() == ["True", "timeout", "False", "error", "unknown"]
+    assert table.column("setup_ns").to_pylist() == [1, 5, None, None, 9]
+    assert table.column("D").to_pylist() == [47, 48, 0, 47, 167]
+
+
+def test_arrowAppendStartsPart(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = str(tmp_path / "rows.arrow")
+
+    with StreamingResultWriter(path, HEADER, format="arrow") as writer:
+        writer.writeRows(ROWS[:2])
+    with StreamingResultWriter(path, HEADER, format="arrow", mode="a") as writer:
+        writer.writeRows(ROWS[2:])
+
+    assert writer.path == str(tmp_path / "rows.1.arrow")
+
+    with pa.OSFile(writer.path) as file:
+        assert pa.ipc.open_stream(file).read_all().num_rows == len(ROWS) - 2
+
+
+def test_csvBlanks(tmp_path):
+    path = str(tmp_path / "rows.csv")
+
+    with StreamingResultWriter(path, HEADER, chunkSize=2) as writer:
+        writer.writeRows(ROWS)
+
+    with open(path, newline='') as file:
+        rows = list(csv.reader(file))
+
+    assert rows[0] == HEADER
+    assert [row[6] for row in rows[1:]] == ["True", "timeout", "False", "error", "unknown"]
+    assert rows[3][8:] == [""] * len(COLUMNS)
@@ -0,0 +1,102 @@
+"""
+Starts RSAService on a free localhost port and queries it over HTTP, fully offline
+"""
+
+import asyncio
+import json
+
+from src.Service.RSA_Service import HOST, RETRY_AFTER, RSAService
+
+
+async def _request(port, path, body=None):
+    """Sends one GET, or POST when there is a body, and returns (status, headers, body)"""
+    reader, writer = await asyncio.open_connection(HOST, port)
+
+    payload = b"" if body is None else json.dumps(body).encode()
+    method = "GET" if body is None else "POST"
+    writer.write((method + " " + path + " HTTP/1.1\r\nHost: " + HOST + "\r\nContent-Length: " + str(len(payload))
+                  + "\r\n\r\n").encode() + payload)
+    await writer.drain()
+
+    response = await reader.read()
+    writer.close()
+
+    head, _, content = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+
+    return int(lines[0].split()[1]), headers, json.loads(content)
+
+
+def _serve(test, **options):
+    """Runs test(service) against a service started on port 0"""
+    async def main():
+        async with await RSAService(**options).start(port=0) as service:
+            return await test(service)
+
+    return asyncio.run(main())
+
+
+def test_verify():
+    async def test(service):
+        valid = await _request(service.port, "/verify?P=11&Q=13&E=23&D=47")
+        invalid = await _request(service.port, "/verify", {"theory": "Bitvector", "P": 11, "Q": 13, "E": 23, "D": 48})
+        stats = await _request(service.port, "/stats")
+
+        return valid, invalid, stats
+
+    valid, invalid, stats = _serve(test, workers=1)
+
+    assert valid[0] == 200 and valid[2] == {"answer": True}
+    assert invalid[0] == 200 and invalid[2] == {"answer": False}
+    assert stats[2]["latency"]["verify"]["count"] == 2
+
+
+def test_coalescing():
+    async def test(service):
+        params = {"P": 11, "Q": 13, "E": 23, "lower": 0, "upper": 2000}
+        answers = await asyncio.gather(service.query("enumerate", params), service.query("enumerate", dict(params)))
+
+        return answers, service.stats()["counts"]
+
+    (first, second), counts = _serve(test, workers=1)
+
+    assert first == second
+    assert first[0] == 200 and first[1]["answer"][:4] == [47, 167, 287, 407]
+    assert counts["solved"] == 1 and counts["coalesced"] == 1
+
+
+def test_capacity():
+    async def test(service):
+        # A slow enumerate takes the only slot, everything else distinct is turned away until it's done
+        slow = asyncio.create_task(service.query("enumerate", {"P": 11, "Q": 13, "E": 23, "lower": 0,
+                                                               "upper": 10**6}))
+        while not service._inflight:
+            await asyncio.sleep(0)
+
+        rejected = await _request(service.port, "/verify?P=11&Q=13&E=23&D=47")
+        answered = await slow
+        accepted = await _request(service.port, "/verify?P=11&Q=13&E=23&D=47")
+
+        return rejected, answered, accepted, service.stats()["counts"]
+
+    rejected, answered, accepted, counts = _serve(test, workers=1, queueSize=0, maxExponents=100)
+
+    assert rejected[0] == 503 and rejected[1]["Retry-After"] == str(RETRY_AFTER)
+    assert answered[0] == 200 and len(answered[1]["answer"]) == 100 and not answered[1]["complete"]
+    assert accepted[0] == 200 and accepted[2] == {"answer": True}
+    assert counts["rejected"] == 1
+
+
+def test_malformedParams():
+    async def test(service):
+        return [await _request(service.port, "/verify?P=eleven&Q=13&E=23&D=47"),
+                await _request(service.port, "/verify?P=11&Q=13&E=23"),
+                await _request(service.port, "/verify?theory=Real&P=11&Q=13&E=23&D=47"),
+                await _request(service.port, "/verify", {"P": 11, "Q": 13, "E": 23, "D": 47, "profile": ["x"]}),
+                await _request(service.port, "/verify?theory=Bitvector&N=4&P=11&Q=13&E=23&D=47")]
+
+    responses = _serve(test, workers=1)
+
+    for status, _, body in responses:
+        assert status == 400 and "error" in body
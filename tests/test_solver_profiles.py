@@ -0,0 +1,62 @@
+"""
+Profiles only change how cvc5 searches, so every one of them has to answer like the baseline
+"""
+
+import json
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Solver.Solver_Profiles import AUTO_PROFILE, profilesFor, resolveProfile, sizeBucket
+
+from src.Integer.RSA_Finding_Valid_Decryption import findDecryptionExponent as intFindDecrypt
+from src.Bitvector.RSA_Finding_Valid_Decryption import findDecryptionExponent as bvFindDecrypt
+
+BOUND = 6
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", 8)])
+def test_verifyAnswersMatchBaseline(ty, N):
+    expected = [d for _, _, d, _ in runVerificationRace(ty, BOUND, N)]
+
+    for profile in profilesFor(ty)[1:]:
+        answers = [d for _, _, d, _ in runVerificationRace(ty, BOUND, N, profile=profile)]
+        assert answers == expected, profile
+
+
+@pytest.mark.parametrize("ty", ["Integer", "Bitvector"])
+def test_decryptAnswersAreValid(ty):
+    def find(P,Q,E, lower, profile):
+        if ty == "Integer":
+            value = intFindDecrypt(P,Q,E, lower, profile=profile)
+        else:
+            # "auto" widths don't wrap, so D inverts E over the integers too
+            value = bvFindDecrypt(P,Q,E, lower, "auto", profile=profile)
+
+        return None if value is None else value.getIntegerValue()
+
+    # Any D past the bound that inverts E is an answer, so profiles may find different ones
+    for P, Q, E, lower in [(11,13,23,0), (11,13,23,100), (17,19,5,200), (11,13,12,0)]:
+        expected = find(P,Q,E, lower, None)
+
+        for profile in profilesFor(ty):
+            D = find(P,Q,E, lower, profile)
+
+            assert (D is None) == (expected is None), (profile, P, Q, E, lower)
+            if D is not None:
+                assert D > max(lower, 1) and (E*D) % ((P-1)*(Q-1)) == 1, (profile, P, Q, E, lower, D)
+
+
+def test_resolveAuto(tmp_path):
+    tuning = str(tmp_path / "tuning.json")
+
+    assert resolveProfile(AUTO_PROFILE, "Integer", "verify", 11, tuning=tuning) == "baseline"
+    assert resolveProfile(None, "Integer", "verify") == "baseline"
+    assert resolveProfile("nl-cov", "Integer", "verify") == "nl-cov"
+
+    with open(tuning, "w") as file:
+        json.dump({"Integer": {"verify": {sizeBucket(11): "nl-cov", "all": "ground-qf"}}}, file)
+
+    assert resolveProfile(AUTO_PROFILE, "Integer", "verify", 11, tuning=tuning) == "nl-cov"
+    assert resolveProfile(AUTO_PROFILE, "Integer", "verify", 2**20, tuning=tuning) == "ground-qf"
+    assert resolveProfile(AUTO_PROFILE, "Integer", "decrypt", 11, tuning=tuning) == "baseline"
@@ -0,0 +1,66 @@
+"""
+Strata have to partition the sweep exactly, so population / samples weighs a sample back
+up to it, and sampling has to draw every input at most once from its own stratum
+"""
+
+import itertools
+import math
+import random
+from collections import Counter
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Experiment.Stratified_Sampling import SPREAD_BINS, runSampledRace, stratify, validityClass
+
+BOUND = 9
+
+
+def _spreadBin(inp, bound=BOUND, spreadBins=SPREAD_BINS):
+    width = 2 * (bound - 1) / spreadBins
+    squares = sum(x*x for x in inp)
+    return max(k for k in range(spreadBins) if math.ceil((k * width) ** 2) <= squares)
+
+
+def test_populationsAreExact():
+    expected = Counter((validityClass(*inp), _spreadBin(inp)) for inp in itertools.product(range(BOUND), repeat=4))
+    populations = {(stratum.validity, stratum.spreadBin): stratum.population for stratum in stratify(BOUND)}
+
+    assert populations == dict(expected)
+    assert sum(populations.values()) == BOUND**4
+
+
+def test_validityMatchesSolver():
+    for _, inp, d, _ in runVerificationRace("Integer", BOUND, None):
+        assert (validityClass(*inp) == "valid") == d, inp
+
+
+def test_drawsStayInTheirStratum():
+    rng = random.Random(0)
+
+    for stratum in stratify(BOUND):
+        drawn = stratum.sample(stratum.population + 5, rng)
+
+        assert len(drawn) == len(set(drawn)) == stratum.population
+        assert all(validityClass(*inp) == stratum.validity and _spreadBin(inp) == stratum.spreadBin for inp in drawn)
+        assert stratum.remaining() == 0 and stratum.sample(1, rng) == []
+
+
+def test_sampledRace():
+    strata = {}
+    rows = list(runSampledRace("Integer", BOUND, None, tolerance=0.2, maxSamples=300, seed=1, strata=strata))
+    inputs = [inp for _, inp, _, _, _ in rows]
+
+    assert len(rows) <= 300
+    assert len(inputs) == len(set(inputs))
+    assert all(label == validityClass(*inp) + ":" + str(_spreadBin(inp)) for _, inp, _, label, _ in rows)
+    assert all((validityClass(*inp) == "valid") == d for _, inp, d, _, _ in rows)
+
+    assert Counter(label for _, _, _, label, _ in rows) == {label: summary["samples"]
+                                                            for label, summary in strata.items() if summary["samples"]}
+
+    # Only the first round is drawn without looking at any timings
+    firstRound = sum(min(2, stratum.population) for stratum in stratify(BOUND))
+    draws = [[inp for _, inp, _, _, _ in runSampledRace("Integer", BOUND, None, initialSamples=2, maxSamples=firstRound,
+                                                        seed=seed)] for seed in (1, 1, 2)]
+
+    assert len(draws[0]) == firstRound
+    assert draws[0] == draws[1] != draws[2]
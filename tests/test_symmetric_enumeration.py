@@ -0,0 +1,42 @@
+"""
+runSymmetricRace has to give every input of the sweep exactly once, with the answer the
+full sweep gives it
+"""
+
+import pytest
+
+from src.Experiment.Parallel_Runner import runVerificationRace
+from src.Experiment.Symmetric_Enumeration import SOURCES, runSymmetricRace
+
+BOUND = 7
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", 8), ("Bitvector", "auto")])
+def test_matchesFullSweep(ty, N):
+    full = {inp: d for _, inp, d, _ in runVerificationRace(ty, BOUND, N)}
+
+    counts = {}
+    rows = list(runSymmetricRace(ty, BOUND, N, counts=counts))
+    symmetric = {inp: d for _, inp, d, _, _ in rows}
+
+    assert len(rows) == BOUND**4
+    assert symmetric == full
+
+    sources = [source for _, _, _, source, _ in rows]
+    assert set(sources) <= set(SOURCES)
+    assert sources.count("mirror") == counts["mirror"] == counts["solver"]
+    assert sources.count("pruned") == counts["pruned"]
+
+
+def test_resumeFromAnyRow():
+    rows = [(inp, d, source) for _, inp, d, source, _ in runSymmetricRace("Integer", BOUND, None)]
+
+    for start in (1, BOUND**2, 2 * BOUND**2 - 1, 1000, 1234, BOUND**4 - 1, BOUND**4):
+        counts = {}
+        resumed = [(inp, d, source) for _, inp, d, source, _ in runSymmetricRace("Integer", BOUND, None, start=start,
+                                                                                 counts=counts)]
+
+        assert resumed == rows[start:]
+
+        sources = [source for _, _, source in resumed]
+        assert (counts["mirror"], counts["pruned"]) == (sources.count("mirror"), sources.count("pruned"))
@@ -0,0 +1,58 @@
+"""
+TermCache hands back the same terms instead of rebuilding them, and however small it is
+the incremental verifiers built on it have to answer like one-shot verification
+"""
+
+import cvc5
+import pytest
+
+from src.Solver.Term_Cache import TermCache
+from src.Integer.RSA_Valid_Configuration import isValidRSAConfiguration as intValid
+from src.Bitvector.RSA_Valid_Configuration import isValidRSAConfiguration as bvValid
+from src.Integer.RSA_Valid_Configuration import IncrementalVerifier as IntVerifier
+from src.Bitvector.RSA_Valid_Configuration import IncrementalVerifier as BvVerifier
+
+from conftest import BOUND
+
+
+def test_reusesTerms():
+    tm = cvc5.TermManager()
+    terms = TermCache(tm, "Bitvector")
+
+    first = terms.mkBitVector(8, 5)
+
+    assert terms.mkBitVector(8, 5) is first
+    assert terms.mkBitVector(8, 5) == tm.mkBitVector(8, 5)
+    assert terms.mkBitVector(16, 5) != first
+    assert terms.mkBitVectorSort(8) == tm.mkBitVectorSort(8)
+    assert (terms.hits, terms.misses) == (2, 3)
+
+
+def test_evictsLeastRecentlyUsed():
+    terms = TermCache(cvc5.TermManager(), "Integer", maxSize=2)
+
+    one = terms.mkInteger(1)
+    terms.mkInteger(2)
+    terms.mkInteger(1)
+    terms.mkInteger(3)
+
+    assert len(terms) == 2
+    assert terms.mkInteger(1) is one
+    assert terms.misses == 3
+
+    terms.mkInteger(2)
+    assert terms.misses == 4
+
+
+@pytest.mark.parametrize("ty, N", [("Integer", None), ("Bitvector", BOUND), ("Bitvector", "auto")])
+@pytest.mark.parametrize("cacheSize", [1, 16])
+def test_evictionKeepsAnswers(ty, N, cacheSize, inputs):
+    if ty == "Integer":
+        expected = [intValid(*inp) for inp in inputs]
+        verifier = IntVerifier(cacheSize=cacheSize)
+    else:
+        expected = [bvValid(*inp, N) for inp in inputs]
+        verifier = BvVerifier(N, cacheSize=cacheSize)
+
+    assert [verifier.isValidRSAConfiguration(*inp) for inp in inputs] == expected
+    assert len(verifier.terms) <= cacheSize